@@ -0,0 +1,158 @@
+"""
+Measure GitHubCrawler throughput against the local stand-in server and print the results as JSON.
+
+The stand-in runs in a child process so its CPU time and memory do not count against the crawler.
+
+    python -m benchmarks.bench_crawl --pages 20 --repos-per-page 10 --latency 0.05 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import resource
+import statistics
+import time
+from dataclasses import asdict, fields
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.crawler import GitHubCrawler
+from crawler.parsers import ParserBackend, get_parser
+from crawler.retry import RetryPolicy
+from crawler.scheduler import Scheduler
+
+
+class TimedParser(ParserBackend):
+    """Wraps a parser backend and adds up the CPU time its parse calls take on the calling thread."""
+    def __init__(self, parser: ParserBackend) -> None:
+        self.parser = parser
+        self.name = parser.name
+        self.cpu_seconds = 0.0
+
+    def _timed(self, method: str, *args: Any) -> Any:
+        started = time.thread_time()
+        try:
+            return getattr(self.parser, method)(*args)
+        finally:
+            self.cpu_seconds += time.thread_time() - started
+
+    def parse_search_page(self, html, base_url):
+        return self._timed('parse_search_page', html, base_url)
+
+    def parse_language_stats(self, html):
+        return self._timed('parse_language_stats', html)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+def _serve(config: StandInConfig, ready: multiprocessing.Queue, stop: multiprocessing.Event) -> None:
+    async def serve() -> None:
+        async with StandInServer(config) as server:
+            ready.put(server.base_url)
+            while not stop.is_set():
+                await asyncio.sleep(0.05)
+
+    asyncio.run(serve())
+
+
+async def run_benchmark(base_url: str, concurrency: int = 10, parser: str = 'fast',
+                        base_delay: float = 0.05, stream_details: bool = False) -> Dict[str, Any]:
+    """
+    Crawls the stand-in at `base_url` once and returns the throughput, latency and resource figures.
+
+    Args:
+        base_url (str): The stand-in server URL.
+        concurrency (int): The scheduler concurrency.
+        parser (str): The parser backend name.
+        base_delay (float): The retry backoff base, kept small so injected faults do not dominate.
+        stream_details (bool): Whether repository pages are read only up to their language list.
+
+    Returns:
+        Dict[str, Any]: The benchmark results.
+    """
+    timed_parser = TimedParser(get_parser(parser))
+    crawler = GitHubCrawler(['benchmark'], None, 'repositories', base_url=base_url,
+                            scheduler=Scheduler(concurrency=concurrency), parser=timed_parser,
+                            retry_policy=RetryPolicy(max_attempts=5, base_delay=base_delay, max_delay=1),
+                            stream_details=stream_details)
+    latencies: List[float] = []
+    search_pages = 0
+    search_path = urlparse(crawler._get_search_url()[0]).path
+    fetch = crawler._fetch
+
+    async def timed_fetch(url: str, *args: Any, **kwargs: Any) -> Any:
+        nonlocal search_pages
+        if urlparse(url).path == search_path:
+            search_pages += 1
+        started = time.perf_counter()
+        try:
+            return await fetch(url, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    crawler._fetch = timed_fetch
+    started, cpu_started = time.perf_counter(), time.process_time()
+    repos = await crawler.run()
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    return {
+        'parser': parser,
+        'concurrency': concurrency,
+        'elapsed_seconds': round(elapsed, 4),
+        'search_pages': search_pages,
+        'repos': len(repos),
+        'repos_with_details': sum(1 for repo in repos if 'extra' in repo),
+        'pages_per_second': round(len(latencies) / elapsed, 2),
+        'repos_per_second': round(len(repos) / elapsed, 2),
+        'fetch_latency_p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'fetch_latency_p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        'cpu_seconds': round(cpu, 4),
+        'parse_cpu_seconds': round(timed_parser.cpu_seconds, 4),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for field in fields(StandInConfig):
+        parser.add_argument(f'--{field.name.replace("_", "-")}', type=type(field.default), default=field.default)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--parser', default='fast')
+    parser.add_argument('--stream-details', action='store_true',
+                        help='read repository pages only up to their language list')
+    parser.add_argument('--output', help='write the JSON results to this file instead of stdout')
+    args = parser.parse_args(argv)
+    config = StandInConfig(**{field.name: getattr(args, field.name) for field in fields(StandInConfig)})
+
+    logging.disable(logging.ERROR)
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(config, ready, stop), daemon=True)
+    server.start()
+    try:
+        base_url = ready.get(timeout=10)
+        results = asyncio.run(run_benchmark(base_url, args.concurrency, args.parser,
+                                              stream_details=args.stream_details))
+    finally:
+        stop.set()
+        server.join(timeout=5)
+
+    results['standin'] = asdict(config)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure how long importing the CLI and the crawler takes in a fresh interpreter and print the results as JSON.
+
+Each module is imported in its own child process, several times, and the median wall time is reported
+together with the deferred modules that were loaded anyway. With --max-ms the exit status is non-zero
+when a median goes over the budget or a deferred module is loaded, so it can guard CI against regressions.
+
+    python -m benchmarks.bench_import --repeat 5 --max-ms 600
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+MODULES = ('main', 'crawler.crawler')
+DEFERRED_MODULES = ('bs4', 'fake_useragent', 'pydantic', 'aiohttp.web', 'numpy', 'pyarrow')
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(elapsed, ','.join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> Dict[str, Any]:
+    """Import a module in `repeat` fresh interpreters and return the median time and the deferred modules loaded."""
+    timings: List[float] = []
+    loaded = set()
+    for _ in range(repeat):
+        probe = _PROBE.format(module=module, deferred=DEFERRED_MODULES)
+        output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True).stdout
+        elapsed, names = output.split()[0], output.split()[1:]
+        timings.append(float(elapsed) * 1000)
+        loaded.update(name for name in ''.join(names).split(',') if name)
+    return {'module': module, 'median_ms': statistics.median(timings), 'deferred_loaded': sorted(loaded)}
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=list(MODULES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, help='fail when a median import time goes over this budget')
+    args = parser.parse_args(argv)
+
+    results = [measure_import(module, args.repeat) for module in args.modules]
+    print(json.dumps(results, indent=2))
+    if args.max_ms is not None and any(
+        result['median_ms'] > args.max_ms or result['deferred_loaded'] for result in results
+    ):
+        sys.exit(1)
+    return results
+
+
+if __name__ == '__main__':
+    main()
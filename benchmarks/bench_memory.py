@@ -0,0 +1,75 @@
+"""
+Compare the memory held by crawl results in the dict layout and in RepoDetails records, and print it as JSON.
+
+Synthetic repositories are built the way a crawl builds them: every record gets its own strings, as decoded
+from a response, so the dict layout pays for each copy while RepoDetails interns them.
+
+    python -m benchmarks.bench_memory --repos 100000
+"""
+import argparse
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from crawler.records import RepoDetails
+
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C', 'C++', 'Shell', 'HTML', 'CSS', 'Dockerfile']
+
+
+def make_repo(index: int, rng: random.Random) -> Dict[str, Any]:
+    owner = f'owner{rng.randrange(max(1, index // 10 + 1))}'
+    languages = rng.sample(LANGUAGES, rng.randint(1, 5))
+    shares = sorted((rng.random() for _ in languages), reverse=True)
+    total = sum(shares)
+    return {
+        'url': f'https://github.com/{owner}/repo{index}',
+        'description': f'Repository number {index}',
+        'stars': rng.randrange(10_000),
+        'extra': {
+            'owner': ''.join(owner),
+            'language_stats': {''.join(language): round(share / total * 100, 1)
+                               for language, share in zip(languages, shares)},
+        },
+    }
+
+
+def measure(build: Callable[[], List[Any]]) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = build()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del results
+    return held
+
+
+def run_benchmark(repos: int, seed: int = 0) -> Dict[str, Any]:
+    """Build `repos` repositories in both layouts and return the bytes each layout holds."""
+    dict_bytes = measure(lambda: [make_repo(index, random.Random(seed + index)) for index in range(repos)])
+    record_bytes = measure(lambda: [RepoDetails.from_dict(make_repo(index, random.Random(seed + index)))
+                                    for index in range(repos)])
+    return {
+        'repos': repos,
+        'dict_bytes': dict_bytes,
+        'record_bytes': record_bytes,
+        'dict_bytes_per_repo': dict_bytes / repos,
+        'record_bytes_per_repo': record_bytes / repos,
+        'saving': 1 - record_bytes / dict_bytes,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repos', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    results = run_benchmark(args.repos, args.seed)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""A local stand-in for github.com that serves generated search and repository pages and a GraphQL API."""
+import asyncio
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+REPOSITORY_FIELD = re.compile(r'(\w+): repository\(owner: "([^"]*)", name: "([^"]*)"\)')
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'Shell', 'HTML', 'Java', 'Ruby']
+
+
+@dataclass
+class StandInConfig:
+    """
+    The shape of the generated site and the faults injected into it.
+
+    Attributes:
+        pages (int): The number of search result pages, linked with rel=next.
+        repos_per_page (int): The number of repositories listed on each search page.
+        languages_per_repo (int): The maximum number of languages listed on a repository page.
+        padding_kb (int): The size of the filler README added to every repository page.
+        trailer_kb (int): The size of the filler script data added after the sidebar of every repository page.
+        latency (float): The mean response delay in seconds, jittered by +-50%.
+        error_rate (float): The share of requests answered with 500.
+        throttle_rate (float): The share of requests answered with 429.
+        retry_after (int): The Retry-After value of 429 responses.
+        capacity (int): The number of requests served at once; requests arriving beyond it are answered with
+            429, like a server-side rate limiter. 0 serves every request.
+        seed (int): The seed of the fault injection and content generator.
+    """
+    pages: int = 5
+    repos_per_page: int = 10
+    languages_per_repo: int = 4
+    padding_kb: int = 0
+    trailer_kb: int = 0
+    latency: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int = 0
+    capacity: int = 0
+    seed: int = 0
+
+
+def repo_path(page: int, index: int) -> str:
+    return f'/owner{page}/repo{page}-{index}'
+
+
+def language_sizes(path: str, config: StandInConfig) -> List[Tuple[str, int]]:
+    """Return the deterministic (language, size in bytes) list of a generated repository."""
+    if not config.languages_per_repo:
+        return []
+    rng = random.Random(f'{config.seed}{path}')
+    names = rng.sample(LANGUAGES, rng.randint(1, config.languages_per_repo))
+    return [(name, rng.randint(1, 100) * 1024) for name in names]
+
+
+def repo_languages(path: str, config: StandInConfig) -> List[Tuple[str, float]]:
+    """Return the deterministic (language, percent) list of a generated repository."""
+    sizes = language_sizes(path, config)
+    total = sum(size for _, size in sizes)
+    return [(name, round(100 * size / total, 1)) for name, size in sizes]
+
+
+def repository_node(path: str, config: StandInConfig) -> Dict[str, Any]:
+    """Return the GraphQL repository node of a generated repository."""
+    sizes = language_sizes(path, config)
+    return {
+        'owner': {'login': path.split('/')[1]},
+        'languages': {
+            'totalSize': sum(size for _, size in sizes),
+            'edges': [{'size': size, 'node': {'name': name}} for name, size in sizes],
+        },
+    }
+
+
+def render_search_page(page: int, config: StandInConfig, query: str) -> str:
+    items = ''.join(
+        f'<div class="Box-sc-g0xbh4-0"><div class="search-title"><a href="{repo_path(page, index)}">'
+        f'<span>{repo_path(page, index)[1:]}</span></a></div><p>Generated repository {index}</p>'
+        f'<span aria-label="{(page * 31 + index * 7) % 5000} stars"></span></div>'
+        for index in range(config.repos_per_page)
+    )
+    pagination = ''
+    if page < config.pages:
+        pagination = f'<a href="/search?q={escape(query)}&amp;type=repositories&amp;p={page + 1}" rel="next">Next</a>'
+    return (
+        '<!DOCTYPE html><html><head><title>Search</title></head><body>'
+        f'<div data-testid="results-list">{items}</div><nav aria-label="Pagination">{pagination}</nav>'
+        '</body></html>'
+    )
+
+
+def render_repo_page(path: str, config: StandInConfig) -> str:
+    languages = ''.join(
+        '<li class="d-inline"><a class="d-inline-flex flex-items-center flex-nowrap Link--secondary" '
+        f'href="{path}/search?l={escape(name)}"><svg viewBox="0 0 16 16"></svg>'
+        f'<span class="color-fg-default text-bold mr-1">{escape(name)}</span><span>{percent}%</span></a></li>'
+        for name, percent in repo_languages(path, config)
+    )
+    readme = '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>' * (config.padding_kb * 16)
+    trailer = '{"payload": "Lorem ipsum dolor sit amet, consectetur"},' * (config.trailer_kb * 16)
+    sidebar = '<div class="BorderGrid-row"><h2 class="h4 mb-3">About</h2><p>Generated</p></div>'
+    if languages:
+        sidebar += (f'<div class="BorderGrid-row"><h2 class="h4 mb-3">Languages</h2>'
+                    f'<ul class="list-style-none">{languages}</ul></div>')
+    return (
+        f'<!DOCTYPE html><html><head><title>{escape(path[1:])}</title></head><body>'
+        f'<article class="markdown-body">{readme}</article>{sidebar}'
+        f'<footer>footer</footer><script type="application/json">[{trailer}{{}}]</script></body></html>'
+    )
+
+
+class StandInServer:
+    """
+    Serves the generated site with aiohttp and counts the responses it sent by status, and the peak number
+    of requests it was serving at once.
+
+    POST /graphql answers queries made of aliased `repository(owner: "...", name: "...")` fields, the batched
+    form sent by GraphQLDetailBackend, with the owner and language sizes of each generated repository.
+
+    Methods:
+        start(host, port) -> str: Starts listening and returns the base URL.
+        stop() -> None: Stops the server.
+    """
+    def __init__(self, config: Optional[StandInConfig] = None) -> None:
+        self.config = config or StandInConfig()
+        self.statuses: Counter = Counter()
+        self.requests: Counter = Counter()
+        self.peak_active = 0
+        self._active = 0
+        self._rng = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.app = web.Application(middlewares=[self._faults])
+        self.app.router.add_get('/search', self._search)
+        self.app.router.add_post('/graphql', self._graphql)
+        self.app.router.add_get('/{owner}/{repo}', self._repo)
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests[{'/search': 'search', '/graphql': 'api'}.get(request.path, 'repo')] += 1
+        if self.config.capacity and self._active >= self.config.capacity:
+            self.statuses[429] += 1
+            return web.Response(status=429, headers={'Retry-After': str(self.config.retry_after)})
+        self._active += 1
+        self.peak_active = max(self.peak_active, self._active)
+        try:
+            if self.config.latency:
+                await asyncio.sleep(self.config.latency * self._rng.uniform(0.5, 1.5))
+            roll = self._rng.random()
+            if roll < self.config.throttle_rate:
+                response = web.Response(status=429, headers={'Retry-After': str(self.config.retry_after)})
+            elif roll < self.config.throttle_rate + self.config.error_rate:
+                response = web.Response(status=500)
+            else:
+                response = await handler(request)
+        finally:
+            self._active -= 1
+        self.statuses[response.status] += 1
+        return response
+
+    async def _search(self, request: web.Request) -> web.Response:
+        page = int(request.query.get('p', 1))
+        if page > self.config.pages:
+            raise web.HTTPNotFound()
+        return web.Response(text=render_search_page(page, self.config, request.query.get('q', '')),
+                            content_type='text/html')
+
+    async def _graphql(self, request: web.Request) -> web.Response:
+        query = (await request.json()).get('query', '')
+        data = {
+            alias: repository_node(f'/{owner}/{name}', self.config)
+            for alias, owner, name in REPOSITORY_FIELD.findall(query)
+        }
+        return web.json_response({'data': data})
+
+    async def _repo(self, request: web.Request) -> web.Response:
+        return web.Response(text=render_repo_page(request.path, self.config), content_type='text/html')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f'http://{host}:{port}'
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> 'StandInServer':
+        self.base_url = await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
@@ -0,0 +1,201 @@
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from crawler.sinks import Columns
+
+
+class MatrixBuilder:
+    """
+    Accumulates repositories into the flat arrays of a LanguageMatrix, interning language names and owners.
+
+    Repositories without `extra`, whose details could not be fetched, are counted in `skipped` instead of
+    being added as empty rows that would drag every mean down.
+
+    Attributes:
+        skipped (int): The number of repositories left out for lack of details.
+
+    Methods:
+        add(repo) -> None: Appends one repository.
+        build() -> LanguageMatrix: Returns the matrix of the repositories added so far.
+    """
+    def __init__(self) -> None:
+        self.languages: Dict[str, int] = {}
+        self.owners: Dict[str, int] = {}
+        self._lengths: List[int] = []
+        self._owner_ids: List[int] = []
+        self._language_ids: List[int] = []
+        self._shares: List[float] = []
+        self.skipped = 0
+
+    def add(self, repo: Dict[str, Any]) -> None:
+        extra = repo.get('extra')
+        if not extra:
+            self.skipped += 1
+            return
+        stats = extra.get('language_stats') or {}
+        owner = extra.get('owner', '')
+        self._owner_ids.append(self.owners.setdefault(owner, len(self.owners)))
+        self._lengths.append(len(stats))
+        self._language_ids.extend(self.languages.setdefault(language, len(self.languages)) for language in stats)
+        self._shares.extend(stats.values())
+
+    def build(self) -> 'LanguageMatrix':
+        offsets = np.zeros(len(self._lengths) + 1, dtype=np.int64)
+        np.cumsum(self._lengths, out=offsets[1:])
+        return LanguageMatrix(offsets, np.asarray(self._language_ids, dtype=np.int32),
+                              np.asarray(self._shares, dtype=np.float32), list(self.languages),
+                              np.asarray(self._owner_ids, dtype=np.int64), list(self.owners), self.skipped)
+
+
+class LanguageMatrix:
+    """
+    A sparse repos x languages matrix of language shares in CSR layout, with vectorized aggregates.
+
+    Row i holds the shares (in percent) of repository i: columns language_ids[offsets[i]:offsets[i + 1]] with
+    values shares[offsets[i]:offsets[i + 1]]. Aggregates run on these flat arrays with NumPy, so no Python
+    dict is touched once the matrix is built.
+
+    Attributes:
+        offsets (np.ndarray): The row boundaries, of length n_rows + 1.
+        language_ids (np.ndarray): The column of every stored share.
+        shares (np.ndarray): The stored shares as float32.
+        languages (List[str]): The language vocabulary, indexed by column.
+        owner_ids (Optional[np.ndarray]): The owner of every row, indexed into `owners`.
+        owners (Optional[List[str]]): The owner vocabulary.
+        skipped (int): The number of repositories left out because their details could not be fetched.
+
+    Methods:
+        mean_share() -> Dict[str, float]: Returns the mean share of every language across rows.
+        top_languages(k, by) -> List[Tuple[str, float]]: Returns the k languages with the highest mean share or row count.
+        by_owner() -> LanguageMatrix: Returns the owners x languages matrix of mean shares.
+        row(index) -> Dict[str, float]: Returns the shares of one row as a dict.
+        cooccurrence() -> np.ndarray: Counts the rows using each pair of languages.
+        to_scipy() -> scipy.sparse.csr_matrix: Returns the matrix as a SciPy sparse matrix.
+    """
+    def __init__(self, offsets: np.ndarray, language_ids: np.ndarray, shares: np.ndarray, languages: List[str],
+                 owner_ids: Optional[np.ndarray] = None, owners: Optional[List[str]] = None, skipped: int = 0) -> None:
+        self.offsets = offsets
+        self.language_ids = language_ids
+        self.shares = shares
+        self.languages = languages
+        self.owner_ids = owner_ids
+        self.owners = owners
+        self.skipped = skipped
+
+    @classmethod
+    def from_repos(cls, repos: Iterable[Dict[str, Any]]) -> 'LanguageMatrix':
+        builder = MatrixBuilder()
+        for repo in repos:
+            builder.add(repo)
+        return builder.build()
+
+    @classmethod
+    async def from_stream(cls, repos: AsyncIterator[Dict[str, Any]]) -> 'LanguageMatrix':
+        """Build the matrix from a result stream such as GitHubCrawler.stream(), without keeping the dicts."""
+        builder = MatrixBuilder()
+        async for repo in repos:
+            builder.add(repo)
+        return builder.build()
+
+    @classmethod
+    def from_columns(cls, columns: Columns) -> 'LanguageMatrix':
+        """
+        Builds the matrix from the arrays loaded by read_columns(), without going through dicts at all.
+
+        Rows without an owner, which ColumnarSink writes for repositories whose details could not be fetched,
+        are skipped like MatrixBuilder skips repositories without `extra`.
+        """
+        lengths = np.diff(np.asarray(columns.offsets, dtype=np.int64))
+        kept = np.asarray(columns.owners, dtype=str) != ''
+        offsets = np.zeros(int(kept.sum()) + 1, dtype=np.int64)
+        np.cumsum(lengths[kept], out=offsets[1:])
+        values = np.repeat(kept, lengths)
+        owners, owner_ids = np.unique(np.asarray(columns.owners, dtype=str)[kept], return_inverse=True)
+        return cls(offsets, np.asarray(columns.language_ids, dtype=np.int32)[values],
+                   np.asarray(columns.percentages, dtype=np.float32)[values], list(columns.languages),
+                   owner_ids.astype(np.int64), owners.tolist(), int((~kept).sum()))
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        """The row of every stored share."""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.offsets))
+
+    def _totals(self) -> np.ndarray:
+        return np.bincount(self.language_ids, weights=self.shares, minlength=len(self.languages))
+
+    def _row_counts(self) -> np.ndarray:
+        return np.bincount(self.language_ids, minlength=len(self.languages))
+
+    def mean_share(self) -> Dict[str, float]:
+        """Return the mean share of every language over all rows, rows without the language counting as 0."""
+        means = self._totals() / max(self.n_rows, 1)
+        return dict(zip(self.languages, means.tolist()))
+
+    def top_languages(self, k: int = 10, by: str = 'share') -> List[Tuple[str, float]]:
+        """
+        Returns the k leading languages.
+
+        Args:
+            k (int): The number of languages to return.
+            by (str): 'share' to rank by mean share, 'repos' to rank by the number of rows using the language.
+
+        Returns:
+            List[Tuple[str, float]]: The language names with their mean share or row count, best first.
+        """
+        if by == 'share':
+            scores = self._totals() / max(self.n_rows, 1)
+        elif by == 'repos':
+            scores = self._row_counts().astype(np.float64)
+        else:
+            raise ValueError(f'Unknown ranking: {by}')
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [(self.languages[i], float(scores[i])) for i in order]
+
+    def by_owner(self) -> 'LanguageMatrix':
+        """Roll rows up per owner: row j of the result holds the mean shares over the repositories of owners[j]."""
+        if self.owner_ids is None:
+            raise ValueError('The matrix has no owners')
+        n_owners = len(self.owners)
+        n_languages = len(self.languages)
+        keys = self.owner_ids[self.row_ids] * n_languages + self.language_ids
+        unique, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.shares)
+        repos_per_owner = np.bincount(self.owner_ids, minlength=n_owners)
+        owners = unique // n_languages
+        offsets = np.zeros(n_owners + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=n_owners), out=offsets[1:])
+        return LanguageMatrix(offsets, (unique % n_languages).astype(np.int32),
+                              (totals / repos_per_owner[owners]).astype(np.float32), self.languages,
+                              np.arange(n_owners), self.owners)
+
+    def row(self, index: int) -> Dict[str, float]:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return {self.languages[i]: float(share) for i, share in zip(self.language_ids[start:end], self.shares[start:end])}
+
+    def cooccurrence(self) -> np.ndarray:
+        """
+        Counts, for every pair of languages, the rows that use both; the diagonal holds the rows using each language.
+
+        Returns:
+            np.ndarray: A languages x languages matrix of int64 counts.
+        """
+        n_languages = len(self.languages)
+        lengths = np.diff(self.offsets)
+        entry_lengths = np.repeat(lengths, lengths)
+        entry_starts = np.repeat(self.offsets[:-1], lengths)
+        left = np.repeat(np.arange(len(self.language_ids)), entry_lengths)
+        pair_starts = np.cumsum(entry_lengths) - entry_lengths
+        right = np.repeat(entry_starts, entry_lengths) + np.arange(len(left)) - np.repeat(pair_starts, entry_lengths)
+        keys = self.language_ids[left].astype(np.int64) * n_languages + self.language_ids[right]
+        return np.bincount(keys, minlength=n_languages * n_languages).reshape(n_languages, n_languages)
+
+    def to_scipy(self):
+        """Return the matrix as a scipy.sparse.csr_matrix; requires SciPy."""
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((self.shares, self.language_ids, self.offsets), shape=(self.n_rows, len(self.languages)))
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from crawler.crawler import NUMBER_OF_RETRIES, GitHubCrawler
+from crawler.dedup import DetailRegistry
+from crawler.models import SearchFilterModel
+from crawler.retry import RetryPolicy
+from crawler.scheduler import Scheduler
+from crawler.session import SessionFactory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_QUERIES = 8
+_DONE = object()
+
+
+class BatchCrawler:
+    """
+    Crawls many search queries over one scheduler, retry policy and session, fetching each repository once per batch.
+
+    Repositories found by several queries are fetched by the first query that reaches them and attached to
+    every query that referenced them.
+
+    Attributes:
+        queries (List[SearchFilterModel]): The search queries of the batch.
+        scheduler (Scheduler): The scheduler shared by every query, capping in-flight requests for the batch.
+        retry_policy (RetryPolicy): The retry policy shared by every query, so a host throttling one query pauses
+            them all through its circuit breaker.
+        session_factory (SessionFactory): Builds the session shared by every query.
+        details (DetailRegistry): The repository details fetched so far.
+        max_concurrent_queries (int): The number of queries paginated at the same time.
+
+    Methods:
+        stream() -> AsyncIterator[Tuple[int, Dict]]: Yields (query index, repository) pairs as they finish.
+        run() -> List[List[Dict]]: Returns the repositories of every query, in query order.
+    """
+    def __init__(self, queries: List[SearchFilterModel], scheduler: Optional[Scheduler] = None,
+                 session_factory: Optional[SessionFactory] = None, retry_policy: Optional[RetryPolicy] = None,
+                 max_concurrent_queries: int = DEFAULT_MAX_CONCURRENT_QUERIES, **crawler_kwargs: Any) -> None:
+        """
+        Initializes the BatchCrawler instance.
+
+        Args:
+            queries (List[SearchFilterModel]): The search queries.
+            scheduler (Optional[Scheduler]): The shared scheduler, a default Scheduler is used if omitted.
+            session_factory (Optional[SessionFactory]): The factory of the shared session.
+            retry_policy (Optional[RetryPolicy]): The shared retry policy, defaults to NUMBER_OF_RETRIES attempts.
+            max_concurrent_queries (int): The number of queries paginated at the same time.
+            **crawler_kwargs (Any): Extra GitHubCrawler arguments, e.g. parser, cache or proxy_pool.
+        """
+        self.queries = queries
+        self.scheduler = scheduler or Scheduler()
+        self.session_factory = session_factory or SessionFactory()
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=NUMBER_OF_RETRIES)
+        self.details = DetailRegistry()
+        self.max_concurrent_queries = max_concurrent_queries
+        self.crawler_kwargs = crawler_kwargs
+
+    def _make_crawler(self, query: SearchFilterModel, session) -> GitHubCrawler:
+        return GitHubCrawler(
+            keywords=query.keywords,
+            proxy=query.proxy,
+            search_type=query.search_type,
+            scheduler=self.scheduler,
+            session_factory=self.session_factory,
+            session=session,
+            retry_policy=self.retry_policy,
+            details=self.details,
+            **self.crawler_kwargs
+        )
+
+    async def _crawl_query(self, index: int, crawler: GitHubCrawler, results: asyncio.Queue,
+                           slots: asyncio.Semaphore) -> None:
+        async with slots:
+            logger.info('Crawling query %d: %s', index, crawler.keywords)
+            async for repo in crawler.stream():
+                await results.put((index, repo))
+
+    async def stream(self) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Crawls every query and yields each repository together with the index of the query that found it.
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: The query index and a repository with its details.
+        """
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.scheduler.queue_size)
+        slots = asyncio.Semaphore(self.max_concurrent_queries)
+        async with self.session_factory.create() as session:
+            crawls = [
+                asyncio.create_task(self._crawl_query(index, self._make_crawler(query, session), results, slots))
+                for index, query in enumerate(self.queries)
+            ]
+
+            async def close_when_done() -> None:
+                await asyncio.gather(*crawls, return_exceptions=True)
+                await results.put(_DONE)
+
+            closer = asyncio.create_task(close_when_done())
+            try:
+                while True:
+                    item = await results.get()
+                    if item is _DONE:
+                        break
+                    yield item
+                for crawl in crawls:
+                    if crawl.exception():
+                        raise crawl.exception()
+            finally:
+                for task in [*crawls, closer]:
+                    task.cancel()
+                await asyncio.gather(*crawls, closer, return_exceptions=True)
+        logger.info('Finished batch: %d repositories fetched, %d duplicates skipped',
+                    self.details.fetched, self.details.deduplicated)
+
+    async def run(self) -> List[List[Dict[str, Any]]]:
+        """
+        Crawls every query and returns the repositories found by each one.
+
+        Returns:
+            List[List[Dict[str, Any]]]: The repositories of each query, in the order of `queries`.
+        """
+        all_repos: List[List[Dict[str, Any]]] = [[] for _ in self.queries]
+        async for index, repo in self.stream():
+            all_repos[index].append(repo)
+        return all_repos
@@ -0,0 +1,75 @@
+import time
+from typing import Optional
+
+
+class CrawlBudget:
+    """
+    Caps a crawl by wall-clock time, repositories and downloaded bytes.
+
+    A cap stops the crawl at once: in-flight requests are cancelled and the results gathered so far are
+    returned. Search pages are capped per crawler by GitHubCrawler.max_pages, reported as the crawler's
+    stop_reason. A budget passed to several crawlers, e.g. through BatchCrawler, is shared by all of them.
+
+    Attributes:
+        deadline (Optional[float]): The number of seconds the crawl may run.
+        max_repos (Optional[int]): The number of repositories that may be returned.
+        max_bytes (Optional[int]): The number of response body bytes that may be downloaded, counted after any
+            Content-Encoding is undone.
+        pages (int): The number of search pages fetched.
+        repos (int): The number of repositories returned.
+        bytes (int): The number of body bytes downloaded.
+        reason (Optional[str]): The cap that was hit first: 'deadline', 'max_repos' or 'max_bytes'.
+
+    Methods:
+        start() -> None: Starts the deadline clock, once.
+        remaining() -> Optional[float]: Returns the seconds left before the deadline.
+        take_repo() -> bool: Counts a repository about to be returned, unless the repository cap is reached.
+        exhausted() -> bool: Tells whether the crawl must stop now.
+    """
+    def __init__(self, deadline: Optional[float] = None, max_repos: Optional[int] = None,
+                 max_bytes: Optional[int] = None) -> None:
+        """
+        Initializes the CrawlBudget instance; every cap is off when omitted.
+
+        Args:
+            deadline (Optional[float]): The maximum duration of the crawl in seconds.
+            max_repos (Optional[int]): The maximum number of repositories.
+            max_bytes (Optional[int]): The maximum number of downloaded body bytes.
+        """
+        self.deadline = deadline
+        self.max_repos = max_repos
+        self.max_bytes = max_bytes
+        self.pages = 0
+        self.repos = 0
+        self.bytes = 0
+        self.reason: Optional[str] = None
+        self._started: Optional[float] = None
+
+    def start(self) -> None:
+        if self._started is None:
+            self._started = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None or self._started is None:
+            return None
+        return max(0.0, self._started + self.deadline - time.monotonic())
+
+    def _exhaust(self, reason: str) -> bool:
+        if self.reason is None:
+            self.reason = reason
+        return True
+
+    def take_repo(self) -> bool:
+        if self.max_repos is not None and self.repos >= self.max_repos:
+            return not self._exhaust('max_repos')
+        self.repos += 1
+        return True
+
+    def exhausted(self) -> bool:
+        if self.deadline is not None and self.remaining() == 0:
+            return self._exhaust('deadline')
+        if self.max_repos is not None and self.repos >= self.max_repos:
+            return self._exhaust('max_repos')
+        if self.max_bytes is not None and self.bytes >= self.max_bytes:
+            return self._exhaust('max_bytes')
+        return False
@@ -0,0 +1,157 @@
+import sqlite3
+import time
+from typing import Dict, Mapping, NamedTuple, Optional
+from urllib.parse import urlencode
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CacheEntry(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    An on-disk SQLite cache of response bodies with TTL freshness, size-based LRU eviction and revalidation.
+
+    Fresh entries are served without a request. Stale entries are revalidated with If-None-Match and
+    If-Modified-Since, and a 304 response reuses the stored body.
+
+    Attributes:
+        path (str): The SQLite database file, or ':memory:'.
+        ttl (float): The number of seconds an entry is served without revalidation.
+        max_bytes (int): The total body size kept before the least recently used entries are evicted.
+        hits (int): The number of requests served from a fresh entry.
+        revalidated (int): The number of requests answered with 304 Not Modified.
+        misses (int): The number of bodies downloaded and stored.
+
+    Methods:
+        key(url, query_params) -> str: Builds the cache key of a request.
+        get(key) -> Optional[CacheEntry]: Returns the stored entry of a key.
+        is_fresh(entry) -> bool: Tells whether an entry is within its TTL.
+        conditional_headers(entry) -> Dict[str, str]: Builds the revalidation headers of an entry.
+        revalidate(key) -> None: Marks an entry as fresh again after a 304 response.
+        put(key, body, headers) -> None: Stores a downloaded body and evicts entries over the size limit.
+        stats() -> Dict[str, int]: Returns the hit, revalidation and miss counters.
+    """
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initializes the ResponseCache instance and creates the database schema if needed.
+
+        Args:
+            path (str): The SQLite database file, or ':memory:'.
+            ttl (float): The freshness lifetime of an entry in seconds.
+            max_bytes (int): The maximum total size of the stored bodies.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+        """)
+
+    @staticmethod
+    def key(url: str, query_params: Optional[Mapping[str, str]] = None) -> str:
+        """Build a cache key from the URL and the sorted query parameters."""
+        if not query_params:
+            return url
+        return f'{url}?{urlencode(sorted(query_params.items()))}'
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the stored entry of a key and marks it as recently used. Fresh entries count as hits.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[CacheEntry]: The stored entry, or None if the key is not cached.
+        """
+        row = self._db.execute(
+            'SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        with self._db:
+            self._db.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+        entry = CacheEntry(row[0].decode('utf-8'), row[1], row[2], row[3])
+        if self.is_fresh(entry):
+            self.hits += 1
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """Build the If-None-Match and If-Modified-Since headers for revalidating an entry."""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidate(self, key: str) -> None:
+        """Restart the TTL of an entry after the server answered 304 Not Modified."""
+        now = time.time()
+        with self._db:
+            self._db.execute('UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?', (now, now, key))
+        self.revalidated += 1
+
+    def put(self, key: str, body: str, headers: Mapping[str, str]) -> None:
+        """
+        Stores a downloaded body with its validators, then evicts the least recently used entries over max_bytes.
+
+        Args:
+            key (str): The cache key.
+            body (str): The response body.
+            headers (Mapping[str, str]): The response headers, ETag and Last-Modified are kept.
+        """
+        data = body.encode('utf-8')
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, data, headers.get('ETag'), headers.get('Last-Modified'), now, now, len(data))
+            )
+        self.misses += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._db.execute('SELECT key, size FROM responses ORDER BY last_access ASC'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        with self._db:
+            self._db.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    An append-only JSON lines journal of a crawl, used to resume it after a crash.
+
+    The journal records the query, every search page with the repositories it listed and the next page URL,
+    and every repository whose details were fetched. On resume, finished pages are not fetched again,
+    repositories listed but not finished are re-queued, and finished repositories are returned from the journal.
+
+    Attributes:
+        path (str): The journal file.
+        query (Optional[Dict[str, Any]]): The search URL and parameters the journal belongs to.
+        pages (int): The number of search pages recorded.
+        next_url (Optional[str]): The next search page to fetch, None once pagination is finished.
+        pending (List[Dict[str, Any]]): The repositories listed on recorded pages but not finished.
+        completed (List[Dict[str, Any]]): The finished repositories.
+
+    Methods:
+        start(url, query_params) -> None: Records the query, or checks it against the resumed journal.
+        record_page(url, repos, next_url) -> None: Records a parsed search page.
+        record_repo(repo) -> None: Records a repository whose details were fetched.
+    """
+    def __init__(self, path: str, resume: bool = False) -> None:
+        """
+        Initializes the Checkpoint instance.
+
+        Args:
+            path (str): The journal file.
+            resume (bool): Whether to load an existing journal; otherwise it is truncated.
+        """
+        self.path = path
+        self.query: Optional[Dict[str, Any]] = None
+        self.pages = 0
+        self.next_url: Optional[str] = None
+        self.pending: List[Dict[str, Any]] = []
+        self.completed: List[Dict[str, Any]] = []
+        if resume and os.path.exists(path):
+            self._load()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    @property
+    def resumed(self) -> bool:
+        return self.pages > 0
+
+    def _load(self) -> None:
+        listed: Dict[str, Dict[str, Any]] = {}
+        completed: Dict[str, Dict[str, Any]] = {}
+        complete_size = 0
+        with open(self.path, 'rb') as file:
+            for raw in file:
+                if not raw.endswith(b'\n'):
+                    logger.warning('Dropping truncated checkpoint entry at the end of %s', self.path)
+                    break
+                complete_size += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    logger.warning('Skipping corrupt checkpoint entry in %s', self.path)
+                    continue
+                if entry['event'] == 'start':
+                    self.query = {'url': entry['url'], 'query_params': entry['query_params']}
+                elif entry['event'] == 'page':
+                    self.pages += 1
+                    self.next_url = entry['next_url']
+                    for repo in entry['repos']:
+                        listed.setdefault(repo['url'], repo)
+                elif entry['event'] == 'repo':
+                    completed[entry['repo']['url']] = entry['repo']
+        # Cut a partial last line off, so the entries appended after resuming start on a line of their own.
+        if complete_size < os.path.getsize(self.path):
+            os.truncate(self.path, complete_size)
+        self.completed = list(completed.values())
+        self.pending = [repo for url, repo in listed.items() if url not in completed]
+        logger.info('Resuming from %s: %d pages, %d repositories finished, %d pending',
+                    self.path, self.pages, len(self.completed), len(self.pending))
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+    def start(self, url: str, query_params: Dict[str, str]) -> None:
+        """
+        Records the query of a new crawl, or checks that a resumed journal belongs to the same query.
+
+        Raises:
+            ValueError: If the resumed journal was written for another query.
+        """
+        query = {'url': url, 'query_params': query_params}
+        if self.query is not None:
+            if self.query != query:
+                raise ValueError(f'Checkpoint {self.path} belongs to another query: {self.query}')
+            return
+
+        self.query = query
+        self._append({'event': 'start', **query})
+
+    def record_page(self, url: str, repos: List[Dict[str, Any]], next_url: Optional[str]) -> None:
+        self.pages += 1
+        self.next_url = next_url
+        self._append({'event': 'page', 'url': url, 'repos': repos, 'next_url': next_url})
+
+    def record_repo(self, repo: Dict[str, Any]) -> None:
+        self._append({'event': 'repo', 'repo': repo})
+
+    def close(self) -> None:
+        self._file.close()
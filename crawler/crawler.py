@@ -1,20 +1,34 @@
-import random
-
 import aiohttp
 import asyncio
+import codecs
 import logging
-from bs4 import BeautifulSoup
+import time
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
 from urllib.parse import urlparse, urljoin
-from typing import List, Dict, Optional, Any, Tuple
-
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator, Awaitable, Callable
+
+from crawler.budget import CrawlBudget
+from crawler.cache import ResponseCache
+from crawler.checkpoint import Checkpoint
+from crawler.dedup import DetailRegistry
+from crawler.details import DetailBackend, HtmlDetailBackend
+from crawler.executor import ParseExecutor
+from crawler.metrics import Metrics
+from crawler.parsers import FastParser, PageScanner, ParserBackend, SearchPage
+from crawler.proxy_pool import ProxyPool, is_proxy_failure
+from crawler.recrawl import RecrawlStore, RepoRecord
+from crawler.records import RepoDetails
+from crawler.retry import RetryPolicy
+from crawler.scheduler import Scheduler
+from crawler.session import SessionFactory
 from crawler.utils import get_random_headers
 
 BASE_URL = 'https://github.com'
 NUMBER_OF_RETRIES = 3
-RANGE_FROM = 1
-RANGE_TO = 3
+STREAM_CHUNK_SIZE = 16 * 1024
+_DONE = object()
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -25,13 +39,45 @@ class GitHubCrawler:
     Attributes:
         keywords (List[str]): The keywords to search for on GitHub.
         proxy (List[str]): A random proxy URL to be used for all requests in one session.
+        proxy_pool (Optional[ProxyPool]): Rotates proxies per request; when set, `proxy` is not used.
+        retry_policy (RetryPolicy): Classifies failed requests and computes the backoff between attempts.
         search_type (str): The type of GitHub search (e.g., 'repositories', 'users').
         session (Optional[aiohttp.ClientSession]): The aiohttp session for making requests.
+        session_factory (SessionFactory): Builds the session of a run and holds the request timeouts.
+        details (Optional[DetailRegistry]): Repository details shared with other crawlers of a batch.
+        checkpoint (Optional[Checkpoint]): The journal the crawl progress is recorded in and resumed from.
+        base_url (str): The site searched and crawled, BASE_URL unless pointed at a stand-in server.
+        metrics (Optional[Metrics]): Collects stage timers, counters and gauges of the crawl.
+        scheduler (Scheduler): Caps in-flight requests globally and per host and sizes the worker pool.
+        parser (ParserBackend): The HTML extraction backend used for search and repository pages.
+        parse_executor (Optional[ParseExecutor]): The pool pages are parsed in, or None to parse on the event loop.
+        cache (Optional[ResponseCache]): The persistent response cache used by _fetch, or None to always download.
+        recrawl (Optional[RecrawlStore]): The record of previous crawls; when set, only changed repositories are
+            refreshed and every repository gets a `changed` flag.
+        max_pages (Optional[int]): The number of search pages fetched per run, or None to follow every page.
+        budget (Optional[CrawlBudget]): The time, repository and byte caps, possibly shared with other crawlers.
+        status (str): 'pending', 'running', 'complete', or 'budget_exhausted' when max_pages or a cap of the budget
+            stopped the crawl before the search results ran out.
+        stop_reason (Optional[str]): The cap that stopped the crawl: 'max_pages', or the reason of the budget.
+        stream_details (bool): Whether repository pages are read in chunks and dropped once the language list is
+            complete, instead of being downloaded in full.
+        detail_backend (DetailBackend): Fetches the owner and language stats of every repository.
 
     Methods:
+        stream() -> AsyncIterator[Dict]: Yields each repository as soon as its details are fetched.
         run() -> List[Dict]: Starts the crawling process and returns a list of repositories with details.
+        run_records() -> List[RepoDetails]: Like run(), but returns compact records.
     """
-    def __init__(self, keywords: List[str], proxy: str, search_type: str) -> None:
+    def __init__(self, keywords: List[str], proxy: str, search_type: str,
+                 scheduler: Optional[Scheduler] = None, parser: Optional[ParserBackend] = None,
+                 parse_executor: Optional[ParseExecutor] = None, cache: Optional[ResponseCache] = None,
+                 proxy_pool: Optional[ProxyPool] = None, retry_policy: Optional[RetryPolicy] = None,
+                 session_factory: Optional[SessionFactory] = None,
+                 session: Optional[aiohttp.ClientSession] = None, details: Optional[DetailRegistry] = None,
+                 checkpoint: Optional[Checkpoint] = None, base_url: str = BASE_URL,
+                 metrics: Optional[Metrics] = None, recrawl: Optional[RecrawlStore] = None,
+                 max_pages: Optional[int] = None, budget: Optional[CrawlBudget] = None,
+                 stream_details: bool = False, detail_backend: Optional[DetailBackend] = None) -> None:
         """
         Initializes the GitHubCrawler instance.
 
@@ -39,11 +85,58 @@ class GitHubCrawler:
             keywords (List[str]): The list of keywords to search for.
             proxy (str]: A random proxy URL to be used for all requests in one session.
             search_type (str): The search type (e.g., 'repositories').
+            scheduler (Optional[Scheduler]): The request scheduler, a default Scheduler is used if omitted.
+            parser (Optional[ParserBackend]): The HTML extraction backend, FastParser is used if omitted.
+            parse_executor (Optional[ParseExecutor]): The parse pool; its own parser backend is used for
+                pages parsed in it.
+            cache (Optional[ResponseCache]): The response cache, responses are not cached if omitted.
+            proxy_pool (Optional[ProxyPool]): The proxy pool, the single `proxy` is used if omitted.
+            retry_policy (Optional[RetryPolicy]): The retry policy, defaults to NUMBER_OF_RETRIES attempts with
+                exponential backoff.
+            session_factory (Optional[SessionFactory]): The session factory, a default SessionFactory is used
+                if omitted.
+            session (Optional[aiohttp.ClientSession]): A session to reuse across runs; the crawler does not close
+                it. A new session is created and closed by every run if omitted.
+            details (Optional[DetailRegistry]): A registry shared by several crawlers so each repository is
+                fetched only once; every repository is fetched if omitted.
+            checkpoint (Optional[Checkpoint]): The crawl journal; a journal opened with resume=True makes the
+                crawl continue where it stopped.
+            base_url (str): The site to crawl, e.g. a local stand-in server for benchmarks and tests.
+            metrics (Optional[Metrics]): The metrics collector; network stages are traced only in sessions
+                the crawler creates itself.
+            recrawl (Optional[RecrawlStore]): The incremental recrawl store; every repository is fetched and
+                parsed if omitted.
+            max_pages (Optional[int]): The cap on search pages fetched per run, no cap if omitted.
+            budget (Optional[CrawlBudget]): The crawl budget, the crawl runs until pagination ends if omitted.
+            stream_details (bool): Whether to stop reading repository pages after the language list. Streamed
+                pages are scanned on the event loop with PageScanner and bypass the response cache; incremental
+                recrawls, which hash the whole page, always download it.
+            detail_backend (Optional[DetailBackend]): The repository detail backend, HtmlDetailBackend is used if
+                omitted.
         """
         self.keywords = keywords
         self.proxy = proxy
         self.search_type = search_type
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._shared_session = session is not None
+        self.session_factory = session_factory or SessionFactory()
+        self.details = details
+        self.checkpoint = checkpoint
+        self.base_url = base_url
+        self.metrics = metrics
+        self.recrawl = recrawl
+        self.max_pages = max_pages
+        self.budget = budget
+        self.status = 'pending'
+        self.stop_reason: Optional[str] = None
+        self.stream_details = stream_details
+        self.detail_backend = detail_backend or HtmlDetailBackend()
+        self.scheduler = scheduler or Scheduler()
+        self.parser = parser or FastParser()
+        self.parse_executor = parse_executor
+        self.cache = cache
+        self.proxy_pool = proxy_pool
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=NUMBER_OF_RETRIES)
 
     def _get_search_url(self) -> Tuple[str, Dict[str, str]]:
         """
@@ -53,33 +146,155 @@ class GitHubCrawler:
             tuple: The search URL and query parameters.
         """
         query_params = {'q': ' '.join(self.keywords), 'type': self.search_type}
-        return urljoin(BASE_URL, '/search'), query_params
+        return urljoin(self.base_url, '/search'), query_params
 
-    async def _fetch(self, url: str, query_params: Dict[str, str]) -> Optional[str]:
+    async def _fetch(self, url: str, query_params: Dict[str, str],
+                     reader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None,
+                     json_body: Optional[Dict[str, Any]] = None,
+                     extra_headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
         """
         Fetches the HTML content of a given URL using aiohttp with retries.
 
+        A reader replaces the download of the whole body: it gets the response and its result is returned
+        instead of the HTML. Such responses are not cached. With a JSON body, the request is a POST.
+
+        Failed attempts are retried as the retry policy decides; permanent errors such as 404 are not.
+
+        With a response cache, fresh entries are returned without a request and stale entries are revalidated
+        with a conditional request, reusing the stored body on 304 Not Modified.
+
         Args:
             url (str): The URL to fetch.
+            query_params (Dict[str, str]): The query parameters of the request.
+            reader (Optional[Callable]): Reads the response body and returns what _fetch returns.
+            json_body (Optional[Dict[str, Any]]): The body of a POST request, sent as JSON.
+            extra_headers (Optional[Dict[str, str]]): Headers sent on top of the random browser headers.
 
         Returns:
-            Optional[str]: The HTML content if successful, or None if failed after retries.
+            Optional[Any]: The HTML content, or the result of the reader, if successful, or None if failed after
+            retries.
         """
-        for attempt in range(NUMBER_OF_RETRIES):
+        cache_key, cached = None, None
+        if self.cache and reader is None:
+            cache_key = self.cache.key(url, query_params)
+            cached = self.cache.get(cache_key)
+            if cached and self.cache.is_fresh(cached):
+                logger.info('Serving %s from cache', url)
+                return cached.body
+
+        max_attempts = self.retry_policy.max_attempts
+        for attempt in range(max_attempts):
+            if self.retry_policy.breaker:
+                await self.retry_policy.breaker.wait(url)
             headers = get_random_headers()
+            if extra_headers:
+                headers.update(extra_headers)
+            if cached:
+                headers.update(self.cache.conditional_headers(cached))
+            proxy = await self.proxy_pool.acquire() if self.proxy_pool else self.proxy
             try:
-                logger.info('Attempting to fetch %s with proxy %s (Attempt %d)', url, self.proxy, attempt + 1)
-                async with self.session.get(url, params=query_params, headers=headers, timeout=5, proxy=self.proxy) as response:
-                    response.raise_for_status()
-                    logger.info('Successfully fetched %s', url)
-                    return await response.text()
-
-            except aiohttp.ClientError as e:
-                logger.error('Attempt %d failed for %s: %s', attempt + 1, url, str(e))
-                if attempt == NUMBER_OF_RETRIES - 1:
+                logger.info('Attempting to fetch %s with proxy %s (Attempt %d)', url, proxy, attempt + 1)
+                async with self.scheduler.slot(url):
+                    started = time.monotonic()
+                    if json_body is not None:
+                        request = self.session.post(url, params=query_params, json=json_body, headers=headers,
+                                                    timeout=self.session_factory.timeout, proxy=proxy)
+                    else:
+                        request = self.session.get(url, params=query_params, headers=headers,
+                                                   timeout=self.session_factory.timeout, proxy=proxy)
+                    async with request as response:
+                        if cached and response.status == 304:
+                            logger.info('Not modified, serving %s from cache', url)
+                            self._report_proxy(proxy, time.monotonic() - started, ok=True)
+                            self.cache.revalidate(cache_key)
+                            return cached.body
+
+                        response.raise_for_status()
+                        logger.info('Successfully fetched %s', url)
+                        with self._timer('body'):
+                            if reader is not None:
+                                result = await reader(response)
+                                self._report_proxy(proxy, time.monotonic() - started, ok=True)
+                                return result
+                            if self.budget:
+                                self.budget.bytes += len(await response.read())
+                            html = await response.text()
+                        self._report_proxy(proxy, time.monotonic() - started, ok=True)
+                        if self.cache:
+                            self.cache.put(cache_key, html, response.headers)
+                        return html
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error('Attempt %d failed for %s: %s', attempt + 1, url, str(e) or type(e).__name__)
+                self._report_proxy(proxy, None, ok=not is_proxy_failure(e))
+                if attempt == max_attempts - 1 or not self.retry_policy.is_retryable(e):
                     return
 
-                await asyncio.sleep(random.randint(RANGE_FROM, RANGE_TO))
+                if self.metrics:
+                    self.metrics.inc('retries')
+                await asyncio.sleep(self.retry_policy.next_delay(url, attempt, e))
+
+    async def _read_language_stats(self, response: aiohttp.ClientResponse) -> Dict[str, float]:
+        """
+        Scans a repository page chunk by chunk and closes the connection once the language list is complete.
+
+        Chunks are decoded incrementally, so neither the raw body nor the page as a str is ever held whole. An
+        unknown charset falls back to utf-8, as response.text() does.
+
+        Args:
+            response (aiohttp.ClientResponse): The response of a repository page.
+
+        Returns:
+            Dict[str, float]: A dictionary mapping language names to their usage percentages.
+        """
+        scanner = PageScanner()
+        try:
+            codec = codecs.lookup(response.charset or 'utf-8')
+        except LookupError:
+            logger.warning('Unknown charset %r of %s, decoding as utf-8', response.charset, response.url)
+            codec = codecs.lookup('utf-8')
+        decoder = codec.incrementaldecoder(errors='replace')
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            if self.budget:
+                self.budget.bytes += len(chunk)
+            scanner.feed(decoder.decode(chunk))
+            if scanner.languages_done:
+                response.close()
+                if self.metrics:
+                    self.metrics.inc('early_stops')
+                break
+        else:
+            scanner.feed(decoder.decode(b'', final=True))
+            scanner.close()
+        return scanner.language_stats
+
+    def _timer(self, stage: str):
+        return self.metrics.timer('stage_seconds', stage=stage) if self.metrics else nullcontext()
+
+    def _set_queue_depth(self, queue: asyncio.Queue) -> None:
+        if self.metrics:
+            self.metrics.set_gauge('queue_depth', queue.qsize())
+
+    def _report_proxy(self, proxy: Optional[str], latency: Optional[float], ok: bool) -> None:
+        if self.proxy_pool:
+            self.proxy_pool.report(proxy, latency, ok)
+
+    def _parse_search_page(self, html: str) -> SearchPage:
+        """
+        Parses the search results page HTML once and extracts the repositories, their search metadata and the
+        next page URL.
+
+        Args:
+            html (str): The HTML content of the search results page.
+
+        Returns:
+            SearchPage: The repositories with their URL and any description, stars and updated time shown, and the
+            next page URL, if any.
+        """
+        logger.info('Parsing search results...')
+        page = self.parser.parse_search_page(html, self.base_url)
+        logger.info('Found %d repositories', len(page.results))
+        return page
 
     def _parse_search_results(self, html: str) -> List[Dict[str, str]]:
         """
@@ -91,16 +306,9 @@ class GitHubCrawler:
         Returns:
             List[Dict[str, str]]: A list of dictionaries containing repository URLs.
         """
-        logger.info('Parsing search results...')
-        soup = BeautifulSoup(html, 'html.parser')
-        results = []
-        for link in soup.select("div[data-testid='results-list'] [class~='search-title'] a"):
-            results.append({'url': urljoin(BASE_URL, link['href'])})
-        logger.info('Found %d repositories', len(results))
-        return results
+        return self._parse_search_page(html)[0]
 
     def _parse_language_stats(self, html: str) -> Dict[str, float]:
-        logger.info('Parsing language stats...')
         """
         Parses the language statistics from the repository details page.
 
@@ -110,25 +318,49 @@ class GitHubCrawler:
         Returns:
             Dict[str, float]: A dictionary mapping language names to their usage percentages.
         """
-        logger.info("Parsing language stats...")
-        language_stats = {}
-        soup = BeautifulSoup(html, 'html.parser')
-        h2 = soup.find('h2', string='Languages')
-        if not h2:
+        logger.info('Parsing language stats...')
+        language_stats = self.parser.parse_language_stats(html)
+        if not language_stats:
             logger.info('No language stats found')
-            return {}
-
-        languages_container = h2.find_next('ul').select('a.d-inline-flex')
-        for language_container in languages_container:
-            lang_name = language_container.select_one('span').get_text(strip=True)
-            lang_percent = language_container.select_one('span + span').get_text(strip=True).strip('%')
-            language_stats[lang_name] = float(lang_percent)
-        logger.info('Parsed language stats: %s', language_stats)
+            return language_stats
+
+        logger.debug('Parsed language stats: %s', language_stats)
         return language_stats
 
+    @staticmethod
+    def _set_details(repo: Dict[str, Any], language_stats: Dict[str, float]) -> None:
+        repo['extra'] = {
+            'owner': urlparse(repo['url']).path.split('/')[1],
+            'language_stats': language_stats
+        }
+
+    def _reuse_record(self, repo: Dict[str, Any], record: Optional[RepoRecord], body_hash: Optional[str]) -> bool:
+        """Reuse the stored details of a repository whose fetched body hash matches its record."""
+        if not record or record.content_hash != body_hash:
+            return False
+        self.recrawl.unchanged += 1
+        repo['extra'] = record.extra
+        repo['changed'] = False
+        self.recrawl.put(repo, body_hash)
+        return True
+
+    def _store_details(self, repo: Dict[str, Any], language_stats: Dict[str, float],
+                       body_hash: Optional[str]) -> None:
+        """Set freshly fetched details on a repository and, in incremental mode, record them as changed."""
+        self._set_details(repo, language_stats)
+        if self.recrawl:
+            self.recrawl.changed += 1
+            repo['changed'] = True
+            self.recrawl.put(repo, body_hash)
+        logger.info('Fetched details for repo: %s', repo['url'])
+
     async def _get_repo_details(self, repo: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Fetches additional details for a repository, such as the owner and language statistics.
+        Fetches additional details for a repository, such as the owner and language statistics, with the
+        detail backend.
+
+        In incremental mode, a repository whose record is current is not fetched, and one whose page body
+        hash matches its record reuses the stored details; `changed` tells whether the details are new.
 
         Args:
             repo (Dict[str, str]): A dictionary containing the repository URL.
@@ -136,15 +368,15 @@ class GitHubCrawler:
         Returns:
             Dict[str, str]: A dictionary containing repository details with extra information.
         """
+        record = self.recrawl.get(repo['url']) if self.recrawl else None
+        if record and self.recrawl.is_current(record, repo):
+            self.recrawl.skipped += 1
+            repo['extra'] = record.extra
+            repo['changed'] = False
+            return repo
+
         logger.info('Fetching details for repo: %s', repo['url'])
-        html = await self._fetch(repo['url'], query_params={})
-        if html:
-            repo['extra'] = {
-                'owner': urlparse(repo['url']).path.split('/')[1],
-                'language_stats': self._parse_language_stats(html)
-            }
-            logger.info('Fetched details for repo: %s', repo['url'])
-        return repo
+        return await self.detail_backend.fetch(self, repo, record)
 
     def _get_next_page_url(self, html: str) -> Optional[str]:
         """
@@ -156,9 +388,185 @@ class GitHubCrawler:
         Returns:
             Optional[str]: The URL of the next page, or None if no next page exists.
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        next_link = soup.find('a', rel='next')
-        return next_link.get('href') if next_link else None
+        return self.parser.parse_next_page_url(html)
+
+    async def _search_repos(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Follows the search result pagination and yields every repository found.
+
+        When resuming from a checkpoint, the repositories left pending are yielded first and pagination
+        continues from the recorded next page.
+
+        Yields:
+            Dict[str, Any]: A repository listed on a search page, without details.
+        """
+        search_url, query_params = self._get_search_url()
+        if self.checkpoint:
+            self.checkpoint.start(search_url, query_params)
+            if self.checkpoint.resumed:
+                for repo in self.checkpoint.pending:
+                    yield repo
+                search_url, query_params = self.checkpoint.next_url, {}
+
+        pages = 0
+        while search_url:
+            if self.max_pages is not None and pages >= self.max_pages:
+                logger.info('Reached the limit of %d search pages', self.max_pages)
+                self.stop_reason = self.stop_reason or 'max_pages'
+                break
+            pages += 1
+            if self.budget:
+                if self.budget.exhausted():
+                    logger.info('Stopping pagination, budget exhausted: %s', self.budget.reason)
+                    break
+                self.budget.pages += 1
+            logger.info('Fetching page: %s', search_url)
+            html = await self._fetch(search_url, query_params)
+            if not html:
+                logger.error('Failed to fetch page: %s', search_url)
+                break
+
+            with self._timer('parse'):
+                if self.parse_executor:
+                    repos, next_page_url = await self.parse_executor.submit('parse_search_page', html, self.base_url)
+                else:
+                    repos, next_page_url = self._parse_search_page(html)
+            next_page_url = urljoin(self.base_url, next_page_url) if next_page_url else None
+            if self.checkpoint:
+                self.checkpoint.record_page(search_url, repos, next_page_url)
+            for repo in repos:
+                yield repo
+            search_url = next_page_url
+            query_params = {}
+
+    async def _produce_repos(self, queue: asyncio.Queue) -> None:
+        """
+        Enqueues every repository found by the search as a repo-detail job.
+
+        Args:
+            queue (asyncio.Queue): The work queue consumed by the repo-detail workers.
+        """
+        async for repo in self._search_repos():
+            await queue.put(repo)
+            self._set_queue_depth(queue)
+
+    async def _consume_repos(self, queue: asyncio.Queue, results: asyncio.Queue) -> None:
+        """
+        Takes repo-detail jobs off the work queue until cancelled and passes their results on.
+
+        Args:
+            queue (asyncio.Queue): The work queue filled by the search page producer.
+            results (asyncio.Queue): The queue the finished repositories are put on.
+        """
+        while True:
+            repo = await queue.get()
+            self._set_queue_depth(queue)
+            try:
+                if self.details is not None:
+                    repo = await self.details.get(repo['url'], partial(self._get_repo_details, repo))
+                else:
+                    repo = await self._get_repo_details(repo)
+                await results.put(repo)
+            except Exception:
+                logger.exception('Failed to get details for repo: %s', repo)
+            finally:
+                queue.task_done()
+
+    async def _produce_until_drained(self, queue: asyncio.Queue, results: asyncio.Queue) -> None:
+        """
+        Runs the search page producer and waits for the workers to finish every job, then closes the results queue.
+
+        Args:
+            queue (asyncio.Queue): The work queue consumed by the repo-detail workers.
+            results (asyncio.Queue): The results queue, closed with a sentinel or the producer's exception.
+        """
+        try:
+            await self._produce_repos(queue)
+            await queue.join()
+        except Exception as e:
+            await results.put(e)
+        else:
+            await results.put(_DONE)
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Provides the shared session if one was given, otherwise a new session closed when the run ends."""
+        if self._shared_session:
+            yield self.session
+            return
+
+        trace_configs = [self.metrics.trace_config()] if self.metrics else None
+        async with self.session_factory.create(trace_configs=trace_configs) as session:
+            self.session = session
+            yield session
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Crawls the search results and yields each repository as soon as its details are fetched.
+
+        Search pages are fetched by a producer while a pool of workers fetches repository details, so the next
+        page is requested while the details of the current one are still in flight. Both queues are bounded,
+        so a slow consumer slows the crawl down instead of buffering results in memory. When resuming from a
+        checkpoint, the repositories finished before the crash are yielded first, and count against the budget's
+        repository cap. A repository is recorded in the checkpoint when it is yielded. When a cap of the budget is
+        hit, in-flight requests are cancelled and the stream ends; repositories whose details were already
+        fetched are still yielded unless the repository cap is reached. `status` tells whether the crawl
+        completed or ran out of budget.
+
+        Yields:
+            Dict[str, Any]: A repository with its details, in the order the details were finished.
+        """
+        logger.info('Starting GitHub crawling process')
+        self.status = 'running'
+        self.stop_reason = None
+        if self.budget:
+            self.budget.start()
+        if self.checkpoint:
+            for repo in self.checkpoint.completed:
+                if self.budget and not self.budget.take_repo():
+                    break
+                yield repo
+        if self.budget and self.budget.exhausted():
+            self._set_status()
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.scheduler.queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.scheduler.queue_size)
+        async with self._session_scope():
+            tasks = [
+                asyncio.create_task(self._consume_repos(queue, results))
+                for _ in range(self.detail_backend.workers(self.scheduler.concurrency))
+            ]
+            tasks.append(asyncio.create_task(self._produce_until_drained(queue, results)))
+            try:
+                while not (self.budget and self.budget.exhausted()):
+                    try:
+                        repo = await asyncio.wait_for(results.get(), self.budget and self.budget.remaining())
+                    except asyncio.TimeoutError:
+                        continue
+                    if repo is _DONE:
+                        break
+                    if isinstance(repo, Exception):
+                        raise repo
+                    if self.budget and not self.budget.take_repo():
+                        break
+                    if self.checkpoint and 'extra' in repo:
+                        self.checkpoint.record_repo(repo)
+                    yield repo
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        self._set_status()
+
+    def _set_status(self) -> None:
+        if self.budget and self.budget.reason:
+            self.stop_reason = self.stop_reason or self.budget.reason
+        if self.stop_reason:
+            self.status = 'budget_exhausted'
+            logger.warning('Crawl stopped early, budget exhausted: %s', self.stop_reason)
+        else:
+            self.status = 'complete'
 
     async def run(self) -> List[Dict[str, str]]:
         """
@@ -167,22 +575,17 @@ class GitHubCrawler:
         Returns:
             List[Dict[str, str]]: A list of repositories with their details (URLs, owners, language stats, etc.).
         """
-        logger.info('Starting GitHub crawling process')
-        search_url, query_params = self._get_search_url()
-        all_repos: List[Dict[str, str]] = []
-        async with aiohttp.ClientSession() as session:
-            self.session = session
-            while search_url:
-                logger.info('Fetching page: %s', search_url)
-                html = await self._fetch(search_url, query_params)
-                if not html:
-                    logger.error('Failed to fetch page: %s', search_url)
-                    break
+        all_repos = [repo async for repo in self.stream()]
+        logger.info('Finished crawling. Found %d repositories.', len(all_repos))
+        return all_repos
 
-                repos = self._parse_search_results(html)
-                repo_details = await asyncio.gather(*[self._get_repo_details(repo) for repo in repos])
-                all_repos.extend(repo_details)
-                search_url = self._get_next_page_url(html)
-                query_params = {}
+    async def run_records(self) -> List[RepoDetails]:
+        """
+        Runs the crawl like run(), but keeps each repository as a compact RepoDetails record instead of a dict.
+
+        Returns:
+            List[RepoDetails]: The repositories with their details; RepoDetails.to_dict() gives the run() layout.
+        """
+        all_repos = [RepoDetails.from_dict(repo) async for repo in self.stream()]
         logger.info('Finished crawling. Found %d repositories.', len(all_repos))
         return all_repos
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class DetailRegistry:
+    """
+    Shares repository details between crawlers so each repository URL is fetched once per batch.
+
+    The first crawler that asks for a URL fetches it; every other crawler awaits the same task and gets
+    its own shallow copy of the result.
+
+    Attributes:
+        fetched (int): The number of distinct repository URLs fetched.
+        deduplicated (int): The number of requests for a URL that was already fetched or in flight.
+
+    Methods:
+        get(url, fetch) -> Dict[str, Any]: Returns the details of a URL, fetching them on first use.
+    """
+    def __init__(self) -> None:
+        self._details: Dict[str, asyncio.Task] = {}
+        self.fetched = 0
+        self.deduplicated = 0
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._details
+
+    async def get(self, url: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Returns the details of a repository URL, calling `fetch` only if no crawler has asked for it yet.
+
+        Args:
+            url (str): The repository URL.
+            fetch (Callable[[], Awaitable[Dict[str, Any]]]): Fetches the details when the URL is new.
+
+        Returns:
+            Dict[str, Any]: A copy of the repository details.
+        """
+        task = self._details.get(url)
+        if task is None:
+            task = self._details[url] = asyncio.ensure_future(fetch())
+            self.fetched += 1
+        else:
+            self.deduplicated += 1
+        return dict(await asyncio.shield(task))
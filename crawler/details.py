@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import (TYPE_CHECKING, Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, Type,
+                    TypeVar)
+from urllib.parse import urlparse
+
+import aiohttp
+
+from crawler.recrawl import RepoRecord, content_hash
+
+if TYPE_CHECKING:
+    from crawler.crawler import GitHubCrawler
+
+logger = logging.getLogger(__name__)
+
+API_URL = 'https://api.github.com/graphql'
+RATE_LIMITED = 'RATE_LIMITED'
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_WAIT = 0.05
+REPOSITORY_FIELDS = ('owner { login } languages(first: 100, orderBy: {field: SIZE, direction: DESC}) '
+                     '{ totalSize edges { size node { name } } }')
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class RequestCoalescer(Generic[T, R]):
+    """
+    Groups items submitted by concurrent callers into batches, each handled by one call of `flush`.
+
+    A batch is flushed once it holds `batch_size` items, or `max_wait` seconds after its first item was
+    submitted. Batches are flushed concurrently, and each caller gets the result at its item's position
+    in the list returned by `flush`, or the exception `flush` raised. A batch whose callers were all
+    cancelled, e.g. because a budget stopped the crawl, is cancelled too.
+
+    Attributes:
+        batch_size (int): The largest number of items per batch.
+        max_wait (float): The number of seconds an incomplete batch waits for more items.
+        batches (int): The number of batches flushed.
+
+    Methods:
+        submit(item) -> R: Adds an item to the next batch and waits for its result.
+    """
+    def __init__(self, flush: Callable[[List[T]], Awaitable[List[R]]], batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT) -> None:
+        """
+        Initializes the RequestCoalescer instance.
+
+        Args:
+            flush (Callable[[List[T]], Awaitable[List[R]]]): Handles a batch and returns one result per item.
+            batch_size (int): The largest number of items per batch.
+            max_wait (float): The longest delay before an incomplete batch is flushed, in seconds.
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._flush = flush
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        self.batches += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        futures = [future for _, future in batch]
+
+        def cancel_abandoned(_: asyncio.Future) -> None:
+            if not task.done() and all(future.cancelled() for future in futures):
+                task.cancel()
+
+        for future in futures:
+            future.add_done_callback(cancel_abandoned)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self._flush([item for item, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+
+class DetailBackend(ABC):
+    """
+    Base class for the ways GitHubCrawler fetches the owner and language stats of a repository.
+
+    Backends fetch through the crawler's _fetch, so requests share its session, scheduler, retry policy,
+    proxies and budget, and record incremental recrawls through the crawler's store.
+
+    Methods:
+        fetch(crawler, repo, record) -> Dict: Adds the details to a repository and returns it.
+        workers(concurrency) -> int: Returns the number of repo-detail workers a crawl should run.
+    """
+    name = ''
+
+    def workers(self, concurrency: int) -> int:
+        return concurrency
+
+    @abstractmethod
+    async def fetch(self, crawler: 'GitHubCrawler', repo: Dict[str, Any],
+                    record: Optional[RepoRecord]) -> Dict[str, Any]:
+        """
+        Fetches the details of one repository.
+
+        Args:
+            crawler (GitHubCrawler): The crawler the repository was found by.
+            repo (Dict[str, Any]): The repository, with at least its URL.
+            record (Optional[RepoRecord]): Its record in the crawler's recrawl store, if any.
+
+        Returns:
+            Dict[str, Any]: The repository, with `extra` set if its details could be fetched.
+        """
+
+
+class HtmlDetailBackend(DetailBackend):
+    """
+    Scrapes the HTML page of every repository, one request per repository.
+
+    With `stream_details`, the page is read until its language list is complete; otherwise it is downloaded
+    whole and, in incremental mode, parsed only when its body hash differs from the record.
+    """
+    name = 'html'
+
+    async def fetch(self, crawler: 'GitHubCrawler', repo: Dict[str, Any],
+                    record: Optional[RepoRecord]) -> Dict[str, Any]:
+        if crawler.stream_details and not crawler.recrawl:
+            language_stats = await crawler._fetch(repo['url'], query_params={}, reader=crawler._read_language_stats)
+            if language_stats is not None:
+                crawler._store_details(repo, language_stats, None)
+            return repo
+
+        html = await crawler._fetch(repo['url'], query_params={})
+        if html:
+            body_hash = content_hash(html) if crawler.recrawl else None
+            if crawler._reuse_record(repo, record, body_hash):
+                return repo
+
+            with crawler._timer('parse'):
+                if crawler.parse_executor:
+                    language_stats = await crawler.parse_executor.submit('parse_language_stats', html)
+                else:
+                    language_stats = crawler._parse_language_stats(html)
+            crawler._store_details(repo, language_stats, body_hash)
+        return repo
+
+
+def build_query(names: List[Tuple[str, str]]) -> str:
+    """Build one GraphQL query asking for the owner and languages of every (owner, name) pair, aliased r0, r1, ..."""
+    fields = ' '.join(
+        f'r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {REPOSITORY_FIELDS} }}'
+        for i, (owner, name) in enumerate(names)
+    )
+    return f'query {{ {fields} }}'
+
+
+def language_shares(node: Dict[str, Any]) -> Dict[str, float]:
+    """Turn the language sizes of a GraphQL repository node into percentages rounded like the repository page."""
+    languages = node.get('languages') or {}
+    total = languages.get('totalSize') or 0
+    if not total:
+        return {}
+    return {edge['node']['name']: round(100 * edge['size'] / total, 1) for edge in languages.get('edges') or []}
+
+
+class GraphQLDetailBackend(DetailBackend):
+    """
+    Asks a GraphQL API for the languages of many repositories per request, in the style of GitHub's API v4.
+
+    Repositories requested by concurrent workers are grouped by a RequestCoalescer, and every batch is sent as
+    one query with an aliased `repository` field per repository. A failed request, or a response that is not
+    JSON, leaves every repository of its batch without details; a repository the API reports an error for is
+    left without details alone. A RATE_LIMITED error is handled like a 429 response: the request is retried
+    after the retry policy's backoff.
+    Each batch goes out through the crawler of its first repository, so one backend can serve every crawler
+    of a BatchCrawler. In incremental mode, the hash of a repository's API node takes the place of the page
+    body hash.
+
+    Attributes:
+        url (str): The GraphQL endpoint.
+        token (Optional[str]): The API token, sent as a bearer token; GitHub's API rejects requests without one.
+        coalescer (RequestCoalescer): Groups pending repositories into batches.
+    """
+    name = 'graphql'
+
+    def __init__(self, url: str = API_URL, token: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT) -> None:
+        """
+        Initializes the GraphQLDetailBackend instance.
+
+        Args:
+            url (str): The GraphQL endpoint, e.g. a local stand-in server's /graphql.
+            token (Optional[str]): The API token, no Authorization header is sent if omitted.
+            batch_size (int): The largest number of repositories per request.
+            max_wait (float): The longest delay before an incomplete batch is sent, in seconds.
+        """
+        self.url = url
+        self.token = token
+        self.coalescer: RequestCoalescer = RequestCoalescer(self._fetch_batch, batch_size, max_wait)
+
+    def workers(self, concurrency: int) -> int:
+        # Workers wait on a batch without holding a request slot, so enough of them are run to fill a batch
+        # for every slot.
+        return concurrency * self.coalescer.batch_size
+
+    async def fetch(self, crawler: 'GitHubCrawler', repo: Dict[str, Any],
+                    record: Optional[RepoRecord]) -> Dict[str, Any]:
+        node = await self.coalescer.submit((crawler, repo))
+        if node is not None:
+            body_hash = content_hash(json.dumps(node, sort_keys=True)) if crawler.recrawl else None
+            if not crawler._reuse_record(repo, record, body_hash):
+                crawler._store_details(repo, language_shares(node), body_hash)
+        return repo
+
+    @staticmethod
+    async def _read_json(crawler: 'GitHubCrawler', response: aiohttp.ClientResponse) -> Optional[Dict[str, Any]]:
+        """
+        Reads a GraphQL response; a RATE_LIMITED error is raised as a 429 so _fetch backs off and retries.
+
+        Returns:
+            Optional[Dict[str, Any]]: The decoded response, or None if the body is not a JSON object, e.g. the HTML
+            page of a proxy or gateway.
+        """
+        body = await response.read()
+        if crawler.budget:
+            crawler.budget.bytes += len(body)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            logger.warning('Response of %s is not JSON', response.url)
+            return None
+        if not isinstance(payload, dict):
+            logger.warning('Response of %s is not a JSON object', response.url)
+            return None
+        if any(isinstance(error, dict) and error.get('type') == RATE_LIMITED
+               for error in payload.get('errors') or []):
+            raise aiohttp.ClientResponseError(response.request_info, response.history, status=429,
+                                              message=RATE_LIMITED, headers=response.headers)
+        return payload
+
+    async def _fetch_batch(self, items: List[Tuple['GitHubCrawler', Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        crawler = items[0][0]
+        names = [tuple(urlparse(repo['url']).path.split('/')[1:3]) for _, repo in items]
+        headers = {'Authorization': f'bearer {self.token}'} if self.token else None
+        logger.info('Fetching details for %d repos in one request', len(items))
+        response = await crawler._fetch(self.url, query_params={}, reader=partial(self._read_json, crawler),
+                                        json_body={'query': build_query(names)}, extra_headers=headers)
+        if response is None:
+            return [None] * len(items)
+        for error in response.get('errors') or []:
+            logger.warning('GraphQL error: %s', error.get('message', error) if isinstance(error, dict) else error)
+        data = response.get('data')
+        if not isinstance(data, dict):
+            data = {}
+        return [data.get(f'r{i}') for i in range(len(items))]
+
+
+DETAIL_BACKENDS: Dict[str, Type[DetailBackend]] = {HtmlDetailBackend.name: HtmlDetailBackend,
+                                                   GraphQLDetailBackend.name: GraphQLDetailBackend}
+
+
+def get_detail_backend(name: str, **kwargs: Any) -> DetailBackend:
+    """Return a new detail backend by name ('html' or 'graphql')."""
+    try:
+        backend = DETAIL_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown detail backend: {name}') from None
+    return backend(**kwargs)
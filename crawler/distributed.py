@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+from crawler.crawler import BASE_URL, GitHubCrawler
+from crawler.logs import configure_logging
+from crawler.scheduler import Scheduler
+from crawler.work_queue import Job, WorkQueue, open_queue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class Coordinator:
+    """
+    Paginates the search results of a crawler and enqueues every repository as a job on a shared WorkQueue.
+
+    Attributes:
+        crawler (GitHubCrawler): The crawler whose search is paginated.
+        queue (WorkQueue): The queue the repo-detail jobs are put on.
+        poll_interval (float): The number of seconds between two checks for finished jobs.
+
+    Methods:
+        enqueue() -> int: Enqueues the jobs of every search page and seals the queue.
+        run() -> List[Dict]: Enqueues the jobs and waits for the workers to finish them.
+    """
+    def __init__(self, crawler: GitHubCrawler, queue: WorkQueue, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.crawler = crawler
+        self.queue = queue
+        self.poll_interval = poll_interval
+
+    async def enqueue(self) -> int:
+        count = 0
+        async with self.crawler._session_scope():
+            async for repo in self.crawler._search_repos():
+                count += self.queue.put(repo['url'], repo)
+        self.queue.seal()
+        logger.info('Enqueued %d repositories', count)
+        return count
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """
+        Enqueues every repository found by the search and waits until the workers have finished or failed every job.
+
+        Returns:
+            List[Dict[str, Any]]: The repositories with their details, in the order they were found.
+        """
+        await self.enqueue()
+        while not self.queue.is_finished():
+            await asyncio.sleep(self.poll_interval)
+        counts = self.queue.counts()
+        logger.info('Finished distributed crawl: %d done, %d failed', counts['done'], counts['failed'])
+        return list(self.queue.results())
+
+
+class Worker:
+    """
+    Leases repo-detail jobs from a shared WorkQueue, fetches their details and stores the results.
+
+    A worker leases as many jobs as its crawler runs repo-detail workers: one per request its scheduler allows
+    in flight, or enough to fill a batch per request with a batched detail backend. Jobs whose details could
+    not be fetched are released for another attempt, and the jobs of a worker that dies are leased again once
+    their visibility timeout expires.
+
+    Attributes:
+        crawler (GitHubCrawler): The crawler used to fetch repository details.
+        queue (WorkQueue): The queue the jobs are leased from.
+        worker_id (str): The identifier written on the worker's leases.
+        poll_interval (float): The number of seconds to wait when no job is visible.
+
+    Methods:
+        run() -> int: Processes jobs until the queue is sealed and finished, and returns the number completed.
+    """
+    def __init__(self, crawler: GitHubCrawler, queue: WorkQueue, worker_id: Optional[str] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.crawler = crawler
+        self.queue = queue
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}-{id(self):x}'
+        self.poll_interval = poll_interval
+
+    async def _process(self, job: Job) -> bool:
+        try:
+            repo = await self.crawler._get_repo_details(job.payload)
+        except Exception:
+            logger.exception('Failed to get details for repo: %s', job.payload)
+            repo = job.payload
+        if 'extra' not in repo:
+            self.queue.release(job, self.worker_id)
+            return False
+        if not self.queue.complete(job, self.worker_id, repo):
+            logger.warning('Lease on %s expired before it was completed', repo['url'])
+            return False
+        return True
+
+    async def run(self) -> int:
+        completed = 0
+        async with self.crawler._session_scope():
+            while True:
+                jobs = self.queue.lease(self.worker_id,
+                                        self.crawler.detail_backend.workers(self.crawler.scheduler.concurrency))
+                if not jobs:
+                    if self.queue.is_finished():
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                completed += sum(await asyncio.gather(*(self._process(job) for job in jobs)))
+        logger.info('Worker %s completed %d jobs', self.worker_id, completed)
+        return completed
+
+
+def _detail_crawler(base_url: str, concurrency: int, proxy: Optional[str]) -> GitHubCrawler:
+    return GitHubCrawler(keywords=[], proxy=proxy, search_type='repositories',
+                         scheduler=Scheduler(concurrency), base_url=base_url)
+
+
+def _work(queue_location: str, base_url: str, concurrency: int, proxy: Optional[str],
+          poll_interval: float) -> None:
+    with open_queue(queue_location) as queue:
+        worker = Worker(_detail_crawler(base_url, concurrency, proxy), queue, poll_interval=poll_interval)
+        asyncio.run(worker.run())
+
+
+def spawn_workers(queue_location: str, processes: int, base_url: str = BASE_URL, concurrency: int = 10,
+                  proxy: Optional[str] = None, poll_interval: float = DEFAULT_POLL_INTERVAL) -> List[multiprocessing.Process]:
+    """
+    Starts worker processes on this machine; each runs its own event loop and exits once the queue is finished.
+
+    Args:
+        queue_location (str): The work queue: a SQLite file, or a Redis URL when other machines run workers too.
+        processes (int): The number of worker processes.
+        base_url (str): The site the repository pages are fetched from.
+        concurrency (int): The number of in-flight requests per process.
+        proxy (Optional[str]): The proxy used by the workers.
+        poll_interval (float): The number of seconds a worker waits when no job is visible.
+
+    Returns:
+        List[multiprocessing.Process]: The started processes, to be joined by the caller.
+    """
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=_work, args=(queue_location, base_url, concurrency, proxy, poll_interval), daemon=True)
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Run the coordinator or the workers of a distributed crawl.')
+    parser.add_argument('role', choices=['coordinate', 'work'])
+    parser.add_argument('--queue', required=True,
+                        help='The work queue shared by every process: a SQLite file for workers on this machine, '
+                             'or a redis:// URL for workers on several machines.')
+    parser.add_argument('--keywords', nargs='*', default=[], help='The search keywords (coordinator).')
+    parser.add_argument('--search-type', default='repositories', help='The search type (coordinator).')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='The worker processes to start.')
+    parser.add_argument('--concurrency', type=int, default=10, help='The in-flight requests per worker process.')
+    parser.add_argument('--proxy', default=None)
+    parser.add_argument('--base-url', default=BASE_URL)
+    args = parser.parse_args(argv)
+
+    if args.role == 'work':
+        for worker in spawn_workers(args.queue, args.processes, args.base_url, args.concurrency, args.proxy):
+            worker.join()
+        return
+
+    crawler = GitHubCrawler(args.keywords, args.proxy, args.search_type, base_url=args.base_url)
+    with open_queue(args.queue) as queue:
+        for repo in asyncio.run(Coordinator(crawler, queue).run()):
+            sys.stdout.write(json.dumps(repo) + '\n')
+
+
+if __name__ == '__main__':
+    configure_logging()
+    main()
@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Literal, Optional, Union
+
+from crawler.parsers import ParserBackend, get_parser
+
+_worker_parsers: Dict[str, ParserBackend] = {}
+
+
+def _parse_in_worker(parser_name: str, method: str, html: Union[str, bytes], *args: Any) -> Any:
+    """Run a parser backend method inside an executor worker, reusing one backend instance per worker."""
+    parser = _worker_parsers.get(parser_name)
+    if parser is None:
+        parser = _worker_parsers[parser_name] = get_parser(parser_name)
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    return getattr(parser, method)(html, *args)
+
+
+class ParseExecutor:
+    """
+    Runs HTML parsing in a process or thread pool so CPU-heavy parses do not block the event loop.
+
+    Only the page body and the method name cross the pool boundary, and only the parsed result
+    (a list of URL dicts, a next page href or a language stats dict) comes back.
+
+    Attributes:
+        parser (str): The name of the parser backend used by the workers.
+        kind (str): The pool type, 'process' or 'thread'.
+        max_workers (Optional[int]): The pool size, defaults to the executor's own default.
+
+    Methods:
+        submit(method, html, *args) -> Any: Runs a parser backend method in the pool.
+        shutdown(wait) -> None: Shuts the pool down.
+    """
+    def __init__(self, parser: str = 'fast', kind: Literal['process', 'thread'] = 'process',
+                 max_workers: Optional[int] = None) -> None:
+        """
+        Initializes the ParseExecutor instance.
+
+        Args:
+            parser (str): The name of the parser backend, see crawler.parsers.PARSERS.
+            kind (Literal['process', 'thread']): The pool type.
+            max_workers (Optional[int]): The number of pool workers.
+        """
+        get_parser(parser)
+        if kind == 'process':
+            self._executor: Executor = ProcessPoolExecutor(max_workers=max_workers)
+        elif kind == 'thread':
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='parse')
+        else:
+            raise ValueError(f'Unknown executor kind: {kind}')
+        self.parser = parser
+        self.kind = kind
+        self.max_workers = max_workers
+
+    async def submit(self, method: str, html: Union[str, bytes], *args: Any) -> Any:
+        """
+        Runs a parser backend method in the pool and waits for its result without blocking the event loop.
+
+        Args:
+            method (str): The ParserBackend method name, e.g. 'parse_search_page' or 'parse_language_stats'.
+            html (Union[str, bytes]): The page body, bytes are decoded as UTF-8 in the worker.
+            *args (Any): Extra arguments for the method, e.g. the base URL.
+
+        Returns:
+            Any: The value returned by the parser backend method.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _parse_in_worker, self.parser, method, html, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'ParseExecutor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
@@ -0,0 +1,115 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO
+
+HIGH_VOLUME_EVENTS: Dict[str, int] = {
+    'Attempting to fetch %s with proxy %s (Attempt %d)': 100,
+    'Successfully fetched %s': 100,
+    'Serving %s from cache': 100,
+    'Not modified, serving %s from cache': 100,
+    'Fetching details for repo: %s': 100,
+    'Fetched details for repo: %s': 100,
+    'Parsing language stats...': 100,
+    'No language stats found': 100,
+}
+TEXT_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one record in every N for each sampled event, keyed by the unformatted message template.
+
+    Records of events that are not listed, and records at WARNING or above, always pass.
+    """
+    def __init__(self, rates: Dict[str, int]) -> None:
+        super().__init__()
+        self.rates = rates
+        self.seen: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.msg) if record.levelno < logging.WARNING else None
+        if not rate or rate <= 1:
+            return True
+        count = self.seen.get(record.msg, 0)
+        self.seen[record.msg] = count + 1
+        return count % rate == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object with the event template kept apart from the rendered message."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'event': str(record.msg),
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """Enqueues records untouched, so message formatting happens on the listener thread."""
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _Listener(QueueListener):
+    """A QueueListener whose stop() does nothing unless it is running, so callers and atexit can both stop it."""
+    running = False
+
+    def start(self) -> None:
+        super().start()
+        self.running = True
+
+    def stop(self) -> None:
+        if self.running:
+            self.running = False
+            super().stop()
+
+
+def configure_logging(level: int = logging.INFO, structured: bool = False, background: bool = True,
+                      sample_rates: Optional[Dict[str, int]] = None,
+                      stream: Optional[TextIO] = None) -> Optional[QueueListener]:
+    """
+    Configures the root logger for a crawl; the crawler modules never configure logging on import.
+
+    Args:
+        level (int): The root log level.
+        structured (bool): Whether to write JSON lines instead of plain text.
+        background (bool): Whether to format and write records on a QueueListener thread.
+        sample_rates (Optional[Dict[str, int]]): Keep one in N records per message template,
+            HIGH_VOLUME_EVENTS if omitted; pass {} to keep every record.
+        stream (Optional[TextIO]): The output stream, sys.stderr if omitted.
+
+    Returns:
+        Optional[QueueListener]: The started listener when background is True; it is stopped at exit.
+    """
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if structured else logging.Formatter(TEXT_FORMAT))
+    sampling = SamplingFilter(HIGH_VOLUME_EVENTS if sample_rates is None else sample_rates)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if not background:
+        output.addFilter(sampling)
+        root.addHandler(output)
+        return None
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _InProcessQueueHandler(records)
+    handler.addFilter(sampling)
+    root.addHandler(handler)
+    listener = _Listener(records, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,251 @@
+import asyncio
+import cProfile
+import json
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'crawler'
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{label}="{value}"' for label, value in pairs) + '}'
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observed durations in seconds."""
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Counters, gauges and stage timers for the fetch, parse and queue stages of a crawl.
+
+    Stages timed: 'dns', 'connect', 'ttfb' (request fully sent to response headers), 'body' (body download)
+    and 'parse'. Counters: 'retries', 'responses' by status and 'response_bytes'. Gauges: 'in_flight'
+    requests and 'queue_depth'. The network stages, status codes, bytes and in-flight requests come from
+    the aiohttp TraceConfig returned by trace_config().
+
+    Methods:
+        inc(name, value, **labels) -> None: Increments a counter.
+        set_gauge(name, value, **labels) -> None: Sets a gauge.
+        observe(name, seconds, **labels) -> None: Records a duration in a histogram.
+        timer(name, **labels) -> Iterator[None]: Times a block into a histogram.
+        trace_config() -> aiohttp.TraceConfig: Builds the tracing hooks for an aiohttp session.
+        to_prometheus() -> str: Renders every metric in the Prometheus text format.
+        snapshot() -> Dict[str, Any]: Returns every metric as a JSON-serializable dict.
+    """
+    def __init__(self) -> None:
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        self.gauges[_key(name, labels)] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        self.gauges[key] = self.gauges.get(key, 0) + delta
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build aiohttp tracing hooks that feed the network stage timers, status and byte counters."""
+        trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+
+        async def on_request_start(session, ctx, params):
+            ctx.request_start = time.perf_counter()
+            self.add_gauge('in_flight', 1)
+
+        async def on_request_sent(session, ctx, params):
+            # Headers, then every body chunk: ttfb starts once the last of them is written, so it leaves out
+            # the DNS lookup, connection setup and upload.
+            ctx.request_sent = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            sent = getattr(ctx, 'request_sent', ctx.request_start)
+            self.observe('stage_seconds', time.perf_counter() - sent, stage='ttfb')
+            self.inc('responses', status=params.response.status)
+            self.add_gauge('in_flight', -1)
+
+        async def on_request_exception(session, ctx, params):
+            self.inc('request_errors', error=type(params.exception).__name__)
+            self.add_gauge('in_flight', -1)
+
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_start = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.observe('stage_seconds', time.perf_counter() - ctx.dns_start, stage='dns')
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_start = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            self.observe('stage_seconds', time.perf_counter() - ctx.connect_start, stage='connect')
+
+        async def on_response_chunk_received(session, ctx, params):
+            self.inc('response_bytes', len(params.chunk))
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_headers_sent.append(on_request_sent)
+        trace_config.on_request_chunk_sent.append(on_request_sent)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return trace_config
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for kind, values in (('counter', self.counters), ('gauge', self.gauges)):
+            for name in sorted({name for name, _ in values}):
+                metric = f'{PREFIX}_{name}_total' if kind == 'counter' else f'{PREFIX}_{name}'
+                lines.append(f'# TYPE {metric} {kind}')
+                for (key_name, labels), value in sorted(values.items()):
+                    if key_name == name:
+                        lines.append(f'{metric}{_format_labels(labels)} {value:g}')
+        for name in sorted({name for name, _ in self.histograms}):
+            metric = f'{PREFIX}_{name}'
+            lines.append(f'# TYPE {metric} histogram')
+            for (key_name, labels), histogram in sorted(self.histograms.items()):
+                if key_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'{metric}_bucket{_format_labels(labels, le=le)} {cumulative}')
+                lines.append(f'{metric}_sum{_format_labels(labels)} {histogram.sum:g}')
+                lines.append(f'{metric}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        def flatten(key: LabelKey) -> str:
+            name, labels = key
+            return name + ''.join(f'.{value}' for _, value in labels)
+
+        return {
+            'timestamp': time.time(),
+            'counters': {flatten(key): value for key, value in self.counters.items()},
+            'gauges': {flatten(key): value for key, value in self.gauges.items()},
+            'timers': {
+                flatten(key): {
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                }
+                for key, histogram in self.histograms.items()
+            },
+        }
+
+
+async def serve_prometheus(metrics: Metrics, host: str = '127.0.0.1', port: int = 9100) -> 'web.AppRunner':
+    """Serve the metrics in the Prometheus text format at /metrics; clean the returned runner up to stop."""
+    from aiohttp import web
+
+    async def handler(request: 'web.Request') -> 'web.Response':
+        return web.Response(text=metrics.to_prometheus(), content_type='text/plain')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def write_snapshots(metrics: Metrics, path: str, interval: float = 10.0) -> None:
+    """Append a JSON snapshot of the metrics to a file every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        with open(path, 'a') as file:
+            file.write(json.dumps(metrics.snapshot()) + '\n')
+
+
+@contextmanager
+def profile(path: str, engine: str = 'cprofile') -> Iterator[None]:
+    """
+    Profiles a block, e.g. a whole crawl, and writes the result to `path`.
+
+    Args:
+        path (str): The output file, pstats data for cProfile or an HTML report for pyinstrument.
+        engine (str): 'cprofile', or 'pyinstrument', which needs the optional pyinstrument package.
+
+    Raises:
+        ImportError: If engine is 'pyinstrument' and pyinstrument is not installed.
+        ValueError: If the engine is unknown.
+    """
+    if engine not in ('cprofile', 'pyinstrument'):
+        raise ValueError(f'Unknown profiler engine: {engine}')
+    if engine == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profiler = Profiler(async_mode='enabled')
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, 'w') as file:
+                file.write(profiler.output_html())
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        logger.info('Wrote profile to %s', path)
@@ -0,0 +1,9 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchFilterModel(BaseModel):
+    keywords: List[str]
+    proxy: Optional[str] = None
+    search_type: Literal['repositories', 'issues', 'wikis']
@@ -0,0 +1,346 @@
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+from urllib.parse import urljoin
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+})
+
+STARS_LABEL = re.compile(r'^([\d.,]+)\s*([kKmM]?)\s+stars?$')
+
+
+def parse_count(label: str) -> Optional[int]:
+    """Parse a star count label such as '1.2k stars' or '1,234 stars'."""
+    match = STARS_LABEL.match(label.strip())
+    if not match:
+        return None
+    number = float(match.group(1).replace(',', ''))
+    return int(round(number * {'': 1, 'k': 1_000, 'm': 1_000_000}[match.group(2).lower()]))
+
+
+def _is_description(tag: str, classes: List[str]) -> bool:
+    return tag == 'p' or 'search-match' in classes
+
+
+class SearchPage(NamedTuple):
+    """
+    Everything extracted from one search page in a single parse.
+
+    Each result has its `url`, plus the `description`, `stars` and `updated` time its search result shows,
+    when present: the text of the first paragraph or .search-match element, the count of the '<n> stars'
+    label, and the first `datetime` attribute of the result.
+    """
+    results: List[Dict[str, Any]]
+    next_href: Optional[str]
+
+
+class ParserBackend(ABC):
+    """
+    Base class for the HTML extraction backends used by GitHubCrawler.
+
+    Subclasses implement parse_search_page() and parse_language_stats(); the single-field helpers are derived
+    from them.
+
+    Methods:
+        parse_search_page(html, base_url) -> SearchPage: Extracts the results with their metadata and the next page URL.
+        parse_search_results(html, base_url) -> List[Dict]: Extracts the repository URLs of a search page.
+        parse_next_page_url(html) -> Optional[str]: Extracts the href of the rel=next link of a search page.
+        parse_language_stats(html) -> Dict[str, float]: Extracts the language percentages of a repository page.
+    """
+    name = ''
+
+    @abstractmethod
+    def parse_search_page(self, html: str, base_url: str) -> SearchPage:
+        ...
+
+    @abstractmethod
+    def parse_language_stats(self, html: str) -> Dict[str, float]:
+        ...
+
+    def parse_search_results(self, html: str, base_url: str) -> List[Dict[str, Any]]:
+        return self.parse_search_page(html, base_url)[0]
+
+    def parse_next_page_url(self, html: str) -> Optional[str]:
+        return self.parse_search_page(html, '')[1]
+
+
+class SoupParser(ParserBackend):
+    """The reference backend, builds a full BeautifulSoup tree with the pure-Python html.parser."""
+    name = 'soup'
+
+    @staticmethod
+    def _soup(html: str):
+        # bs4 takes tens of milliseconds to import and only this backend needs it.
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(html, 'html.parser')
+
+    @staticmethod
+    def _result_item(link):
+        item = link
+        while item.parent is not None and not (
+            item.parent.name == 'div' and item.parent.get('data-testid') == 'results-list'
+        ):
+            item = item.parent
+        return item
+
+    @staticmethod
+    def _metadata(item) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {}
+        for element in [item, *item.find_all(True)]:
+            if 'description' not in metadata and _is_description(element.name, element.get('class') or []):
+                text = ' '.join(element.get_text(' ').split())
+                if text:
+                    metadata['description'] = text
+            if 'stars' not in metadata and element.get('aria-label'):
+                stars = parse_count(element['aria-label'])
+                if stars is not None:
+                    metadata['stars'] = stars
+            if 'updated' not in metadata and element.get('datetime') is not None:
+                metadata['updated'] = element['datetime']
+        return metadata
+
+    def parse_search_page(self, html: str, base_url: str) -> SearchPage:
+        soup = self._soup(html)
+        results = []
+        for link in soup.select("div[data-testid='results-list'] [class~='search-title'] a"):
+            results.append({'url': urljoin(base_url, link['href']), **self._metadata(self._result_item(link))})
+        next_link = soup.find('a', rel='next')
+        return SearchPage(results, next_link.get('href') if next_link else None)
+
+    def parse_language_stats(self, html: str) -> Dict[str, float]:
+        language_stats = {}
+        soup = self._soup(html)
+        h2 = soup.find('h2', string='Languages')
+        if not h2:
+            return {}
+
+        languages_container = h2.find_next('ul').select('a.d-inline-flex')
+        for language_container in languages_container:
+            lang_name = language_container.select_one('span').get_text(strip=True)
+            lang_percent = language_container.select_one('span + span').get_text(strip=True).strip('%')
+            language_stats[lang_name] = float(lang_percent)
+        return language_stats
+
+
+class _Element:
+    __slots__ = ('tag', 'role', 'last_child', 'item', 'description')
+
+    def __init__(self, tag: str, role: Optional[str]) -> None:
+        self.tag = tag
+        self.role = role
+        self.last_child: Optional[str] = None
+        self.item = False
+        self.description = False
+
+
+class PageScanner(HTMLParser):
+    """
+    A single-pass scanner that keeps only the state needed for the fields GitHubCrawler extracts.
+
+    It mirrors the selectors of SoupParser without building a tree: result links inside the results list
+    with the metadata of their result item, the first rel=next link, and the language list that follows the
+    "Languages" heading. Input can be fed in chunks; languages_done turns True as soon as the language list
+    is closed.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.result_hrefs: List[str] = []
+        self.result_metadata: List[Dict[str, Any]] = []
+        self.next_href: Optional[str] = None
+        self.language_stats: Dict[str, float] = {}
+        self.languages_done = False
+        self._stack: List[_Element] = []
+        self._results_depth = 0
+        self._title_depth = 0
+        self._next_found = False
+        self._languages_state = 'heading'
+        self._heading_text: Optional[List[str]] = None
+        # The child counts of the open elements of the heading, outermost first: like bs4's Tag.string, the
+        # heading matches only through a chain of single children ending in its text.
+        self._heading_children: List[int] = []
+        self._heading_single = True
+        self._heading_in_text = False
+        self._anchor_depth = 0
+        self._name: Optional[str] = None
+        self._percent: Optional[str] = None
+        self._span_text: Optional[List[str]] = None
+        self._item: Optional[Dict[str, Any]] = None
+        self._description_text: Optional[List[str]] = None
+
+    def _scan_item(self, tag: str, attrs: Dict[str, Optional[str]], element: Optional[_Element]) -> None:
+        item = self._item
+        if self._description_text is not None:
+            self._description_text.append(' ')
+        elif element is not None and 'description' not in item and _is_description(tag, (attrs.get('class') or '').split()):
+            element.description = True
+            self._description_text = []
+        if 'stars' not in item and attrs.get('aria-label'):
+            stars = parse_count(attrs['aria-label'])
+            if stars is not None:
+                item['stars'] = stars
+        if 'updated' not in item and attrs.get('datetime') is not None:
+            item['updated'] = attrs['datetime']
+
+    def _role(self, tag: str, attrs: Dict[str, Optional[str]], parent: Optional[_Element]) -> Optional[str]:
+        classes = (attrs.get('class') or '').split()
+        if tag == 'div' and attrs.get('data-testid') == 'results-list':
+            return 'results'
+        if self._results_depth and 'search-title' in classes:
+            return 'title'
+        if self._languages_state == 'heading' and tag == 'h2':
+            return 'heading'
+        if self._languages_state == 'list' and tag == 'ul':
+            return 'languages'
+        if self._languages_state == 'items' and tag == 'a' and 'd-inline-flex' in classes:
+            return 'anchor'
+        if self._anchor_depth and tag == 'span' and self._span_text is None:
+            if self._name is None:
+                return 'name'
+            if self._percent is None and parent is not None and parent.last_child == 'span':
+                return 'percent'
+        return None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        parent = self._stack[-1] if self._stack else None
+        if tag == 'a':
+            if self._results_depth and self._title_depth and attributes.get('href') is not None:
+                self.result_hrefs.append(attributes['href'])
+                self.result_metadata.append(self._item if self._item is not None else {})
+            if not self._next_found and 'next' in (attributes.get('rel') or '').split():
+                self._next_found = True
+                self.next_href = attributes.get('href')
+        if self._heading_text is not None:
+            self._heading_children[-1] += 1
+            self._heading_in_text = False
+            if tag in VOID_ELEMENTS:
+                self._heading_single = False
+
+        role = self._role(tag, attributes, parent)
+        if parent is not None:
+            parent.last_child = tag
+        element = None if tag in VOID_ELEMENTS else _Element(tag, role)
+        if element is not None and parent is not None and parent.role == 'results':
+            element.item = True
+            self._item = {}
+        if self._item is not None:
+            self._scan_item(tag, attributes, element)
+        if element is None:
+            return
+
+        self._stack.append(element)
+        if role == 'results':
+            self._results_depth += 1
+        elif role == 'title':
+            self._title_depth += 1
+        elif role == 'heading':
+            self._heading_text = []
+            self._heading_children = []
+            self._heading_single = True
+        elif role == 'languages':
+            self._languages_state = 'items'
+        elif role == 'anchor':
+            self._anchor_depth += 1
+            self._name = self._percent = None
+        elif role in ('name', 'percent'):
+            self._span_text = []
+        if self._heading_text is not None:
+            self._heading_children.append(0)
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                break
+        else:
+            return
+
+        while len(self._stack) > index:
+            self._close(self._stack.pop())
+        if self._description_text is not None:
+            self._description_text.append(' ')
+
+    def handle_data(self, data: str) -> None:
+        if self._description_text is not None:
+            self._description_text.append(data)
+        if self._heading_text is not None:
+            self._heading_text.append(data)
+            if not self._heading_in_text:
+                # Text split across chunks arrives in several calls but is one child.
+                self._heading_children[-1] += 1
+                self._heading_in_text = True
+        if self._span_text is not None:
+            text = data.strip()
+            if text:
+                self._span_text.append(text)
+
+    def _close(self, element: _Element) -> None:
+        if element.description:
+            text = ' '.join(''.join(self._description_text).split())
+            if text:
+                self._item['description'] = text
+            self._description_text = None
+        if element.item:
+            self._item = None
+        role = element.role
+        if self._heading_text is not None:
+            self._heading_in_text = False
+            if self._heading_children.pop() != 1:
+                self._heading_single = False
+        if role == 'results':
+            self._results_depth -= 1
+        elif role == 'title':
+            self._title_depth -= 1
+        elif role == 'heading':
+            if self._heading_single and ''.join(self._heading_text) == 'Languages':
+                self._languages_state = 'list'
+            self._heading_text = None
+        elif role == 'languages':
+            self._languages_state = 'done'
+            self.languages_done = True
+        elif role == 'anchor':
+            self._anchor_depth -= 1
+            if self._name is not None and self._percent is not None:
+                self.language_stats[self._name] = float(self._percent.strip('%'))
+        elif role == 'name':
+            self._name = ''.join(self._span_text)
+            self._span_text = None
+        elif role == 'percent':
+            self._percent = ''.join(self._span_text)
+            self._span_text = None
+
+
+class FastParser(ParserBackend):
+    """The fast backend, extracts every field of a page in one streaming pass with PageScanner."""
+    name = 'fast'
+
+    @staticmethod
+    def _scan(html: str) -> PageScanner:
+        scanner = PageScanner()
+        scanner.feed(html)
+        scanner.close()
+        return scanner
+
+    def parse_search_page(self, html: str, base_url: str) -> SearchPage:
+        scanner = self._scan(html)
+        results = [
+            {'url': urljoin(base_url, href), **metadata}
+            for href, metadata in zip(scanner.result_hrefs, scanner.result_metadata)
+        ]
+        return SearchPage(results, scanner.next_href)
+
+    def parse_language_stats(self, html: str) -> Dict[str, float]:
+        return self._scan(html).language_stats
+
+
+PARSERS: Dict[str, Type[ParserBackend]] = {SoupParser.name: SoupParser, FastParser.name: FastParser}
+
+
+def get_parser(name: str) -> ParserBackend:
+    """Return a new parser backend by name ('soup' or 'fast')."""
+    try:
+        return PARSERS[name]()
+    except KeyError:
+        raise ValueError(f'Unknown parser backend: {name}') from None
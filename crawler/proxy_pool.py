@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 2.0
+DEFAULT_FAILURE_THRESHOLD = 2
+DEFAULT_QUARANTINE = 30.0
+MAX_QUARANTINE = 600.0
+EWMA_ALPHA = 0.2
+PROXY_FAILURE_STATUSES = frozenset({403, 407, 429})
+
+
+def is_proxy_failure(error: Exception) -> bool:
+    """
+    Tell whether a failed request should count against the proxy it went through.
+
+    Connection and proxy errors, rate limiting, bans and gateway errors count; other HTTP errors such as
+    404 are answers from GitHub itself.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in PROXY_FAILURE_STATUSES or error.status >= 500
+    return True
+
+
+class TokenBucket:
+    """
+    A token bucket allowing `rate` requests per second with bursts of up to `capacity` requests.
+
+    Methods:
+        wait_time() -> float: Returns the number of seconds until a token is available.
+        acquire() -> None: Waits for a token and takes it.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        while True:
+            wait = self.wait_time()
+            if wait <= 0:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(wait)
+
+
+class ProxyStats:
+    """The health record of one proxy: smoothed latency and error rate, failure streak and quarantine deadline."""
+    def __init__(self, proxy: str, rate: float) -> None:
+        self.proxy = proxy
+        self.bucket = TokenBucket(rate)
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+
+    @property
+    def score(self) -> float:
+        """Lower is better: the smoothed latency, penalized by the smoothed error rate."""
+        return (self.latency or 0.0) * (1 + 4 * self.error_rate) + self.error_rate
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.quarantined_until
+
+
+class ProxyPool:
+    """
+    Rotates requests over a list of proxies, preferring fast and healthy ones.
+
+    Each proxy has its own token bucket, so the pool's request rate grows with the number of proxies.
+    Latency and error rate are tracked per proxy, and a proxy that fails `failure_threshold` times in a row
+    is quarantined for an exponentially growing period.
+
+    Attributes:
+        proxies (Dict[str, ProxyStats]): The health record of each proxy.
+        failure_threshold (int): The number of consecutive failures before a proxy is quarantined.
+        quarantine (float): The first quarantine period in seconds, doubled on every further failure.
+
+    Methods:
+        from_file(path, **kwargs) -> ProxyPool: Loads the proxies from a file, one per line.
+        acquire() -> Optional[str]: Waits for the best available proxy and takes one of its request tokens.
+        report(proxy, latency, ok) -> None: Records the outcome of a request made through a proxy.
+    """
+    def __init__(self, proxies: List[str], rate: float = DEFAULT_RATE,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, quarantine: float = DEFAULT_QUARANTINE) -> None:
+        """
+        Initializes the ProxyPool instance.
+
+        Args:
+            proxies (List[str]): The proxy URLs.
+            rate (float): The number of requests per second allowed through each proxy.
+            failure_threshold (int): The number of consecutive failures before a proxy is quarantined.
+            quarantine (float): The first quarantine period in seconds.
+        """
+        self.proxies: Dict[str, ProxyStats] = {proxy: ProxyStats(proxy, rate) for proxy in dict.fromkeys(proxies)}
+        self.failure_threshold = failure_threshold
+        self.quarantine = quarantine
+
+    @classmethod
+    def from_file(cls, proxy_file: str, **kwargs) -> 'ProxyPool':
+        """Load proxies from a file, one per line, and build a pool; a missing file gives an empty pool."""
+        try:
+            with open(proxy_file, 'r') as file:
+                proxies = [line.strip() for line in file if line.strip()]
+        except FileNotFoundError:
+            logger.warning('Proxy file not found. Proceeding without proxies.')
+            proxies = []
+        return cls(proxies, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Picks the available proxy that can send soonest, breaking ties by health score, and takes a token.
+
+        Waits while every proxy is quarantined.
+
+        Returns:
+            Optional[str]: The proxy URL, or None if the pool is empty.
+        """
+        if not self.proxies:
+            return None
+
+        while True:
+            now = time.monotonic()
+            available = [stats for stats in self.proxies.values() if stats.is_available(now)]
+            if available:
+                best = min(available, key=lambda stats: (stats.bucket.wait_time(), stats.score))
+                await best.bucket.acquire()
+                return best.proxy
+
+            release = min(stats.quarantined_until for stats in self.proxies.values())
+            await asyncio.sleep(release - now)
+
+    def report(self, proxy: Optional[str], latency: Optional[float], ok: bool) -> None:
+        """
+        Records the outcome of a request made through a proxy and quarantines it after repeated failures.
+
+        Args:
+            proxy (Optional[str]): The proxy returned by acquire(), None is ignored.
+            latency (Optional[float]): The request duration in seconds, if it completed.
+            ok (bool): Whether the proxy delivered a response.
+        """
+        stats = self.proxies.get(proxy)
+        if stats is None:
+            return
+
+        stats.requests += 1
+        stats.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - stats.error_rate)
+        if latency is not None:
+            stats.latency = latency if stats.latency is None else stats.latency + EWMA_ALPHA * (latency - stats.latency)
+        if ok:
+            stats.consecutive_failures = 0
+            return
+
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.failure_threshold:
+            period = min(self.quarantine * 2 ** (stats.consecutive_failures - self.failure_threshold), MAX_QUARANTINE)
+            stats.quarantined_until = time.monotonic() + period
+            logger.warning('Quarantining proxy %s for %.0f seconds', proxy, period)
@@ -0,0 +1,84 @@
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+SHARE_DIGITS = 4
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """A repository as listed on a search page, with the metadata its search result shows."""
+    url: str
+    description: Optional[str] = None
+    stars: Optional[int] = None
+    updated: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, hit: Dict[str, Any]) -> 'SearchHit':
+        return cls(hit['url'], hit.get('description'), hit.get('stars'), _intern(hit.get('updated')))
+
+    def to_dict(self) -> Dict[str, Any]:
+        hit: Dict[str, Any] = {'url': self.url}
+        for name in ('description', 'stars', 'updated'):
+            value = getattr(self, name)
+            if value is not None:
+                hit[name] = value
+        return hit
+
+
+@dataclass(slots=True)
+class RepoDetails:
+    """
+    A repository with its details, laid out for holding millions of them in memory.
+
+    The owner and language names are interned, so every record shares one copy of each string, and the
+    language stats are two parallel arrays instead of a dict: the names as a tuple and the shares as float32.
+    to_dict() returns the dict layout GitHubCrawler emits, with shares rounded back to SHARE_DIGITS digits.
+
+    Attributes:
+        hit (SearchHit): The search result the repository was found in.
+        owner (Optional[str]): The repository owner, None when the details could not be fetched.
+        languages (Tuple[str, ...]): The language names.
+        shares (array): The language percentages, in the order of `languages`.
+        changed (Optional[bool]): The incremental recrawl flag, None outside incremental mode.
+    """
+    hit: SearchHit
+    owner: Optional[str] = None
+    languages: Tuple[str, ...] = ()
+    shares: array = field(default_factory=lambda: array('f'))
+    changed: Optional[bool] = None
+
+    @property
+    def url(self) -> str:
+        return self.hit.url
+
+    @property
+    def language_stats(self) -> Dict[str, float]:
+        return {language: round(share, SHARE_DIGITS) for language, share in zip(self.languages, self.shares)}
+
+    @classmethod
+    def from_dict(cls, repo: Dict[str, Any]) -> 'RepoDetails':
+        extra = repo.get('extra')
+        if extra is None:
+            return cls(SearchHit.from_dict(repo), changed=repo.get('changed'))
+        stats = extra.get('language_stats') or {}
+        return cls(
+            SearchHit.from_dict(repo),
+            _intern(extra.get('owner')),
+            tuple(sys.intern(language) for language in stats),
+            array('f', stats.values()),
+            repo.get('changed'),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        repo = self.hit.to_dict()
+        if self.owner is not None:
+            repo['extra'] = {'owner': self.owner, 'language_stats': self.language_stats}
+        if self.changed is not None:
+            repo['changed'] = self.changed
+        return repo
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+DEFAULT_FRESHNESS = 24 * 3600
+SNIPPET_EXCLUDED_FIELDS = frozenset({'url', 'extra', 'changed'})
+
+
+def content_hash(body: str) -> str:
+    return hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def snippet_hash(repo: Dict[str, Any]) -> Optional[str]:
+    """Hash the search-result fields of a repository other than its URL, or None if the search page gave none."""
+    snippet = {field: value for field, value in repo.items() if field not in SNIPPET_EXCLUDED_FIELDS}
+    if not snippet:
+        return None
+    return content_hash(json.dumps(snippet, sort_keys=True, default=str))
+
+
+class RepoRecord(NamedTuple):
+    content_hash: str
+    snippet_hash: Optional[str]
+    seen_at: float
+    extra: Dict[str, Any]
+
+
+class RecrawlStore:
+    """
+    An on-disk SQLite record of the repositories seen by previous crawls, used to refresh only what changed.
+
+    A repository is not fetched again while its record is within the freshness window, or while the snippet
+    the search page shows for it is unchanged. Otherwise its page is fetched, and when the body hash matches
+    the record the stored details are reused instead of parsing the page again.
+
+    Attributes:
+        path (str): The SQLite database file, or ':memory:'.
+        freshness (float): The number of seconds a record is trusted without fetching the repository page.
+        compare_snippets (bool): Whether an unchanged search snippet makes a record current.
+        skipped (int): The number of repositories served from their record without a request.
+        unchanged (int): The number of fetched repositories whose page body had not changed.
+        changed (int): The number of repositories that are new or whose page body changed.
+
+    Methods:
+        get(url) -> Optional[RepoRecord]: Returns the record of a repository.
+        is_current(record, repo) -> bool: Tells whether a record can be used without fetching the page.
+        put(repo, body_hash) -> None: Records the details of a fetched repository.
+        stats() -> Dict[str, int]: Returns the skipped, unchanged and changed counters.
+    """
+    def __init__(self, path: str, freshness: float = DEFAULT_FRESHNESS, compare_snippets: bool = True) -> None:
+        """
+        Initializes the RecrawlStore instance and creates the database schema if needed.
+
+        Args:
+            path (str): The SQLite database file, or ':memory:'.
+            freshness (float): The freshness window in seconds, 0 to always check the snippet or page.
+            compare_snippets (bool): Whether to skip repositories whose search snippet is unchanged; False checks
+                the page of every repository outside the freshness window.
+        """
+        self.path = path
+        self.freshness = freshness
+        self.compare_snippets = compare_snippets
+        self.skipped = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS repos (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                snippet_hash TEXT,
+                seen_at REAL NOT NULL,
+                extra TEXT NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[RepoRecord]:
+        row = self._db.execute('SELECT content_hash, snippet_hash, seen_at, extra FROM repos WHERE url = ?',
+                               (url,)).fetchone()
+        if row is None:
+            return None
+        return RepoRecord(row[0], row[1], row[2], json.loads(row[3]))
+
+    def is_current(self, record: RepoRecord, repo: Dict[str, Any]) -> bool:
+        if time.time() - record.seen_at < self.freshness:
+            return True
+        if not self.compare_snippets:
+            return False
+        snippet = snippet_hash(repo)
+        return snippet is not None and snippet == record.snippet_hash
+
+    def put(self, repo: Dict[str, Any], body_hash: str) -> None:
+        self._db.execute('INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?)',
+                         (repo['url'], body_hash, snippet_hash(repo), time.time(), json.dumps(repo['extra'])))
+        self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        return {'skipped': self.skipped, 'unchanged': self.unchanged, 'changed': self.changed}
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({403, 429})
+
+
+class CircuitBreaker:
+    """
+    Pauses every request to a host while that host is throttling us.
+
+    Methods:
+        wait(url) -> None: Sleeps until requests to the URL's host are allowed again.
+        trip(url, seconds) -> None: Blocks requests to the URL's host for the given number of seconds.
+        is_open(url) -> bool: Tells whether requests to the URL's host are currently blocked.
+    """
+    def __init__(self) -> None:
+        self._open_until: Dict[str, float] = {}
+
+    def is_open(self, url: str) -> bool:
+        return self._open_until.get(urlparse(url).netloc, 0.0) > time.monotonic()
+
+    def trip(self, url: str, seconds: float) -> None:
+        host = urlparse(url).netloc
+        until = time.monotonic() + seconds
+        if until > self._open_until.get(host, 0.0):
+            logger.warning('Host %s is throttling, pausing requests for %.1f seconds', host, seconds)
+            self._open_until[host] = until
+
+    async def wait(self, url: str) -> None:
+        host = urlparse(url).netloc
+        while True:
+            remaining = self._open_until.get(host, 0.0) - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before the next attempt.
+
+    Timeouts, connection errors, 408/425/429 and 5xx responses are retried; other HTTP errors such as 404
+    are permanent. The delay grows exponentially with jitter, unless the server says when to come back
+    through Retry-After or GitHub's X-RateLimit-Reset header. Throttling responses also trip the circuit
+    breaker, pausing every worker that talks to the same host.
+
+    Attributes:
+        max_attempts (int): The total number of attempts per request.
+        base_delay (float): The delay before the second attempt, doubled for every further attempt.
+        max_delay (float): The upper bound of any delay.
+        breaker (Optional[CircuitBreaker]): The breaker shared by all requests, None when it is disabled.
+
+    Methods:
+        is_retryable(error) -> bool: Classifies an error as retryable or permanent.
+        next_delay(url, attempt, error) -> float: Computes the delay before the next attempt.
+    """
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, breaker: Optional[CircuitBreaker] = None,
+                 use_breaker: bool = True) -> None:
+        """
+        Initializes the RetryPolicy instance.
+
+        Args:
+            max_attempts (int): The total number of attempts per request.
+            base_delay (float): The delay before the second attempt in seconds.
+            max_delay (float): The maximum delay in seconds.
+            breaker (Optional[CircuitBreaker]): The shared circuit breaker, a new one is created if omitted.
+            use_breaker (bool): Whether throttling pauses the host at all; False leaves `breaker` None.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = (breaker or CircuitBreaker()) if use_breaker else None
+
+    @staticmethod
+    def is_throttled(error: Exception) -> bool:
+        """Tell whether an error is a rate limit: 429, or 403 with Retry-After or an exhausted GitHub quota."""
+        if not isinstance(error, aiohttp.ClientResponseError) or error.status not in THROTTLE_STATUSES:
+            return False
+        headers = error.headers or {}
+        return error.status == 429 or 'Retry-After' in headers or headers.get('X-RateLimit-Remaining') == '0'
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RETRYABLE_STATUSES or self.is_throttled(error)
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    @staticmethod
+    def _server_delay(headers: Mapping[str, str]) -> Optional[float]:
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            if retry_after.strip().isdigit():
+                return float(retry_after)
+            try:
+                return parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+        reset = headers.get('X-RateLimit-Reset')
+        if headers.get('X-RateLimit-Remaining') == '0' and reset and reset.isdigit():
+            return float(reset) - time.time()
+        return None
+
+    def next_delay(self, url: str, attempt: int, error: Exception) -> float:
+        """
+        Computes the delay before the next attempt, and trips the circuit breaker when the host is throttling.
+
+        Args:
+            url (str): The URL of the failed request.
+            attempt (int): The zero-based number of the failed attempt.
+            error (Exception): The error of the failed attempt.
+
+        Returns:
+            float: The number of seconds to wait before the next attempt.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        if isinstance(error, aiohttp.ClientResponseError):
+            server_delay = self._server_delay(error.headers or {})
+            if server_delay is not None:
+                delay = min(self.max_delay, max(0.0, server_delay))
+        if self.breaker and self.is_throttled(error):
+            self.breaker.trip(url, delay)
+        return delay
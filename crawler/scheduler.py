@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from crawler.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from crawler.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 10
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_LATENCY_FLOOR = 0.05
+CONGESTION_STATUSES = frozenset({503})
+
+
+class Scheduler:
+    """
+    Bounds the number of in-flight requests globally and per host, and sizes the repo-detail worker pool.
+
+    Attributes:
+        concurrency (int): The maximum number of in-flight requests across all hosts; also the worker pool size.
+        per_host_limit (int): The maximum number of in-flight requests to a single host.
+        queue_size (int): The maximum number of repo-detail jobs waiting in the work queue.
+
+    Methods:
+        slot(url) -> AsyncIterator[None]: Waits for a free host and global slot for the given URL.
+    """
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host_limit: Optional[int] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """
+        Initializes the Scheduler instance.
+
+        Args:
+            concurrency (int): The global cap on in-flight requests.
+            per_host_limit (Optional[int]): The cap on in-flight requests per host, defaults to the global cap.
+            queue_size (int): The capacity of the work queue, the producer waits when it is full.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+        self.per_host_limit = min(per_host_limit or concurrency, concurrency)
+        self.queue_size = queue_size
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Holds one host slot and one global slot for the duration of a request.
+
+        The host slot is taken first, so requests queued behind a saturated host do not hold global slots.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        async with self._host_semaphore(url):
+            async with self._global:
+                yield
+
+
+class AdaptiveLimit:
+    """
+    An additive-increase/multiplicative-decrease limit on the in-flight requests to one host.
+
+    Every successful request raises the limit by `increase / limit`, so a limit of n grows by `increase` once
+    n requests in a row have succeeded. Throttling responses, 503s, timeouts and a p95 latency above
+    `latency_tolerance` times the best p95 seen so far, and at least `latency_floor` seconds above it, multiply
+    the limit by `decrease`; the floor keeps event-loop jitter on fast hosts from cutting it. Requests that
+    were already in flight when the limit was cut do not cut it again, so one burst of 429s halves it only once.
+    Other errors leave the limit unchanged.
+
+    Attributes:
+        limit (float): The current limit; int(limit) requests may be in flight.
+        min_limit (int): The lowest limit.
+        max_limit (int): The highest limit.
+        in_flight (int): The number of requests holding a slot.
+        baseline (Optional[float]): The best p95 latency seen, in seconds.
+        decreases (int): The number of times the limit was cut.
+
+    Methods:
+        acquire() -> None: Waits until fewer than int(limit) requests are in flight and takes a slot.
+        release() -> None: Frees a slot.
+        on_success(started, latency) -> None: Records a successful request.
+        on_error(started, error) -> None: Records a failed request.
+    """
+    def __init__(self, initial: int, min_limit: int, max_limit: int, increase: float = 1.0, decrease: float = 0.5,
+                 window: int = 50, min_samples: int = 10, latency_tolerance: float = 2.0,
+                 latency_floor: float = DEFAULT_LATENCY_FLOOR) -> None:
+        """
+        Initializes the AdaptiveLimit instance.
+
+        Args:
+            initial (int): The starting limit.
+            min_limit (int): The floor of the limit.
+            max_limit (int): The ceiling of the limit.
+            increase (float): The growth of the limit per `limit` successful requests.
+            decrease (float): The factor the limit is multiplied by on congestion.
+            window (int): The number of recent latencies the p95 is computed over.
+            min_samples (int): The number of latencies needed before the p95 is judged.
+            latency_tolerance (float): How far the p95 may rise above its baseline before the limit is cut.
+            latency_floor (float): The smallest rise of the p95 above its baseline, in seconds, that cuts the limit.
+        """
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.min_samples = min_samples
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.decreases = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float('-inf')
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def p95(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def _cut(self, started: float, reason: str) -> None:
+        if started < self._last_decrease:
+            return
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        self._last_decrease = time.monotonic()
+        self._latencies.clear()
+        self.decreases += 1
+        logger.info('Cut concurrency limit to %d on %s', int(self.limit), reason)
+
+    def on_success(self, started: float, latency: float) -> None:
+        self._latencies.append(latency)
+        p95 = self.p95()
+        if p95 is not None:
+            if self.baseline is None or p95 < self.baseline:
+                self.baseline = p95
+            elif p95 > self.latency_tolerance * self.baseline and p95 - self.baseline > self.latency_floor:
+                self._cut(started, 'rising latency')
+                return
+        self.limit = min(float(self.max_limit), self.limit + self.increase / self.limit)
+        self._wake()
+
+    def on_error(self, started: float, error: BaseException) -> None:
+        if isinstance(error, asyncio.TimeoutError):
+            self._cut(started, 'timeout')
+        elif isinstance(error, aiohttp.ClientResponseError) and (
+                RetryPolicy.is_throttled(error) or error.status in CONGESTION_STATUSES):
+            self._cut(started, f'status {error.status}')
+
+
+class AdaptiveScheduler(Scheduler):
+    """
+    A Scheduler whose per-host limits adapt to each host with AIMD instead of staying fixed.
+
+    Each host starts at `initial_limit` and moves between `min_limit` and `per_host_limit` as described in
+    AdaptiveLimit, judging the requests run inside slot(): their latency, and the errors raised out of the
+    block. The global cap stays fixed. With a metrics collector, the limit of every host is exported as the
+    'concurrency_limit' gauge.
+
+    Attributes:
+        initial_limit (int): The starting limit of every host.
+        min_limit (int): The lowest limit of any host.
+        metrics (Optional[Metrics]): The collector the limits are reported to.
+        limits (Dict[str, AdaptiveLimit]): The limit of every host seen so far.
+    """
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host_limit: Optional[int] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, initial_limit: Optional[int] = None, min_limit: int = 1,
+                 metrics: Optional['Metrics'] = None, **limit_options: float) -> None:
+        """
+        Initializes the AdaptiveScheduler instance.
+
+        Args:
+            concurrency (int): The global cap on in-flight requests.
+            per_host_limit (Optional[int]): The ceiling of every host limit, defaults to the global cap.
+            queue_size (int): The capacity of the work queue.
+            initial_limit (Optional[int]): The starting limit of every host, half the ceiling if omitted.
+            min_limit (int): The floor of every host limit.
+            metrics (Optional[Metrics]): The metrics collector, the limits are not exported if omitted.
+            **limit_options (float): The increase, decrease, window, min_samples, latency_tolerance and
+                latency_floor settings of AdaptiveLimit.
+        """
+        super().__init__(concurrency, per_host_limit, queue_size)
+        self.min_limit = min_limit
+        self.initial_limit = initial_limit or max(min_limit, self.per_host_limit // 2)
+        self.metrics = metrics
+        self.limits: Dict[str, AdaptiveLimit] = {}
+        self._limit_options = limit_options
+
+    def _host_limit(self, host: str) -> AdaptiveLimit:
+        if host not in self.limits:
+            self.limits[host] = AdaptiveLimit(self.initial_limit, self.min_limit, self.per_host_limit,
+                                              **self._limit_options)
+            self._report(host)
+        return self.limits[host]
+
+    def _report(self, host: str) -> None:
+        if self.metrics:
+            self.metrics.set_gauge('concurrency_limit', int(self.limits[host].limit), host=host)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Holds one adaptive host slot and one global slot, and feeds the outcome of the block to the host limit.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        host = urlparse(url).netloc
+        limit = self._host_limit(host)
+        await limit.acquire()
+        try:
+            async with self._global:
+                started = time.monotonic()
+                try:
+                    yield
+                except Exception as error:
+                    limit.on_error(started, error)
+                    raise
+                limit.on_success(started, time.monotonic() - started)
+        finally:
+            limit.release()
+            self._report(host)
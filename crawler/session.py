@@ -0,0 +1,61 @@
+from typing import List, Optional
+
+import aiohttp
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 0
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_DNS_CACHE_TTL = 300
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+
+
+class SessionFactory:
+    """
+    Builds aiohttp sessions with a tuned connection pool, keep-alive, DNS cache and split timeouts.
+
+    Responses are decompressed transparently, including Brotli when the `Brotli` package is installed.
+
+    Attributes:
+        limit (int): The total number of pooled connections, 0 for no limit.
+        limit_per_host (int): The number of pooled connections per host, 0 for no limit.
+        keepalive_timeout (float): The number of seconds an idle connection is kept open.
+        ttl_dns_cache (Optional[int]): The number of seconds resolved addresses are cached, None to cache forever.
+        timeout (aiohttp.ClientTimeout): The connect, read and total timeouts of every request.
+
+    Methods:
+        create(trace_configs) -> aiohttp.ClientSession: Creates a new session with its own connector.
+    """
+    def __init__(self, limit: int = DEFAULT_LIMIT, limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT, ttl_dns_cache: Optional[int] = DEFAULT_DNS_CACHE_TTL,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 total_timeout: Optional[float] = None) -> None:
+        """
+        Initializes the SessionFactory instance.
+
+        Args:
+            limit (int): The total connection pool size.
+            limit_per_host (int): The connection pool size per host.
+            keepalive_timeout (float): The keep-alive period of idle connections in seconds.
+            ttl_dns_cache (Optional[int]): The DNS cache lifetime in seconds.
+            connect_timeout (float): The timeout for acquiring and opening a connection in seconds.
+            read_timeout (float): The timeout between two reads of the response in seconds.
+            total_timeout (Optional[float]): The timeout of the whole request in seconds, None for no limit.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=read_timeout)
+
+    def create(self, trace_configs: Optional[List[aiohttp.TraceConfig]] = None) -> aiohttp.ClientSession:
+        """Create a session; the caller owns it and closes it, and can share it across crawler runs."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=self.timeout, auto_decompress=True,
+                                     trace_configs=trace_configs)
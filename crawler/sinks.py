@@ -0,0 +1,279 @@
+import csv
+import gzip
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import IO, Any, AsyncIterator, Dict, List, NamedTuple, Optional, Type
+
+DEFAULT_BATCH_SIZE = 1000
+CSV_FIELDS = ('url', 'owner', 'language_stats')
+
+
+def _open_text(path: Optional[str], compression: Optional[str]) -> IO[str]:
+    if path is None or path == '-':
+        return sys.stdout
+    if compression == 'gzip' or (compression is None and path.endswith('.gz')):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+class OutputSink(ABC):
+    """
+    Writes crawl results in batches as they stream in.
+
+    Subclasses implement _write_batch; write() buffers repositories and hands them over `batch_size` at a time.
+
+    Attributes:
+        name (str): The format name used by get_sink.
+        batch_size (int): The number of repositories buffered before a batch is written.
+        count (int): The number of repositories written so far.
+
+    Methods:
+        write(repo) -> None: Buffers a repository and writes the batch when it is full.
+        consume(repos) -> int: Writes every repository of a stream and returns the number written.
+        close() -> None: Writes the last batch and closes the output.
+    """
+    name = ''
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.count = 0
+        self._batch: List[Dict[str, Any]] = []
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        ...
+
+    def _close(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        if self._batch:
+            self._write_batch(self._batch)
+            self.count += len(self._batch)
+            self._batch = []
+
+    def write(self, repo: Dict[str, Any]) -> None:
+        self._batch.append(repo)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    async def consume(self, repos: AsyncIterator[Dict[str, Any]]) -> int:
+        async for repo in repos:
+            self.write(repo)
+        self.flush()
+        return self.count
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class NdjsonSink(OutputSink):
+    """Writes one JSON object per line; `.gz` paths or compression='gzip' are gzip-compressed, None writes to stdout."""
+    name = 'ndjson'
+
+    def __init__(self, path: Optional[str] = None, compression: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(batch_size)
+        self._file = _open_text(path, compression)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        self._file.write(''.join(json.dumps(repo) + '\n' for repo in batch))
+        self._file.flush()
+
+    def _close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class CsvSink(OutputSink):
+    """Writes one row per repository with the language stats as a JSON object; compressed like NdjsonSink."""
+    name = 'csv'
+
+    def __init__(self, path: Optional[str] = None, compression: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        super().__init__(batch_size)
+        self._file = _open_text(path, compression)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_FIELDS)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        for repo in batch:
+            extra = repo.get('extra') or {}
+            self._writer.writerow((repo['url'], extra.get('owner', ''), json.dumps(extra.get('language_stats', {}))))
+        self._file.flush()
+
+    def _close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class Columns(NamedTuple):
+    """
+    Crawl results as flat arrays: the languages of repository i are language_ids[offsets[i]:offsets[i + 1]],
+    indices into `languages`, with their shares in the same slice of `percentages`.
+    """
+    urls: Any
+    owners: Any
+    offsets: Any
+    language_ids: Any
+    percentages: Any
+    languages: List[str]
+
+
+class ColumnarSink(OutputSink):
+    """
+    Writes results column by column, with language names interned into one vocabulary and shares as float32.
+
+    With pyarrow installed, the output is a single Parquet file with one row group per batch, the owner
+    and language columns dictionary-encoded. Otherwise the output is a directory holding one NumPy .npz file
+    per batch and the language vocabulary in languages.json. read_columns() loads either layout.
+
+    Attributes:
+        path (str): The Parquet file, or the output directory of the NumPy layout.
+        engine (str): 'arrow' or 'numpy'.
+        compression (Optional[str]): The Parquet codec, e.g. 'zstd' or 'snappy'; any value compresses the .npz files.
+        languages (Dict[str, int]): The language vocabulary, mapping each name to its id.
+    """
+    name = 'columnar'
+
+    def __init__(self, path: str, engine: str = 'auto', compression: Optional[str] = 'zstd',
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Initializes the ColumnarSink instance.
+
+        Args:
+            path (str): The output file or directory.
+            engine (str): 'arrow', 'numpy', or 'auto' to use pyarrow when it is installed.
+            compression (Optional[str]): The compression codec, None to write uncompressed.
+            batch_size (int): The number of repositories per row group or .npz file.
+        """
+        super().__init__(batch_size)
+        if engine == 'auto':
+            try:
+                import pyarrow  # noqa: F401
+                engine = 'arrow'
+            except ImportError:
+                engine = 'numpy'
+        if engine not in ('arrow', 'numpy'):
+            raise ValueError(f'Unknown columnar engine: {engine}')
+        self.path = path
+        self.engine = engine
+        self.compression = compression
+        self.languages: Dict[str, int] = {}
+        self._parts = 0
+        self._writer = None
+        if engine == 'numpy':
+            os.makedirs(path, exist_ok=True)
+
+    def _columns(self, batch: List[Dict[str, Any]]):
+        import numpy as np
+
+        offsets = np.zeros(len(batch) + 1, dtype=np.int64)
+        language_ids: List[int] = []
+        percentages: List[float] = []
+        for i, repo in enumerate(batch):
+            stats = (repo.get('extra') or {}).get('language_stats') or {}
+            for language, percentage in stats.items():
+                language_ids.append(self.languages.setdefault(language, len(self.languages)))
+                percentages.append(percentage)
+            offsets[i + 1] = len(language_ids)
+        return (
+            [repo['url'] for repo in batch],
+            [(repo.get('extra') or {}).get('owner', '') for repo in batch],
+            offsets,
+            np.asarray(language_ids, dtype=np.int32),
+            np.asarray(percentages, dtype=np.float32),
+        )
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        urls, owners, offsets, language_ids, percentages = self._columns(batch)
+        if self.engine == 'numpy':
+            import numpy as np
+
+            save = np.savez_compressed if self.compression else np.savez
+            save(os.path.join(self.path, f'part-{self._parts:05d}.npz'), urls=np.asarray(urls, dtype=str),
+                 owners=np.asarray(owners, dtype=str), offsets=offsets, language_ids=language_ids,
+                 percentages=percentages)
+            self._parts += 1
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        vocabulary = pa.array(list(self.languages), type=pa.string())
+        table = pa.table({
+            'url': pa.array(urls, type=pa.string()),
+            'owner': pa.array(owners, type=pa.string()).dictionary_encode(),
+            'languages': pa.ListArray.from_arrays(
+                pa.array(offsets.astype('int32')), pa.DictionaryArray.from_arrays(language_ids, vocabulary)
+            ),
+            'percentages': pa.ListArray.from_arrays(pa.array(offsets.astype('int32')), pa.array(percentages)),
+        })
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression or 'none')
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def _close(self) -> None:
+        if self.engine == 'numpy':
+            with open(os.path.join(self.path, 'languages.json'), 'w', encoding='utf-8') as file:
+                json.dump(list(self.languages), file)
+        else:
+            if self._writer is None:
+                self._write_batch([])
+            self._writer.close()
+
+
+def read_columns(path: str) -> Columns:
+    """Load the output of a ColumnarSink, either a Parquet file or a NumPy directory, as flat arrays."""
+    import numpy as np
+
+    if os.path.isdir(path):
+        with open(os.path.join(path, 'languages.json'), encoding='utf-8') as file:
+            languages = json.load(file)
+        parts = [np.load(os.path.join(path, name)) for name in sorted(os.listdir(path)) if name.endswith('.npz')]
+        offsets = [np.zeros(1, dtype=np.int64)]
+        for part in parts:
+            offsets.append(part['offsets'][1:] + offsets[-1][-1])
+        concat = (lambda key, dtype: np.concatenate([part[key] for part in parts]) if parts
+                  else np.zeros(0, dtype=dtype))
+        return Columns(concat('urls', str), concat('owners', str), np.concatenate(offsets),
+                       concat('language_ids', np.int32), concat('percentages', np.float32), languages)
+
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    names = pc.list_flatten(table.column('languages')).cast('string')
+    encoded = pc.dictionary_encode(names).combine_chunks()
+    offsets = np.zeros(table.num_rows + 1, dtype=np.int64)
+    np.cumsum(pc.list_value_length(table.column('languages')).to_numpy(zero_copy_only=False), out=offsets[1:])
+    return Columns(
+        np.asarray(table.column('url').to_pylist(), dtype=str),
+        np.asarray(table.column('owner').cast('string').to_pylist(), dtype=str),
+        offsets,
+        encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32),
+        pc.list_flatten(table.column('percentages')).to_numpy().astype(np.float32),
+        encoded.dictionary.to_pylist(),
+    )
+
+
+SINKS: Dict[str, Type[OutputSink]] = {NdjsonSink.name: NdjsonSink, CsvSink.name: CsvSink,
+                                       ColumnarSink.name: ColumnarSink}
+
+
+def get_sink(name: str, path: Optional[str] = None, **kwargs: Any) -> OutputSink:
+    """Return a new output sink by format name ('ndjson', 'csv' or 'columnar')."""
+    try:
+        sink = SINKS[name]
+    except KeyError:
+        raise ValueError(f'Unknown output format: {name}') from None
+    return sink(path, **kwargs)
@@ -1,12 +1,64 @@
+import os
 import random
 import logging
-from fake_useragent import UserAgent
+from typing import Dict, List, Optional
 
-ua = UserAgent(browsers=['Edge', 'Chrome'])
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENTS_PATH = os.path.join(os.path.dirname(__file__), 'user_agents.txt')
+USER_AGENT_BROWSERS = ['Edge', 'Chrome']
+USER_AGENT_DRAWS = 3000
+USER_AGENT_PATIENCE = 300
+
+_user_agents: Optional[List[str]] = None
+
+
+def build_user_agent_pool(path: str = USER_AGENTS_PATH) -> List[str]:
+    """
+    Write the Edge and Chrome user agents known to fake_useragent to `path`, one per line, and return them.
+
+    fake_useragent only hands out random agents, so agents are drawn until USER_AGENT_PATIENCE draws in a row
+    bring nothing new, or USER_AGENT_DRAWS draws were made.
+    """
+    from fake_useragent import UserAgent
+
+    ua = UserAgent(browsers=USER_AGENT_BROWSERS)
+    seen: Dict[str, None] = {}
+    misses = 0
+    for _ in range(USER_AGENT_DRAWS):
+        user_agent = ua.random
+        if user_agent in seen:
+            misses += 1
+            if misses >= USER_AGENT_PATIENCE:
+                break
+        else:
+            seen[user_agent] = None
+            misses = 0
+    user_agents = list(seen)
+    try:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(user_agents) + '\n')
+    except OSError:
+        logger.warning('Could not write the user agent pool to %s', path)
+    return user_agents
+
+
+def load_user_agents(path: str = USER_AGENTS_PATH) -> List[str]:
+    """Load the user agent pool from its cache file, building the file with fake_useragent if it is missing."""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            user_agents = [line.strip() for line in file if line.strip()]
+    except FileNotFoundError:
+        user_agents = []
+    return user_agents or build_user_agent_pool(path)
+
+
+def get_random_user_agent() -> str:
+    global _user_agents
+    if _user_agents is None:
+        _user_agents = load_user_agents()
+    return random.choice(_user_agents)
+
 
 def get_random_proxy(proxy_file):
     """Load proxies from proxylist.txt and return a random one"""
@@ -22,7 +74,7 @@ def get_random_proxy(proxy_file):
 def get_random_headers():
     """Generate random headers for each request."""
     return {
-        'User-Agent': ua.random,
+        'User-Agent': get_random_user_agent(),
         'Accept-Language': random.choice(['en-US,en;q=0.9', 'en-GB,en;q=0.8']),
         'Referer': 'https://github.com/',
         'Accept-Encoding': 'gzip, deflate, br',
@@ -0,0 +1,342 @@
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+DEFAULT_VISIBILITY_TIMEOUT = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_REDIS_PREFIX = 'crawler'
+REDIS_SCHEMES = ('redis://', 'rediss://', 'unix://')
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+class Job(NamedTuple):
+    id: int
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class WorkQueue(ABC):
+    """
+    Base class for the work queues shared by the processes of a distributed crawl.
+
+    Jobs are leased rather than popped: a leased job becomes visible again when its lease expires, so the jobs
+    of a crashed worker are redone by another one. A job that is leased `max_attempts` times without being
+    completed is marked as failed. Every process opens its own queue on the same storage.
+
+    Attributes:
+        visibility_timeout (float): The number of seconds a lease lasts.
+        max_attempts (int): The number of leases a job gets before it is marked as failed.
+
+    Methods:
+        put(key, payload) -> bool: Adds a job unless a job with the same key exists.
+        seal() -> None: Records that no more jobs will be added.
+        lease(worker, count) -> List[Job]: Leases up to `count` visible jobs.
+        complete(job, worker, result) -> bool: Stores the result of a job leased by the worker.
+        release(job, worker) -> None: Gives a failed job back before its lease expires.
+        counts() -> Dict[str, int]: Returns the number of jobs in every state.
+        is_finished() -> bool: Tells whether the queue is sealed and every job is done or failed.
+        results() -> Iterator[Dict]: Yields the results of the completed jobs in insertion order.
+    """
+    def __init__(self, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> None:
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, key: str, payload: Dict[str, Any]) -> bool:
+        """Add a job; returns False if a job with the same key was already added."""
+
+    @abstractmethod
+    def seal(self) -> None:
+        """Record that no more jobs will be added."""
+
+    @abstractmethod
+    def is_sealed(self) -> bool:
+        """Tell whether the queue was sealed."""
+
+    @abstractmethod
+    def lease(self, worker: str, count: int = 1) -> List[Job]:
+        """
+        Leases up to `count` pending jobs or jobs whose lease has expired.
+
+        Args:
+            worker (str): The identifier of the leasing worker.
+            count (int): The maximum number of jobs to lease.
+
+        Returns:
+            List[Job]: The leased jobs, empty if none is visible.
+        """
+
+    @abstractmethod
+    def complete(self, job: Job, worker: str, result: Dict[str, Any]) -> bool:
+        """Store a job's result; returns False if the worker's lease expired and the job went to another worker."""
+
+    @abstractmethod
+    def release(self, job: Job, worker: str) -> None:
+        """Give a leased job back, or mark it as failed once it has used up its attempts."""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Return the number of pending, leased, done and failed jobs."""
+
+    @abstractmethod
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Yield the results of the completed jobs in insertion order."""
+
+    def is_finished(self) -> bool:
+        if not self.is_sealed():
+            return False
+        counts = self.counts()
+        return counts[PENDING] == counts[LEASED] == 0
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'WorkQueue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    A work queue in a SQLite file, shared by the worker processes of one machine.
+
+    The database runs in WAL mode, which needs memory shared between its processes, so the file must not live
+    on a network filesystem; use a RedisWorkQueue to run workers on several machines.
+
+    Attributes:
+        path (str): The SQLite database file.
+    """
+    def __init__(self, path: str, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> None:
+        """
+        Initializes the SqliteWorkQueue instance and creates the database schema if needed.
+
+        Args:
+            path (str): The SQLite database file.
+            visibility_timeout (float): The lease duration in seconds.
+            max_attempts (int): The maximum number of leases per job.
+        """
+        super().__init__(visibility_timeout, max_attempts)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL,
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_until);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+        """)
+
+    def put(self, key: str, payload: Dict[str, Any]) -> bool:
+        cursor = self._db.execute('INSERT OR IGNORE INTO jobs (key, payload, state) VALUES (?, ?, ?)',
+                                  (key, json.dumps(payload), PENDING))
+        return cursor.rowcount == 1
+
+    def seal(self) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('sealed', '1')")
+
+    def is_sealed(self) -> bool:
+        return self._db.execute("SELECT 1 FROM meta WHERE name = 'sealed'").fetchone() is not None
+
+    def lease(self, worker: str, count: int = 1) -> List[Job]:
+        now = time.time()
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            self._db.execute('UPDATE jobs SET state = ?, worker = NULL WHERE state = ? AND lease_until < ? '
+                             'AND attempts >= ?', (FAILED, LEASED, now, self.max_attempts))
+            rows = self._db.execute(
+                'SELECT id, payload, attempts FROM jobs WHERE state = ? OR (state = ? AND lease_until < ?) '
+                'ORDER BY id LIMIT ?', (PENDING, LEASED, now, count)
+            ).fetchall()
+            self._db.executemany(
+                'UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?',
+                [(LEASED, worker, now + self.visibility_timeout, job_id) for job_id, _, _ in rows]
+            )
+            self._db.execute('COMMIT')
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        return [Job(job_id, json.loads(payload), attempts + 1) for job_id, payload, attempts in rows]
+
+    def complete(self, job: Job, worker: str, result: Dict[str, Any]) -> bool:
+        cursor = self._db.execute('UPDATE jobs SET state = ?, result = ?, lease_until = NULL '
+                                  'WHERE id = ? AND state = ? AND worker = ?',
+                                  (DONE, json.dumps(result), job.id, LEASED, worker))
+        return cursor.rowcount == 1
+
+    def release(self, job: Job, worker: str) -> None:
+        state = FAILED if job.attempts >= self.max_attempts else PENDING
+        self._db.execute('UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL '
+                         'WHERE id = ? AND state = ? AND worker = ?', (state, job.id, LEASED, worker))
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0)
+        counts.update(self._db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        return counts
+
+    def is_finished(self) -> bool:
+        if not self.is_sealed():
+            return False
+        unfinished = self._db.execute('SELECT 1 FROM jobs WHERE state IN (?, ?) LIMIT 1', (PENDING, LEASED))
+        return unfinished.fetchone() is None
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        for (result,) in self._db.execute('SELECT result FROM jobs WHERE state = ? ORDER BY id', (DONE,)):
+            yield json.loads(result)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    A work queue on a Redis-compatible server, shared by worker processes on any number of machines.
+
+    Every job lives under `prefix`: its payload, attempts and result in hashes, and, while it is pending or
+    leased, in a sorted set scored by the time it becomes visible. Leases and completions run in WATCH/MULTI
+    transactions, so no server-side scripting is needed and a stand-in such as fakeredis can replace the server.
+    Needs the optional redis package unless a client is passed.
+
+    Attributes:
+        prefix (str): The prefix of every key of the queue, so several queues can share a server.
+    """
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = DEFAULT_REDIS_PREFIX,
+                 visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 client: Any = None) -> None:
+        """
+        Initializes the RedisWorkQueue instance.
+
+        Args:
+            url (str): The server URL, ignored when a client is given.
+            prefix (str): The prefix of the queue's keys.
+            visibility_timeout (float): The lease duration in seconds.
+            max_attempts (int): The maximum number of leases per job.
+            client (Any): A redis.Redis-compatible client, e.g. a fakeredis.FakeRedis; one is created from
+                `url` if omitted and closed with the queue.
+        """
+        super().__init__(visibility_timeout, max_attempts)
+        self.prefix = prefix
+        self._owns_client = client is None
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._redis = client
+
+    def _key(self, name: str) -> str:
+        return f'{self.prefix}:{name}'
+
+    def put(self, key: str, payload: Dict[str, Any]) -> bool:
+        def add(pipe) -> bool:
+            if pipe.hexists(self._key('keys'), key):
+                return False
+            job_id = pipe.incr(self._key('next_id'))
+            pipe.multi()
+            pipe.hset(self._key('keys'), key, job_id)
+            pipe.hset(self._key('payloads'), job_id, json.dumps(payload))
+            pipe.hset(self._key('attempts'), job_id, 0)
+            # Pending jobs are scored by id, which sorts them in insertion order before every lease expiry.
+            pipe.zadd(self._key('visible'), {job_id: job_id})
+            return True
+
+        return self._redis.transaction(add, self._key('keys'), value_from_callable=True)
+
+    def seal(self) -> None:
+        self._redis.set(self._key('sealed'), 1)
+
+    def is_sealed(self) -> bool:
+        return bool(self._redis.exists(self._key('sealed')))
+
+    def lease(self, worker: str, count: int = 1) -> List[Job]:
+        now = time.time()
+
+        def claim(pipe) -> List[Job]:
+            ids = pipe.zrangebyscore(self._key('visible'), '-inf', now, start=0, num=count)
+            if not ids:
+                return []
+            attempts = pipe.hmget(self._key('attempts'), ids)
+            payloads = pipe.hmget(self._key('payloads'), ids)
+            pipe.multi()
+            jobs = []
+            for job_id, tries, payload in zip(ids, attempts, payloads):
+                if int(tries) >= self.max_attempts:
+                    pipe.zrem(self._key('visible'), job_id)
+                    pipe.hdel(self._key('leases'), job_id)
+                    pipe.sadd(self._key('failed'), job_id)
+                    continue
+                pipe.zadd(self._key('visible'), {job_id: now + self.visibility_timeout})
+                pipe.hset(self._key('leases'), job_id, worker)
+                pipe.hincrby(self._key('attempts'), job_id, 1)
+                jobs.append(Job(int(job_id), json.loads(payload), int(tries) + 1))
+            return jobs
+
+        return self._redis.transaction(claim, self._key('visible'), value_from_callable=True)
+
+    def complete(self, job: Job, worker: str, result: Dict[str, Any]) -> bool:
+        def finish(pipe) -> bool:
+            if _text(pipe.hget(self._key('leases'), job.id)) != worker:
+                return False
+            pipe.multi()
+            pipe.zrem(self._key('visible'), job.id)
+            pipe.hdel(self._key('leases'), job.id)
+            pipe.hset(self._key('results'), job.id, json.dumps(result))
+            pipe.zadd(self._key('done'), {job.id: job.id})
+            return True
+
+        return self._redis.transaction(finish, self._key('leases'), value_from_callable=True)
+
+    def release(self, job: Job, worker: str) -> None:
+        def give_back(pipe) -> None:
+            if _text(pipe.hget(self._key('leases'), job.id)) != worker:
+                return
+            pipe.multi()
+            pipe.hdel(self._key('leases'), job.id)
+            if job.attempts >= self.max_attempts:
+                pipe.zrem(self._key('visible'), job.id)
+                pipe.sadd(self._key('failed'), job.id)
+            else:
+                pipe.zadd(self._key('visible'), {job.id: job.id})
+
+        self._redis.transaction(give_back, self._key('leases'))
+
+    def counts(self) -> Dict[str, int]:
+        pipe = self._redis.pipeline()
+        pipe.zcard(self._key('visible'))
+        pipe.hlen(self._key('leases'))
+        pipe.zcard(self._key('done'))
+        pipe.scard(self._key('failed'))
+        visible, leased, done, failed = pipe.execute()
+        return {PENDING: visible - leased, LEASED: leased, DONE: done, FAILED: failed}
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        ids = self._redis.zrange(self._key('done'), 0, -1)
+        for result in self._redis.hmget(self._key('results'), ids) if ids else []:
+            yield json.loads(result)
+
+    def close(self) -> None:
+        if self._owns_client:
+            self._redis.close()
+
+
+def open_queue(location: str, **kwargs: Any) -> WorkQueue:
+    """Open a RedisWorkQueue for a redis://, rediss:// or unix:// URL, and a SqliteWorkQueue for a file path."""
+    if location.startswith(REDIS_SCHEMES):
+        return RedisWorkQueue(location, **kwargs)
+    return SqliteWorkQueue(location, **kwargs)
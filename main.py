@@ -1,22 +1,43 @@
+import argparse
 import asyncio
+import csv
 import json
-from typing import List, Optional, Literal
+import os
+import sys
+from typing import Any, AsyncIterator, Dict, List, Optional, TextIO
 
-from pydantic import BaseModel
-
-from crawler.crawler import GitHubCrawler
+from crawler.crawler import BASE_URL, GitHubCrawler
+from crawler.logs import configure_logging
 from crawler.utils import get_random_proxy
 
 PROXY_PATH = 'proxylist.txt'
+OUTPUT_FORMATS = ('json', 'ndjson', 'csv', 'columnar')
+
+
+def __getattr__(name: str) -> Any:
+    # SearchFilterModel is still importable from main, but pydantic is loaded only when it is asked for.
+    if name == 'SearchFilterModel':
+        from crawler.models import SearchFilterModel
+
+        return SearchFilterModel
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
-class SearchFilterModel(BaseModel):
-    keywords: List[str]
-    proxy: Optional[str] = None
-    search_type: Literal['repositories', 'issues', 'wikis']
+async def write_ndjson(repos: AsyncIterator[Dict[str, Any]], out: Optional[TextIO] = None) -> int:
+    """Write each repository as one JSON line as soon as it arrives and return the number written."""
+    out = out or sys.stdout
+    count = 0
+    async for repo in repos:
+        out.write(json.dumps(repo) + '\n')
+        out.flush()
+        count += 1
+    return count
 
 
-async def main():
+async def main(ndjson: bool = False):
+    # pydantic is only needed once input is validated, so plain imports of main stay fast.
+    from crawler.models import SearchFilterModel
+
     keywords = input("Enter keywords (comma-separated): ").strip().split(",")
     search_type = input("Enter search type (e.g., Repositories, Code, Issues): ").lower().strip()
     input_data = {
@@ -31,10 +52,153 @@ async def main():
         proxy=validated_data.proxy,
         search_type=validated_data.search_type
     )
+    if ndjson:
+        return await write_ndjson(crawler.stream())
+
     results = await crawler.run()
     print(json.dumps(results, indent=2))
     return results
 
 
+def load_queries(path: str) -> List[Any]:
+    """
+    Loads search queries from a JSON file holding a list of objects, or from a CSV file with a header row.
+
+    CSV rows have `keywords` (comma-separated), `search_type` and an optional `proxy` column.
+
+    Args:
+        path (str): The queries file, read as CSV if its name ends with .csv.
+
+    Returns:
+        List[SearchFilterModel]: The validated queries.
+    """
+    from crawler.models import SearchFilterModel
+
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        if path.endswith('.csv'):
+            entries = [
+                {
+                    'keywords': [keyword.strip() for keyword in row['keywords'].split(',') if keyword.strip()],
+                    'search_type': row['search_type'].strip().lower(),
+                    'proxy': (row.get('proxy') or '').strip() or None,
+                }
+                for row in csv.DictReader(file)
+            ]
+        else:
+            entries = json.load(file)
+    return [SearchFilterModel(**entry) for entry in entries]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Crawl GitHub search results and the language stats of every repository.')
+    parser.add_argument('keywords', nargs='*', help='The search keywords of a single query.')
+    parser.add_argument('--search-type', default='repositories', choices=['repositories', 'issues', 'wikis'])
+    parser.add_argument('--queries-file', help='A JSON or CSV file of queries to crawl concurrently.')
+    parser.add_argument('--concurrency', type=int, default=10, help='The in-flight requests across all queries.')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Adapt the in-flight requests per host to throttling and latency, up to --concurrency.')
+    parser.add_argument('--max-concurrent-queries', type=int, default=8)
+    parser.add_argument('--proxy-file', help='Rotate over the proxies of this file, one per line.')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json')
+    parser.add_argument('--output', default='-', help='The output file, or directory for columnar without pyarrow.')
+    parser.add_argument('--cache-dir', help='Keep a response cache in this directory.')
+    parser.add_argument('--details', choices=['html', 'graphql'], default='html',
+                        help='Scrape every repository page, or ask the GraphQL API for many repositories per request.')
+    parser.add_argument('--api-url', help='The GraphQL endpoint of --details graphql, GitHub\'s API by default.')
+    parser.add_argument('--max-pages', type=int, help='The number of search pages fetched per query.')
+    parser.add_argument('--deadline', type=float, help='Stop the whole run after this many seconds.')
+    parser.add_argument('--max-repos', type=int, help='Stop the whole run after this many repositories.')
+    parser.add_argument('--max-bytes', type=int, help='Stop the whole run after downloading this many bytes.')
+    parser.add_argument('--base-url', default=BASE_URL, help='The site to crawl, e.g. a local stand-in server.')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+    if not args.keywords and not args.queries_file:
+        parser.error('give keywords or --queries-file')
+    if args.format == 'columnar' and args.output == '-':
+        parser.error('--format columnar needs --output')
+    return args
+
+
+async def _results(args: argparse.Namespace, crawler_kwargs: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    from crawler.batch import BatchCrawler
+    from crawler.models import SearchFilterModel
+    from crawler.scheduler import AdaptiveScheduler, Scheduler
+
+    scheduler = AdaptiveScheduler(args.concurrency) if args.adaptive else Scheduler(args.concurrency)
+    if args.queries_file:
+        batch = BatchCrawler(load_queries(args.queries_file), scheduler=scheduler,
+                             max_concurrent_queries=args.max_concurrent_queries, **crawler_kwargs)
+        async for index, repo in batch.stream():
+            yield {**repo, 'query': index}
+        return
+
+    query = SearchFilterModel(keywords=args.keywords, search_type=args.search_type)
+    crawler = GitHubCrawler(query.keywords, query.proxy, query.search_type, scheduler=scheduler, **crawler_kwargs)
+    async for repo in crawler.stream():
+        yield repo
+
+
+async def run_cli(args: argparse.Namespace) -> int:
+    """
+    Runs the crawl described by the command line arguments and writes its results.
+
+    Args:
+        args (argparse.Namespace): The arguments returned by parse_args().
+
+    Returns:
+        int: The number of repositories written.
+    """
+    from crawler.sinks import get_sink
+
+    crawler_kwargs: Dict[str, Any] = {'max_pages': args.max_pages, 'base_url': args.base_url}
+    if args.deadline is not None or args.max_repos is not None or args.max_bytes is not None:
+        from crawler.budget import CrawlBudget
+
+        crawler_kwargs['budget'] = CrawlBudget(deadline=args.deadline, max_repos=args.max_repos,
+                                               max_bytes=args.max_bytes)
+    if args.details == 'graphql':
+        from crawler.details import API_URL, GraphQLDetailBackend
+
+        crawler_kwargs['detail_backend'] = GraphQLDetailBackend(args.api_url or API_URL,
+                                                                token=os.environ.get('GITHUB_TOKEN'))
+    if args.proxy_file:
+        from crawler.proxy_pool import ProxyPool
+
+        crawler_kwargs['proxy_pool'] = ProxyPool.from_file(args.proxy_file)
+    if args.cache_dir:
+        from crawler.cache import ResponseCache
+
+        os.makedirs(args.cache_dir, exist_ok=True)
+        crawler_kwargs['cache'] = ResponseCache(os.path.join(args.cache_dir, 'responses.sqlite'))
+
+    try:
+        repos = _results(args, crawler_kwargs)
+        if args.format == 'json':
+            results = [repo async for repo in repos]
+            output = json.dumps(results, indent=2) + '\n'
+            if args.output == '-':
+                sys.stdout.write(output)
+            else:
+                with open(args.output, 'w', encoding='utf-8') as file:
+                    file.write(output)
+            return len(results)
+
+        with get_sink(args.format, None if args.output == '-' else args.output) as sink:
+            return await sink.consume(repos)
+    finally:
+        if 'cache' in crawler_kwargs:
+            crawler_kwargs['cache'].close()
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    configure_logging(structured=args.log_format == 'json')
+    return asyncio.run(run_cli(args))
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    if len(sys.argv) > 1:
+        cli()
+    else:
+        configure_logging()
+        asyncio.run(main())
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from crawler.analytics import LanguageMatrix
+from crawler.sinks import ColumnarSink, read_columns
+
+REPOS = [
+    {'url': 'https://github.com/a/x', 'extra': {'owner': 'a', 'language_stats': {'Python': 80.0, 'C': 20.0}}},
+    {'url': 'https://github.com/b/y', 'extra': {'owner': 'b', 'language_stats': {'Go': 100.0}}},
+    {'url': 'https://github.com/a/z', 'extra': {'owner': 'a', 'language_stats': {'C': 60.0, 'Python': 40.0}}},
+    {'url': 'https://github.com/c/w', 'extra': {'owner': 'c', 'language_stats': {}}},
+]
+FAILED = {'url': 'https://github.com/d/v'}
+
+
+def test_mean_share_and_top_languages():
+    matrix = LanguageMatrix.from_repos(REPOS)
+    assert matrix.n_rows == 4
+    assert matrix.mean_share() == pytest.approx({'Python': 30.0, 'C': 20.0, 'Go': 25.0})
+    assert matrix.top_languages(2) == [('Python', 30.0), ('Go', 25.0)]
+    assert matrix.top_languages(1, by='repos') == [('Python', 2.0)]
+
+
+def test_repos_without_details_are_skipped():
+    matrix = LanguageMatrix.from_repos([*REPOS, FAILED])
+    assert matrix.n_rows == 4 and matrix.skipped == 1
+    assert matrix.mean_share() == pytest.approx({'Python': 30.0, 'C': 20.0, 'Go': 25.0})
+    assert matrix.by_owner().owners == ['a', 'b', 'c']
+
+
+def test_by_owner():
+    owners = LanguageMatrix.from_repos(REPOS).by_owner()
+    assert owners.owners == ['a', 'b', 'c']
+    assert owners.row(0) == pytest.approx({'Python': 60.0, 'C': 40.0})
+    assert owners.row(1) == {'Go': 100.0}
+    assert owners.row(2) == {}
+
+
+def test_cooccurrence():
+    matrix = LanguageMatrix.from_repos(REPOS)
+    counts = matrix.cooccurrence()
+    python, c, go = (matrix.languages.index(name) for name in ('Python', 'C', 'Go'))
+    assert counts[python, c] == counts[c, python] == 2
+    assert counts[python, go] == 0
+    assert counts[go, go] == 1
+    assert np.array_equal(counts, counts.T)
+
+
+@pytest.mark.asyncio
+async def test_from_stream_matches_from_columns(tmp_path):
+    async def stream():
+        for repo in REPOS:
+            yield repo
+
+    path = str(tmp_path / 'out')
+    with ColumnarSink(path, engine='numpy') as sink:
+        for repo in [REPOS[0], FAILED, *REPOS[1:]]:
+            sink.write(repo)
+
+    streamed = await LanguageMatrix.from_stream(stream())
+    loaded = LanguageMatrix.from_columns(read_columns(path))
+    assert loaded.n_rows == streamed.n_rows == 4 and loaded.skipped == 1
+    assert loaded.mean_share() == pytest.approx(streamed.mean_share())
+    assert loaded.by_owner().row(0) == pytest.approx(streamed.by_owner().row(0))
+    assert np.array_equal(loaded.cooccurrence(), streamed.cooccurrence())
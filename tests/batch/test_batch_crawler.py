@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from crawler.batch import BatchCrawler
+from crawler.crawler import GitHubCrawler
+from crawler.models import SearchFilterModel
+from crawler.retry import RetryPolicy
+
+SEARCH_PAGES = {
+    'python': ([{'url': 'https://github.com/user/shared'}, {'url': 'https://github.com/user/py'}], None),
+    'ai': ([{'url': 'https://github.com/user/shared'}, {'url': 'https://github.com/user/ai'}], None),
+}
+
+
+def _parse_search_page(self, html):
+    return SEARCH_PAGES[html]
+
+
+async def _get_repo_details(repo):
+    return {**repo, 'extra': {'owner': 'user', 'language_stats': {'Python': 100.0}}}
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, side_effect=lambda url, params: params['q'])
+@patch.object(GitHubCrawler, '_parse_search_page', _parse_search_page)
+@patch.object(GitHubCrawler, '_get_repo_details', new_callable=AsyncMock, side_effect=_get_repo_details)
+async def test_run_fetches_shared_repos_once(mock_get_repo_details, mock_fetch):
+    queries = [
+        SearchFilterModel(keywords=['python'], search_type='repositories'),
+        SearchFilterModel(keywords=['ai'], search_type='repositories'),
+    ]
+    batch = BatchCrawler(queries)
+    results = await batch.run()
+
+    assert sorted(repo['url'] for repo in results[0]) == ['https://github.com/user/py', 'https://github.com/user/shared']
+    assert sorted(repo['url'] for repo in results[1]) == ['https://github.com/user/ai', 'https://github.com/user/shared']
+    assert all('extra' in repo for query_repos in results for repo in query_repos)
+    assert mock_get_repo_details.call_count == 3
+    assert batch.details.fetched == 3
+    assert batch.details.deduplicated == 1
+
+
+def test_queries_share_one_retry_policy():
+    queries = [SearchFilterModel(keywords=[keyword], search_type='repositories') for keyword in ('python', 'ai')]
+    batch = BatchCrawler(queries)
+    first, second = (batch._make_crawler(query, None) for query in queries)
+    assert first.retry_policy is second.retry_policy is batch.retry_policy
+    assert first.retry_policy.breaker is second.retry_policy.breaker
+
+    policy = RetryPolicy(max_attempts=7)
+    assert BatchCrawler(queries, retry_policy=policy)._make_crawler(queries[0], None).retry_policy is policy
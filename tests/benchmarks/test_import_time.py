@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.bench_import import MODULES, measure_import
+
+# Well above the few hundred milliseconds these imports take, so only a real regression such as an eager
+# heavy import trips it.
+MAX_IMPORT_MS = 1500
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_defers_heavy_modules(module):
+    result = measure_import(module, repeat=1)
+    assert result['deferred_loaded'] == []
+    assert 0 < result['median_ms'] < MAX_IMPORT_MS
+
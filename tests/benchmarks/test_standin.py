@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.bench_crawl import run_benchmark
+from benchmarks.standin import StandInConfig, StandInServer, repo_languages
+from crawler.crawler import GitHubCrawler
+from crawler.retry import RetryPolicy
+
+
+@pytest.mark.asyncio
+async def test_crawl_standin_end_to_end():
+    config = StandInConfig(pages=3, repos_per_page=4)
+    async with StandInServer(config) as server:
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url)
+        repos = await crawler.run()
+
+    assert len(repos) == 12
+    assert server.requests == {'search': 3, 'repo': 12}
+    repo = next(repo for repo in repos if repo['url'].endswith('/owner2/repo2-1'))
+    assert repo['extra'] == {
+        'owner': 'owner2',
+        'language_stats': dict(repo_languages('/owner2/repo2-1', config)),
+    }
+    assert repo['description'].startswith('Generated repository')
+    assert isinstance(repo['stars'], int)
+
+
+@pytest.mark.asyncio
+async def test_standin_injects_faults():
+    config = StandInConfig(pages=2, repos_per_page=5, error_rate=0.3, throttle_rate=0.3)
+    async with StandInServer(config) as server:
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                retry_policy=RetryPolicy(max_attempts=10, base_delay=0.001))
+        repos = await crawler.run()
+
+    assert server.statuses[429] > 0
+    assert server.statuses[500] > 0
+    assert all('extra' in repo for repo in repos)
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_reports_figures():
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=3)) as server:
+        results = await run_benchmark(server.base_url, concurrency=2)
+
+    assert results['search_pages'] == 2
+    assert results['repos'] == results['repos_with_details'] == 6
+    assert results['repos_per_second'] > 0
+    assert results['fetch_latency_p50_ms'] <= results['fetch_latency_p99_ms']
+    assert results['parse_cpu_seconds'] > 0
+    assert results['peak_rss_kb'] > 0
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_streams_details():
+    async with StandInServer(StandInConfig(pages=1, repos_per_page=3)) as server:
+        results = await run_benchmark(server.base_url, concurrency=2, stream_details=True)
+
+    assert results['search_pages'] == 1
+    assert results['repos'] == results['repos_with_details'] == 3
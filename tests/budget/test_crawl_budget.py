@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.budget import CrawlBudget
+from crawler.checkpoint import Checkpoint
+from crawler.crawler import GitHubCrawler
+from crawler.scheduler import Scheduler
+
+
+def test_caps():
+    budget = CrawlBudget(max_repos=2, max_bytes=100)
+    budget.start()
+    assert budget.take_repo() and budget.take_repo()
+    assert not budget.take_repo()
+    assert budget.repos == 2
+    budget.bytes = 100
+    assert budget.exhausted()
+    assert budget.reason == 'max_repos'
+
+
+def test_deadline():
+    budget = CrawlBudget(deadline=0.01)
+    assert budget.remaining() is None
+    budget.start()
+    time.sleep(0.02)
+    assert budget.remaining() == 0
+    assert budget.exhausted() and budget.reason == 'deadline'
+
+
+def make_crawler(server, **kwargs):
+    return GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_max_pages_finishes_found_repos():
+    async with StandInServer(StandInConfig(pages=4, repos_per_page=3)) as server:
+        crawler = make_crawler(server, max_pages=2, budget=CrawlBudget())
+        repos = await crawler.run()
+
+    assert len(repos) == 6 and all('extra' in repo for repo in repos)
+    assert server.requests['search'] == crawler.budget.pages == 2
+    assert crawler.status == 'budget_exhausted' and crawler.stop_reason == 'max_pages'
+    assert crawler.budget.reason is None
+
+
+@pytest.mark.asyncio
+async def test_max_pages_without_budget():
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=2)) as server:
+        capped = make_crawler(server, max_pages=1)
+        assert len(await capped.run()) == 2
+        assert capped.status == 'budget_exhausted' and capped.stop_reason == 'max_pages'
+
+        # A cap at least as high as the number of pages is never hit.
+        uncapped = make_crawler(server, max_pages=2)
+        assert len(await uncapped.run()) == 4
+        assert uncapped.status == 'complete' and uncapped.stop_reason is None
+
+
+@pytest.mark.asyncio
+async def test_max_repos_cancels_in_flight_details():
+    async with StandInServer(StandInConfig(pages=3, repos_per_page=5, latency=0.05)) as server:
+        crawler = make_crawler(server, budget=CrawlBudget(max_repos=4))
+        repos = await crawler.run()
+
+    assert len(repos) == 4
+    assert server.requests['repo'] < 15
+    assert crawler.status == 'budget_exhausted' and crawler.budget.reason == 'max_repos'
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_partial_results():
+    async with StandInServer(StandInConfig(pages=5, repos_per_page=5, latency=0.1)) as server:
+        crawler = make_crawler(server, scheduler=Scheduler(2), budget=CrawlBudget(deadline=0.5))
+        started = time.monotonic()
+        repos = await crawler.run()
+
+    assert time.monotonic() - started < 1.0
+    assert 0 < len(repos) < 25
+    assert crawler.status == 'budget_exhausted' and crawler.budget.reason == 'deadline'
+
+
+@pytest.mark.asyncio
+async def test_max_bytes():
+    async with StandInServer(StandInConfig(pages=3, repos_per_page=3, padding_kb=10)) as server:
+        crawler = make_crawler(server, scheduler=Scheduler(1), budget=CrawlBudget(max_bytes=50_000))
+        repos = await crawler.run()
+
+    assert len(repos) < 9
+    assert crawler.budget.bytes >= 50_000
+    assert crawler.budget.reason == 'max_bytes'
+
+
+@pytest.mark.asyncio
+async def test_complete_status():
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=2)) as server:
+        crawler = make_crawler(server, budget=CrawlBudget(deadline=30))
+        await crawler.run()
+
+    assert crawler.status == 'complete' and crawler.budget.reason is None and crawler.stop_reason is None
+
+
+@pytest.mark.asyncio
+async def test_replayed_repos_count_and_journal_matches_output(tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=3)) as server:
+        first = make_crawler(server, checkpoint=Checkpoint(path), budget=CrawlBudget(max_repos=2))
+        repos = await first.run()
+        first.checkpoint.close()
+        assert len(repos) == 2
+        assert [repo['url'] for repo in Checkpoint(path, resume=True).completed] == [repo['url'] for repo in repos]
+
+        resumed = make_crawler(server, checkpoint=Checkpoint(path, resume=True), budget=CrawlBudget(max_repos=1))
+        assert await resumed.run() == repos[:1]
+        assert resumed.budget.repos == 1 and resumed.budget.reason == 'max_repos'
+        resumed.checkpoint.close()
+
+        rest = make_crawler(server, checkpoint=Checkpoint(path, resume=True), budget=CrawlBudget(max_repos=10))
+        assert len(await rest.run()) == 6
+        assert rest.status == 'complete'
@@ -0,0 +1,51 @@
+from crawler.cache import ResponseCache
+
+
+def test_key_sorts_query_params():
+    assert ResponseCache.key('https://github.com/search', {'type': 'repositories', 'q': 'python'}) == \
+        'https://github.com/search?q=python&type=repositories'
+    assert ResponseCache.key('https://github.com/user/repo', {}) == 'https://github.com/user/repo'
+
+
+def test_put_and_get(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    cache.put('key', '<html>é</html>', {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+    cache.close()
+
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    entry = cache.get('key')
+    assert entry.body == '<html>é</html>'
+    assert cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {
+        'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+    }
+    assert cache.stats() == {'hits': 1, 'revalidated': 0, 'misses': 0}
+
+
+def test_get_missing_key():
+    cache = ResponseCache(':memory:')
+    assert cache.get('missing') is None
+    assert cache.stats() == {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+
+def test_stale_entry_is_not_a_hit():
+    cache = ResponseCache(':memory:', ttl=0)
+    cache.put('key', 'body', {})
+    entry = cache.get('key')
+    assert not cache.is_fresh(entry)
+    assert cache.hits == 0
+
+    cache.revalidate('key')
+    assert cache.revalidated == 1
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(':memory:', max_bytes=10)
+    cache.put('a', '12345', {})
+    cache.put('b', '12345', {})
+    cache.get('a')
+    cache.put('c', '12345', {})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
@@ -0,0 +1,64 @@
+import pytest
+
+from crawler.checkpoint import Checkpoint
+
+SEARCH_URL = 'https://github.com/search'
+QUERY_PARAMS = {'q': 'python', 'type': 'repositories'}
+
+
+def test_resume_restores_progress(tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.start(SEARCH_URL, QUERY_PARAMS)
+    checkpoint.record_page(SEARCH_URL, [{'url': 'a'}, {'url': 'b'}], 'https://github.com/search?p=2')
+    checkpoint.record_repo({'url': 'a', 'extra': {'owner': 'user', 'language_stats': {}}})
+    checkpoint.close()
+    with open(path, 'a') as file:
+        file.write('{"event": "repo", "re')
+
+    resumed = Checkpoint(path, resume=True)
+    assert resumed.resumed
+    assert resumed.next_url == 'https://github.com/search?p=2'
+    assert resumed.pending == [{'url': 'b'}]
+    assert resumed.completed == [{'url': 'a', 'extra': {'owner': 'user', 'language_stats': {}}}]
+    resumed.start(SEARCH_URL, QUERY_PARAMS)
+
+
+def test_resume_rejects_other_query(tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.start(SEARCH_URL, QUERY_PARAMS)
+    checkpoint.close()
+
+    with pytest.raises(ValueError):
+        Checkpoint(path, resume=True).start(SEARCH_URL, {'q': 'rust', 'type': 'repositories'})
+
+
+def test_without_resume_journal_is_truncated(tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.start(SEARCH_URL, QUERY_PARAMS)
+    checkpoint.record_page(SEARCH_URL, [{'url': 'a'}], None)
+    checkpoint.close()
+
+    assert not Checkpoint(path).resumed
+
+
+def test_resume_twice_after_truncated_entry(tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.start(SEARCH_URL, QUERY_PARAMS)
+    checkpoint.record_page(SEARCH_URL, [{'url': 'u1'}, {'url': 'u2'}, {'url': 'u3'}], None)
+    checkpoint.record_repo({'url': 'u1'})
+    checkpoint.close()
+    with open(path, 'a') as file:
+        file.write('{"event": "repo", "re')
+
+    resumed = Checkpoint(path, resume=True)
+    resumed.start(SEARCH_URL, QUERY_PARAMS)
+    resumed.record_repo({'url': 'u2'})
+    resumed.close()
+
+    again = Checkpoint(path, resume=True)
+    assert again.completed == [{'url': 'u1'}, {'url': 'u2'}]
+    assert again.pending == [{'url': 'u3'}]
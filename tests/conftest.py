@@ -0,0 +1,10 @@
+import aiohttp
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def restore_client_session_get():
+    """Undo the class-level ClientSession.get mocks installed by tests/crawler/test_fetch.py."""
+    original = aiohttp.ClientSession.get
+    yield
+    aiohttp.ClientSession.get = original
@@ -0,0 +1,42 @@
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from yarl import URL as YarlURL
+
+from crawler.cache import ResponseCache
+
+pytest_plugins = ['tests.crawler.fixtures']
+
+URL = 'https://github.com/user/repo'
+
+
+@pytest.mark.asyncio
+async def test_fetch_serves_fresh_entry_without_request(crawler):
+    crawler.cache = ResponseCache(':memory:')
+    crawler.proxy = None
+    with aioresponses() as mocked:
+        mocked.get(URL, status=200, body='<html>v1</html>', headers={'ETag': '"v1"'})
+        async with aiohttp.ClientSession() as session:
+            crawler.session = session
+            assert await crawler._fetch(URL, {}) == '<html>v1</html>'
+            assert await crawler._fetch(URL, {}) == '<html>v1</html>'
+
+    assert crawler.cache.stats() == {'hits': 1, 'revalidated': 0, 'misses': 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_revalidates_stale_entry(crawler):
+    crawler.cache = ResponseCache(':memory:', ttl=0)
+    crawler.proxy = None
+    with aioresponses() as mocked:
+        mocked.get(URL, status=200, body='<html>v1</html>', headers={'ETag': '"v1"'})
+        mocked.get(URL, status=304)
+        async with aiohttp.ClientSession() as session:
+            crawler.session = session
+            assert await crawler._fetch(URL, {}) == '<html>v1</html>'
+            assert await crawler._fetch(URL, {}) == '<html>v1</html>'
+
+        request = mocked.requests[('GET', YarlURL(URL))][1]
+        assert request.kwargs['headers']['If-None-Match'] == '"v1"'
+
+    assert crawler.cache.stats() == {'hits': 0, 'revalidated': 1, 'misses': 1}
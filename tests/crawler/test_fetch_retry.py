@@ -0,0 +1,33 @@
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from crawler.retry import RetryPolicy
+
+pytest_plugins = ['tests.crawler.fixtures']
+
+URL = 'https://github.com/user/repo'
+
+
+@pytest.mark.asyncio
+async def test_fetch_does_not_retry_permanent_errors(crawler):
+    crawler.proxy = None
+    with aioresponses() as mocked:
+        mocked.get(URL, status=404)
+        async with aiohttp.ClientSession() as session:
+            crawler.session = session
+            assert await crawler._fetch(URL, {}) is None
+        assert sum(len(calls) for calls in mocked.requests.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_retries_throttled_requests(crawler):
+    crawler.proxy = None
+    crawler.retry_policy = RetryPolicy(max_attempts=3)
+    with aioresponses() as mocked:
+        mocked.get(URL, status=429, headers={'Retry-After': '0'})
+        mocked.get(URL, status=200, body='<html></html>')
+        async with aiohttp.ClientSession() as session:
+            crawler.session = session
+            assert await crawler._fetch(URL, {}) == '<html></html>'
+        assert sum(len(calls) for calls in mocked.requests.values()) == 2
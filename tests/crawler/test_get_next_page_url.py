@@ -1,9 +1,11 @@
 from unittest.mock import patch
 
+from crawler.parsers import SoupParser
+
 pytest_plugins = ['tests.crawler.fixtures']
 
 
-@patch('crawler.crawler.BeautifulSoup')
+@patch('bs4.BeautifulSoup')
 def test_get_next_page_url_exists(mock_beautiful_soup, crawler):
     html = """
     <html>
@@ -16,11 +18,12 @@ def test_get_next_page_url_exists(mock_beautiful_soup, crawler):
     """
 
     mock_beautiful_soup.return_value.find.return_value = {'href': '/search?page=2'}
+    crawler.parser = SoupParser()
     next_page_url = crawler._get_next_page_url(html)
     assert next_page_url == '/search?page=2'
 
 
-@patch('crawler.crawler.BeautifulSoup')
+@patch('bs4.BeautifulSoup')
 def test_get_next_page_url_no_next(mock_beautiful_soup, crawler):
     html = """
     <html>
@@ -33,5 +36,6 @@ def test_get_next_page_url_no_next(mock_beautiful_soup, crawler):
     """
 
     mock_beautiful_soup.return_value.find.return_value = None
+    crawler.parser = SoupParser()
     next_page_url = crawler._get_next_page_url(html)
     assert next_page_url is None
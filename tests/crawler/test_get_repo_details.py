@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import patch, AsyncMock
 from crawler.crawler import GitHubCrawler
+from crawler.executor import ParseExecutor
 
 pytest_plugins = ['tests.crawler.fixtures']
 
@@ -77,3 +78,15 @@ async def test_get_repo_details_partial_language_stats(mock_parse_language_stats
     }
     mock_fetch.assert_called_once_with('https://github.com/user/repo1', query_params={})
     mock_parse_language_stats.assert_called_once_with(html)
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock)
+@patch.object(GitHubCrawler, '_parse_language_stats')
+async def test_get_repo_details_with_parse_executor(mock_parse_language_stats, mock_fetch, crawler):
+    mock_fetch.return_value = '<h2>Languages</h2><ul><a class="d-inline-flex"><span>Go</span><span>100%</span></a></ul>'
+    with ParseExecutor(kind='thread', max_workers=1) as executor:
+        crawler.parse_executor = executor
+        repo_details = await crawler._get_repo_details({'url': 'https://github.com/user/repo1'})
+    assert repo_details['extra'] == {'owner': 'user', 'language_stats': {'Go': 100.0}}
+    mock_parse_language_stats.assert_not_called()
@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from crawler.checkpoint import Checkpoint
+from crawler.crawler import GitHubCrawler
+
+pytest_plugins = ['tests.crawler.fixtures']
+
+PAGES = {
+    'https://github.com/search': ([{'url': 'repo1'}, {'url': 'repo2'}], '/search?p=2'),
+    'https://github.com/search?p=2': ([{'url': 'repo3'}], None),
+}
+
+
+async def _get_repo_details(repo):
+    return {**repo, 'extra': {'owner': 'user', 'language_stats': {}}}
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_parse_search_page', side_effect=lambda html: PAGES[html])
+@patch.object(GitHubCrawler, '_get_repo_details', new_callable=AsyncMock, side_effect=_get_repo_details)
+async def test_resume_skips_finished_pages_and_repos(mock_get_repo_details, mock_parse_search_page, crawler, tmp_path):
+    path = str(tmp_path / 'crawl.jsonl')
+    checkpoint = Checkpoint(path)
+    search_url, query_params = crawler._get_search_url()
+    checkpoint.start(search_url, query_params)
+    checkpoint.record_page(search_url, PAGES[search_url][0], 'https://github.com/search?p=2')
+    checkpoint.record_repo({'url': 'repo1', 'extra': {'owner': 'user', 'language_stats': {}}})
+    checkpoint.close()
+
+    crawler.checkpoint = Checkpoint(path, resume=True)
+    with patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, side_effect=lambda url, params: url) as mock_fetch:
+        result = await crawler.run()
+
+    assert sorted(repo['url'] for repo in result) == ['repo1', 'repo2', 'repo3']
+    mock_fetch.assert_called_once_with('https://github.com/search?p=2', {})
+    assert sorted(call.args[0]['url'] for call in mock_get_repo_details.call_args_list) == ['repo2', 'repo3']
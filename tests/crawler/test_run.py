@@ -8,9 +8,8 @@ pytest_plugins = ['tests.crawler.fixtures']
 @patch.object(GitHubCrawler, '_get_search_url', return_value=('https://github.com/search', {'q': 'python ai', 'type': 'repositories'}))
 @patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock)
 @patch.object(GitHubCrawler, '_get_repo_details', new_callable=AsyncMock)
-@patch.object(GitHubCrawler, '_parse_search_results', return_value=(Mock, Mock))
-@patch.object(GitHubCrawler, '_get_next_page_url', return_value=None)
-async def test_run_success(mock_get_next_page_url, mock_parse_search_results, mock_get_repo_details, mock_fetch, mock_get_search_url, crawler):
+@patch.object(GitHubCrawler, '_parse_search_page', return_value=((Mock, Mock), None))
+async def test_run_success(mock_parse_search_page, mock_get_repo_details, mock_fetch, mock_get_search_url, crawler):
     mock_fetch.return_value = """
     <html>
         <body>
@@ -36,8 +35,7 @@ async def test_run_success(mock_get_next_page_url, mock_parse_search_results, mo
 
     mock_get_search_url.assert_called_once()
     mock_fetch.assert_called_once_with('https://github.com/search', {'q': 'python ai', 'type': 'repositories'})
-    mock_parse_search_results.assert_called_once()
-    mock_get_next_page_url.assert_called_once()
+    mock_parse_search_page.assert_called_once()
 
 
 
@@ -52,3 +50,16 @@ async def test_run_with_no_html(mock_fetch, mock_get_search_url, crawler):
     mock_get_search_url.assert_called_once()
 
     assert result == []
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_get_search_url', return_value=('https://github.com/search', {'q': 'python ai', 'type': 'repositories'}))
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, return_value='<html></html>')
+@patch.object(GitHubCrawler, '_get_repo_details', new_callable=AsyncMock, side_effect=lambda repo: repo)
+@patch.object(GitHubCrawler, '_parse_search_page', side_effect=[([{'url': 'repo1'}], '/search?p=2'), ([{'url': 'repo2'}], None)])
+async def test_run_follows_pagination(mock_parse_search_page, mock_get_repo_details, mock_fetch, mock_get_search_url, crawler):
+    result = await crawler.run()
+
+    assert sorted(repo['url'] for repo in result) == ['repo1', 'repo2']
+    assert mock_fetch.call_count == 2
+    mock_fetch.assert_called_with('https://github.com/search?p=2', {})
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+from crawler.crawler import GitHubCrawler
+
+pytest_plugins = ['tests.crawler.fixtures']
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, return_value='<html></html>')
+@patch.object(GitHubCrawler, '_parse_search_page', return_value=([{'url': 'fast'}, {'url': 'slow'}], None))
+async def test_stream_yields_repos_as_they_finish(mock_parse_search_page, mock_fetch, crawler):
+    async def get_repo_details(repo):
+        await asyncio.sleep(0.05 if repo['url'] == 'slow' else 0)
+        return repo
+
+    with patch.object(GitHubCrawler, '_get_repo_details', side_effect=get_repo_details):
+        urls = [repo['url'] async for repo in crawler.stream()]
+
+    assert urls == ['fast', 'slow']
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, side_effect=RuntimeError('boom'))
+async def test_stream_raises_producer_errors(mock_fetch, crawler):
+    with pytest.raises(RuntimeError):
+        async for _ in crawler.stream():
+            pass
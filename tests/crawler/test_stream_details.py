@@ -0,0 +1,66 @@
+import pytest
+from aiohttp import web
+
+from benchmarks.standin import StandInConfig, StandInServer, render_repo_page, repo_languages
+from crawler.budget import CrawlBudget
+from crawler.crawler import GitHubCrawler
+from crawler.metrics import Metrics
+
+
+async def crawl(server, stream_details):
+    crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url, budget=CrawlBudget(),
+                            metrics=Metrics(), stream_details=stream_details)
+    repos = await crawler.run()
+    return crawler, repos
+
+
+@pytest.mark.asyncio
+async def test_stream_details_stops_after_languages():
+    config = StandInConfig(pages=1, repos_per_page=4, padding_kb=4, trailer_kb=256)
+    async with StandInServer(config) as server:
+        full, full_repos = await crawl(server, stream_details=False)
+        streamed, streamed_repos = await crawl(server, stream_details=True)
+
+    by_url = {repo['url']: repo for repo in full_repos}
+    assert len(streamed_repos) == 4
+    for repo in streamed_repos:
+        assert repo['extra'] == by_url[repo['url']]['extra']
+        assert repo['extra']['language_stats'] == dict(repo_languages(repo['url'][len(server.base_url):], config))
+    assert streamed.budget.bytes < full.budget.bytes / 4
+    assert streamed.metrics.snapshot()['counters']['early_stops'] == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_details_reads_pages_without_languages():
+    config = StandInConfig(pages=1, repos_per_page=2, languages_per_repo=0)
+    async with StandInServer(config) as server:
+        _, repos = await crawl(server, stream_details=True)
+
+    assert [repo['extra']['language_stats'] for repo in repos] == [{}, {}]
+
+
+@pytest.mark.asyncio
+async def test_unknown_charset_and_byte_counts():
+    config = StandInConfig(languages_per_repo=3)
+    body = render_repo_page('/owner/repo', config).replace('Generated', 'Généré – ünïcödé').encode('utf-8')
+
+    async def page(request):
+        return web.Response(body=body, headers={'Content-Type': 'text/html; charset=no-such-charset'})
+
+    app = web.Application()
+    app.router.add_get('/owner/repo', page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    base_url = f'http://127.0.0.1:{runner.addresses[0][1]}'
+    try:
+        for stream_details in (False, True):
+            crawler = GitHubCrawler([], None, 'repositories', base_url=base_url, budget=CrawlBudget(),
+                                    stream_details=stream_details)
+            async with crawler._session_scope():
+                repo = await crawler._get_repo_details({'url': f'{base_url}/owner/repo'})
+            assert repo['extra']['language_stats'] == dict(repo_languages('/owner/repo', config))
+            if not stream_details:
+                assert crawler.budget.bytes == len(body)
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from crawler.dedup import DetailRegistry
+
+
+@pytest.mark.asyncio
+async def test_get_fetches_each_url_once():
+    registry = DetailRegistry()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'url': 'https://github.com/user/repo'}
+
+    first, second = await asyncio.gather(
+        registry.get('https://github.com/user/repo', fetch),
+        registry.get('https://github.com/user/repo', fetch),
+    )
+
+    assert first == second == {'url': 'https://github.com/user/repo'}
+    assert first is not second
+    assert len(calls) == 1
+    assert 'https://github.com/user/repo' in registry
+    assert (registry.fetched, registry.deduplicated) == (1, 1)
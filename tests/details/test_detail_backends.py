@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.budget import CrawlBudget
+from crawler.crawler import GitHubCrawler
+from crawler.details import (DetailBackend, GraphQLDetailBackend, HtmlDetailBackend, RequestCoalescer, build_query,
+                             get_detail_backend, language_shares)
+from crawler.recrawl import RecrawlStore
+from crawler.retry import RetryPolicy
+
+
+@pytest.mark.asyncio
+async def test_coalescer_groups_concurrent_submissions():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    coalescer = RequestCoalescer(flush, batch_size=4, max_wait=0.01)
+    results = await asyncio.gather(*(coalescer.submit(i) for i in range(10)))
+
+    assert results == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert coalescer.batches == 3
+
+
+@pytest.mark.asyncio
+async def test_coalescer_fails_every_item_of_a_failed_batch():
+    async def flush(items):
+        raise ValueError('bad batch')
+
+    coalescer = RequestCoalescer(flush, batch_size=2)
+    results = await asyncio.gather(coalescer.submit(1), coalescer.submit(2), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_coalescer_cancels_abandoned_batches():
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def flush(items):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    coalescer = RequestCoalescer(flush, batch_size=2)
+    callers = [asyncio.ensure_future(coalescer.submit(i)) for i in range(2)]
+    await started.wait()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert not coalescer._tasks
+
+
+def test_build_query_and_language_shares():
+    query = build_query([('octo', 'cat'), ('a"b', 'c')])
+    assert query.startswith('query { r0: repository(owner: "octo", name: "cat") { owner { login }')
+    assert 'r1: repository(owner: "a\\"b", name: "c")' in query
+
+    node = {'languages': {'totalSize': 300, 'edges': [{'size': 200, 'node': {'name': 'Go'}},
+                                                      {'size': 100, 'node': {'name': 'C'}}]}}
+    assert language_shares(node) == {'Go': 66.7, 'C': 33.3}
+    assert language_shares({'languages': {'totalSize': 0, 'edges': []}}) == {}
+
+
+def test_get_detail_backend():
+    assert isinstance(get_detail_backend('html'), HtmlDetailBackend)
+    assert get_detail_backend('graphql', batch_size=10).coalescer.batch_size == 10
+    with pytest.raises(ValueError):
+        get_detail_backend('rest')
+
+    class Incomplete(DetailBackend):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_matches_html_with_fewer_requests():
+    config = StandInConfig(pages=3, repos_per_page=20)
+    async with StandInServer(config) as server:
+        html = await GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url).run()
+        assert server.requests['repo'] == 60
+
+        backend = GraphQLDetailBackend(f'{server.base_url}/graphql', token='secret', batch_size=25)
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                detail_backend=backend)
+        repos = await crawler.run()
+
+    by_url = {repo['url']: repo['extra'] for repo in html}
+    assert len(repos) == 60
+    assert all(repo['extra'] == by_url[repo['url']] for repo in repos)
+    assert server.requests['repo'] == 60
+    assert server.requests['api'] == backend.coalescer.batches <= 6
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_records_unchanged_repos(tmp_path):
+    path = str(tmp_path / 'recrawl.db')
+    async with StandInServer(StandInConfig(pages=1, repos_per_page=5)) as server:
+        for expected in ({'skipped': 0, 'unchanged': 0, 'changed': 5}, {'skipped': 0, 'unchanged': 5, 'changed': 0}):
+            store = RecrawlStore(path, freshness=0, compare_snippets=False)
+            crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url, recrawl=store,
+                                    detail_backend=GraphQLDetailBackend(f'{server.base_url}/graphql'))
+            await crawler.run()
+            assert store.stats() == expected
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_leaves_failed_batches_without_details():
+    async with StandInServer(StandInConfig(pages=1, repos_per_page=4)) as server:
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                detail_backend=GraphQLDetailBackend(f'{server.base_url}/missing'))
+        repos = await crawler.run()
+
+    assert len(repos) == 4
+    assert not any('extra' in repo for repo in repos)
+
+
+async def serve_api(handler):
+    app = web.Application()
+    app.router.add_post('/graphql', handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{runner.addresses[0][1]}/graphql'
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_survives_a_non_json_response():
+    async def portal(request):
+        return web.Response(text='<html><body>Sign in to continue</body></html>', content_type='text/html')
+
+    runner, api_url = await serve_api(portal)
+    try:
+        async with StandInServer(StandInConfig(pages=1, repos_per_page=3)) as server:
+            crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                    detail_backend=GraphQLDetailBackend(api_url))
+            repos = await crawler.run()
+    finally:
+        await runner.cleanup()
+
+    assert len(repos) == 3
+    assert not any('extra' in repo for repo in repos)
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_retries_rate_limited_errors():
+    calls = []
+
+    async def api(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return web.json_response({'errors': [{'type': 'RATE_LIMITED', 'message': 'API rate limit exceeded'}]})
+        return web.json_response({'data': {'r0': {'owner': {'login': 'owner1'}, 'languages': {
+            'totalSize': 10, 'edges': [{'size': 10, 'node': {'name': 'Go'}}]}}}})
+
+    runner, api_url = await serve_api(api)
+    try:
+        async with StandInServer(StandInConfig(pages=1, repos_per_page=1)) as server:
+            crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                    retry_policy=RetryPolicy(base_delay=0.001),
+                                    detail_backend=GraphQLDetailBackend(api_url))
+            repos = await crawler.run()
+    finally:
+        await runner.cleanup()
+
+    assert len(calls) == 2
+    assert repos[0]['extra'] == {'owner': 'owner1', 'language_stats': {'Go': 100.0}}
+
+
+@pytest.mark.asyncio
+async def test_budget_stop_cancels_in_flight_batches():
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=10, latency=0.2)) as server:
+        backend = GraphQLDetailBackend(f'{server.base_url}/graphql', batch_size=5)
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                detail_backend=backend, budget=CrawlBudget(max_repos=3))
+        repos = await crawler.run()
+
+        assert crawler.status == 'budget_exhausted'
+        assert len(repos) == 3
+        assert not backend.coalescer._tasks
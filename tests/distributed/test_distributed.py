@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from benchmarks.standin import StandInConfig, StandInServer, repo_languages
+from crawler.crawler import GitHubCrawler
+from crawler.distributed import Coordinator, Worker, spawn_workers
+from crawler.work_queue import RedisWorkQueue, SqliteWorkQueue
+
+
+def make_crawler(base_url):
+    return GitHubCrawler(['python'], None, 'repositories', base_url=base_url)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_and_workers(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    config = StandInConfig(pages=3, repos_per_page=4)
+    async with StandInServer(config) as server:
+        coordinator = Coordinator(make_crawler(server.base_url), SqliteWorkQueue(path), poll_interval=0.01)
+        workers = [Worker(make_crawler(server.base_url), SqliteWorkQueue(path), worker_id=f'w{i}', poll_interval=0.01)
+                   for i in range(2)]
+        repos, *completed = await asyncio.gather(coordinator.run(), *(worker.run() for worker in workers))
+
+    assert len(repos) == 12 and sum(completed) == 12
+    assert server.requests == {'search': 3, 'repo': 12}
+    repo = next(repo for repo in repos if repo['url'].endswith('/owner1/repo1-2'))
+    assert repo['extra']['language_stats'] == dict(repo_languages('/owner1/repo1-2', config))
+
+
+@pytest.mark.asyncio
+async def test_coordinator_and_workers_over_redis():
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+
+    def queue():
+        return RedisWorkQueue(client=fakeredis.FakeRedis(server=server))
+
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=4)) as standin:
+        coordinator = Coordinator(make_crawler(standin.base_url), queue(), poll_interval=0.01)
+        workers = [Worker(make_crawler(standin.base_url), queue(), worker_id=f'w{i}', poll_interval=0.01)
+                   for i in range(2)]
+        repos, *completed = await asyncio.gather(coordinator.run(), *(worker.run() for worker in workers))
+
+    assert len(repos) == 8 and sum(completed) == 8
+    assert all('extra' in repo for repo in repos)
+
+
+@pytest.mark.asyncio
+async def test_worker_processes(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=3)) as server:
+        processes = spawn_workers(path, 2, base_url=server.base_url, poll_interval=0.05)
+        repos = await Coordinator(make_crawler(server.base_url), SqliteWorkQueue(path), poll_interval=0.05).run()
+        await asyncio.get_running_loop().run_in_executor(None, lambda: [p.join(30) for p in processes])
+
+    assert len(repos) == 6
+    assert all('extra' in repo for repo in repos)
+    assert [process.exitcode for process in processes] == [0, 0]
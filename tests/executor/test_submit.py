@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+from crawler.executor import ParseExecutor
+from crawler.parsers import SoupParser
+
+HTML_DIR = Path(__file__).parent.parent / 'parsers' / 'html'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+async def test_submit_parses_language_stats(kind):
+    html = (HTML_DIR / 'repo_page.html').read_text()
+    with ParseExecutor(kind=kind, max_workers=2) as executor:
+        language_stats = await executor.submit('parse_language_stats', html.encode())
+    assert language_stats == SoupParser().parse_language_stats(html)
+
+
+@pytest.mark.asyncio
+async def test_submit_parses_search_page():
+    html = (HTML_DIR / 'search_page.html').read_text()
+    with ParseExecutor(parser='soup', kind='thread', max_workers=1) as executor:
+        results, next_page_url = await executor.submit('parse_search_page', html, 'https://github.com')
+    assert results[0]['url'] == 'https://github.com/octocat/hello-world'
+    assert results[0]['stars'] == 1200
+    assert next_page_url == '/search?p=3&q=python&type=repositories'
+
+
+def test_executor_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        ParseExecutor(kind='fiber')
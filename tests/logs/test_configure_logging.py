@@ -0,0 +1,65 @@
+import io
+import json
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from crawler.logs import SamplingFilter, configure_logging
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_importing_the_crawler_does_not_configure_logging():
+    code = 'import logging, crawler.crawler, crawler.utils; print(len(logging.getLogger().handlers))'
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '0'
+
+
+def test_sampling_filter_keeps_one_in_n():
+    sampling = SamplingFilter({'Successfully fetched %s': 10})
+    records = [logging.LogRecord('crawler', logging.INFO, __file__, 1, 'Successfully fetched %s', (i,), None)
+               for i in range(25)]
+    kept = [record.args[0] for record in records if sampling.filter(record)]
+    assert kept == [0, 10, 20]
+
+    other = logging.LogRecord('crawler', logging.INFO, __file__, 1, 'Found %d repositories', (1,), None)
+    warning = logging.LogRecord('crawler', logging.WARNING, __file__, 1, 'Successfully fetched %s', ('x',), None)
+    assert sampling.filter(other)
+    assert all(sampling.filter(warning) for _ in range(5))
+
+
+def test_background_structured_logging(root_logger):
+    stream = io.StringIO()
+    listener = configure_logging(structured=True, sample_rates={'Successfully fetched %s': 2}, stream=stream)
+    logger = logging.getLogger('crawler.crawler')
+    for i in range(4):
+        logger.info('Successfully fetched %s', f'https://github.com/{i}')
+    logger.debug('Parsed language stats: %s', {})
+    listener.stop()
+    listener.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line['message'] for line in lines] == ['Successfully fetched https://github.com/0',
+                                                  'Successfully fetched https://github.com/2']
+    assert lines[0]['event'] == 'Successfully fetched %s'
+    assert lines[0]['logger'] == 'crawler.crawler'
+    assert lines[0]['level'] == 'INFO'
+
+
+def test_foreground_text_logging(root_logger):
+    stream = io.StringIO()
+    assert configure_logging(background=False, sample_rates={}, stream=stream) is None
+    logging.getLogger('crawler.crawler').info('Found %d repositories', 3)
+    assert stream.getvalue() == 'INFO:crawler.crawler:Found 3 repositories\n'
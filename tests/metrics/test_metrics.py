@@ -0,0 +1,95 @@
+import asyncio
+import json
+import pstats
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.crawler import GitHubCrawler
+from crawler.metrics import Metrics, profile, serve_prometheus
+
+
+def test_to_prometheus():
+    metrics = Metrics()
+    metrics.inc('responses', status=200)
+    metrics.inc('responses', 2, status=200)
+    metrics.set_gauge('queue_depth', 4)
+    metrics.observe('stage_seconds', 0.02, stage='parse')
+
+    text = metrics.to_prometheus()
+    assert '# TYPE crawler_responses_total counter' in text
+    assert 'crawler_responses_total{status="200"} 3' in text
+    assert 'crawler_queue_depth 4' in text
+    assert 'crawler_stage_seconds_bucket{stage="parse",le="0.01"} 0' in text
+    assert 'crawler_stage_seconds_bucket{stage="parse",le="0.025"} 1' in text
+    assert 'crawler_stage_seconds_bucket{stage="parse",le="+Inf"} 1' in text
+    assert 'crawler_stage_seconds_count{stage="parse"} 1' in text
+
+
+def test_snapshot_is_json_serializable():
+    metrics = Metrics()
+    metrics.inc('retries')
+    with metrics.timer('stage_seconds', stage='body'):
+        pass
+
+    snapshot = json.loads(json.dumps(metrics.snapshot()))
+    assert snapshot['counters'] == {'retries': 1}
+    assert snapshot['timers']['stage_seconds.body']['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_records_stage_metrics():
+    metrics = Metrics()
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=3)) as server:
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url, metrics=metrics)
+        await crawler.run()
+
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['responses.200'] == 8
+    assert snapshot['counters']['response_bytes'] > 0
+    assert snapshot['gauges']['in_flight'] == 0
+    assert snapshot['gauges']['queue_depth'] == 0
+    for stage in ('connect', 'ttfb', 'body', 'parse'):
+        assert snapshot['timers'][f'stage_seconds.{stage}']['count'] > 0
+
+
+@pytest.mark.asyncio
+async def test_serve_prometheus():
+    metrics = Metrics()
+    metrics.inc('retries')
+    runner = await serve_prometheus(metrics, port=0)
+    try:
+        port = runner.addresses[0][1]
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f'http://127.0.0.1:{port}/metrics') as response:
+                assert 'crawler_retries_total 1' in await response.text()
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_ttfb_starts_when_the_request_is_sent():
+    metrics = Metrics()
+    trace_config = metrics.trace_config()
+    ctx = SimpleNamespace()
+    await trace_config.on_request_start[0](None, ctx, None)
+    await asyncio.sleep(0.05)
+    await trace_config.on_request_headers_sent[0](None, ctx, None)
+    await trace_config.on_request_end[0](None, ctx, SimpleNamespace(response=SimpleNamespace(status=200)))
+
+    histogram = metrics.histograms[('stage_seconds', (('stage', 'ttfb'),))]
+    assert histogram.count == 1
+    assert histogram.sum < 0.05
+
+
+def test_profile_writes_pstats(tmp_path):
+    path = str(tmp_path / 'crawl.prof')
+    with profile(path):
+        sum(range(1000))
+    assert pstats.Stats(path).total_calls > 0
+
+    with pytest.raises(ValueError):
+        with profile(path, engine='yappi'):
+            pass
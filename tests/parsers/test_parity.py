@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+from crawler.parsers import FastParser, PageScanner, ParserBackend, SoupParser, get_parser, parse_count
+
+HTML_DIR = Path(__file__).parent / 'html'
+BASE_URL = 'https://github.com'
+
+SEARCH_PAGES = ['search_page.html', 'search_last_page.html', 'repo_page.html']
+REPO_PAGES = ['repo_page.html', 'repo_no_languages.html', 'search_page.html']
+
+
+def _read(name):
+    return (HTML_DIR / name).read_text()
+
+
+@pytest.mark.parametrize('name', SEARCH_PAGES)
+def test_search_page_parity(name):
+    html = _read(name)
+    assert FastParser().parse_search_page(html, BASE_URL) == SoupParser().parse_search_page(html, BASE_URL)
+
+
+@pytest.mark.parametrize('name', REPO_PAGES)
+def test_language_stats_parity(name):
+    html = _read(name)
+    assert FastParser().parse_language_stats(html) == SoupParser().parse_language_stats(html)
+
+
+LANGUAGE_LIST = ('<ul><li><a class="d-inline-flex" href="/x"><span>Go</span> <span>100.0%</span></a></li></ul>')
+
+
+@pytest.mark.parametrize('heading', [
+    '<h2>Languages</h2>',
+    '<h2><span>Languages</span></h2>',
+    '<h2><a href="/l"><span>Languages</span></a></h2>',
+    '<h2> <span>Languages</span></h2>',
+    '<h2><span>Languages</span><span></span></h2>',
+    '<h2>Languages<br></h2>',
+    '<h2><span>Lang</span>uages</h2>',
+])
+def test_language_heading_parity(heading):
+    html = f'<html><body><div>{heading}{LANGUAGE_LIST}</div></body></html>'
+    assert FastParser().parse_language_stats(html) == SoupParser().parse_language_stats(html)
+
+
+def test_nested_language_heading():
+    html = f'<h2><span>Languages</span></h2>{LANGUAGE_LIST}'
+    assert FastParser().parse_language_stats(html) == {'Go': 100.0}
+
+
+def test_search_page_fixture_values():
+    results, next_page_url = FastParser().parse_search_page(_read('search_page.html'), BASE_URL)
+    assert results == [
+        {'url': 'https://github.com/octocat/hello-world', 'description': 'My first repository & more',
+         'stars': 1200, 'updated': '2024-05-01T10:00:00Z'},
+        {'url': 'https://github.com/torvalds/linux', 'description': 'Linux kernel source tree mirror'},
+        {'url': 'https://github.com/absolute/url'},
+    ]
+    assert next_page_url == '/search?p=3&q=python&type=repositories'
+
+
+def test_language_stats_fixture_values():
+    assert FastParser().parse_language_stats(_read('repo_page.html')) == {
+        'Python': 97.3, 'Shell': 2.0, 'C++': 0.4, 'JupyterNotebook': 0.1,
+    }
+
+
+def test_scanner_accepts_chunks():
+    html = _read('repo_page.html')
+    scanner = PageScanner()
+    for start in range(0, len(html), 7):
+        scanner.feed(html[start:start + 7])
+    assert scanner.languages_done
+    assert scanner.language_stats == SoupParser().parse_language_stats(html)
+
+
+def test_search_page_metadata_from_chunks():
+    html = _read('search_page.html')
+    scanner = PageScanner()
+    for start in range(0, len(html), 5):
+        scanner.feed(html[start:start + 5])
+    scanner.close()
+    assert scanner.result_metadata[1] == {'description': 'Linux kernel source tree mirror'}
+
+
+@pytest.mark.parametrize('label,count', [('1.2k stars', 1200), ('1,234 stars', 1234), ('1 star', 1),
+                                         ('3M stars', 3_000_000), ('Sponsor', None)])
+def test_parse_count(label, count):
+    assert parse_count(label) == count
+
+
+def test_get_parser_unknown_name():
+    with pytest.raises(ValueError):
+        get_parser('lxml')
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class SearchOnly(ParserBackend):
+        def parse_search_page(self, html, base_url):
+            return FastParser().parse_search_page(html, base_url)
+
+    with pytest.raises(TypeError):
+        SearchOnly()
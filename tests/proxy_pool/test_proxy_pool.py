@@ -0,0 +1,69 @@
+import time
+
+import aiohttp
+import pytest
+from yarl import URL
+
+from crawler.proxy_pool import ProxyPool, TokenBucket, is_proxy_failure
+
+
+def test_from_file(tmpdir):
+    proxy_file = tmpdir.join('proxylist.txt')
+    proxy_file.write('http://proxy1.com\n\nhttp://proxy2.com\nhttp://proxy1.com\n')
+    pool = ProxyPool.from_file(str(proxy_file))
+    assert list(pool.proxies) == ['http://proxy1.com', 'http://proxy2.com']
+
+
+def test_from_file_not_found():
+    assert len(ProxyPool.from_file('non_existent_file.txt')) == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_empty_pool():
+    assert await ProxyPool([]).acquire() is None
+
+
+@pytest.mark.asyncio
+async def test_acquire_rotates_over_proxies():
+    pool = ProxyPool(['http://proxy1.com', 'http://proxy2.com'], rate=1)
+    assert {await pool.acquire(), await pool.acquire()} == {'http://proxy1.com', 'http://proxy2.com'}
+
+
+@pytest.mark.asyncio
+async def test_acquire_prefers_faster_proxy():
+    pool = ProxyPool(['http://slow.com', 'http://fast.com'], rate=100)
+    pool.report('http://slow.com', 2.0, ok=True)
+    pool.report('http://fast.com', 0.1, ok=True)
+    assert await pool.acquire() == 'http://fast.com'
+
+
+@pytest.mark.asyncio
+async def test_failing_proxy_is_quarantined_with_backoff():
+    pool = ProxyPool(['http://bad.com', 'http://good.com'], failure_threshold=2, quarantine=10)
+    pool.report('http://bad.com', None, ok=False)
+    assert pool.proxies['http://bad.com'].quarantined_until == 0
+
+    pool.report('http://bad.com', None, ok=False)
+    first = pool.proxies['http://bad.com'].quarantined_until - time.monotonic()
+    pool.report('http://bad.com', None, ok=False)
+    second = pool.proxies['http://bad.com'].quarantined_until - time.monotonic()
+
+    assert 9 < first <= 10
+    assert 19 < second <= 20
+    assert [await pool.acquire() for _ in range(2)] == ['http://good.com', 'http://good.com']
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_is_proxy_failure():
+    request_info = aiohttp.RequestInfo(URL('https://github.com'), 'GET', {}, URL('https://github.com'))
+    assert is_proxy_failure(aiohttp.ClientResponseError(request_info, (), status=429))
+    assert is_proxy_failure(aiohttp.ClientConnectionError())
+    assert not is_proxy_failure(aiohttp.ClientResponseError(request_info, (), status=404))
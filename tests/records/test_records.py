@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from benchmarks.bench_memory import run_benchmark
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.crawler import GitHubCrawler
+from crawler.records import RepoDetails, SearchHit
+
+REPO = {
+    'url': 'https://github.com/octocat/hello-world',
+    'description': 'My first repository',
+    'stars': 1200,
+    'extra': {'owner': 'octocat', 'language_stats': {'Python': 97.3, 'Shell': 2.0, 'C++': 0.4}},
+    'changed': True,
+}
+
+
+def test_round_trip():
+    record = RepoDetails.from_dict(REPO)
+    assert record.to_dict() == REPO
+    assert json.loads(json.dumps(record.to_dict())) == REPO
+    assert record.url == REPO['url']
+    assert record.shares.typecode == 'f'
+
+
+def test_round_trip_without_details():
+    repo = {'url': 'https://github.com/octocat/missing'}
+    assert RepoDetails.from_dict(repo).to_dict() == repo
+    assert SearchHit.from_dict(repo).to_dict() == repo
+
+
+def test_strings_are_interned_and_records_slotted():
+    first = RepoDetails.from_dict(json.loads(json.dumps(REPO)))
+    second = RepoDetails.from_dict(json.loads(json.dumps(REPO)))
+    assert first.owner is second.owner
+    assert first.languages[0] is second.languages[0]
+    assert not hasattr(first, '__dict__')
+    assert not hasattr(first.hit, '__dict__')
+
+
+@pytest.mark.asyncio
+async def test_run_records():
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=3)) as server:
+        crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url)
+        records = await crawler.run_records()
+
+    assert len(records) == 6
+    assert all(isinstance(record, RepoDetails) and record.owner for record in records)
+
+
+def test_memory_benchmark():
+    results = run_benchmark(2000)
+    assert results['record_bytes'] < results['dict_bytes']
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.crawler import GitHubCrawler
+from crawler.recrawl import RecrawlStore, content_hash
+
+
+def test_is_current_within_freshness_window():
+    store = RecrawlStore(':memory:', freshness=60)
+    store.put({'url': 'u', 'extra': {'owner': 'o', 'language_stats': {}}}, content_hash('body'))
+    record = store.get('u')
+    assert record.extra == {'owner': 'o', 'language_stats': {}}
+    assert store.is_current(record, {'url': 'u'})
+
+    store.freshness = 0
+    assert not store.is_current(record, {'url': 'u'})
+
+
+def test_is_current_when_snippet_unchanged():
+    store = RecrawlStore(':memory:', freshness=0)
+    store.put({'url': 'u', 'description': 'A tool', 'stars': 3, 'extra': {}}, content_hash('body'))
+    record = store.get('u')
+    assert store.is_current(record, {'url': 'u', 'stars': 3, 'description': 'A tool'})
+    assert not store.is_current(record, {'url': 'u', 'stars': 4, 'description': 'A tool'})
+
+    store.compare_snippets = False
+    assert not store.is_current(record, {'url': 'u', 'stars': 3, 'description': 'A tool'})
+
+
+@pytest.mark.asyncio
+async def test_incremental_recrawl(tmp_path):
+    path = str(tmp_path / 'recrawl.db')
+    config = StandInConfig(pages=2, repos_per_page=3)
+    async with StandInServer(config) as server:
+        first = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                              recrawl=RecrawlStore(path))
+        repos = await first.run()
+        assert all(repo['changed'] for repo in repos)
+
+        fresh = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                              recrawl=RecrawlStore(path))
+        assert [repo['changed'] for repo in await fresh.run()] == [False] * 6
+        assert fresh.recrawl.stats() == {'skipped': 6, 'unchanged': 0, 'changed': 0}
+        assert server.requests['repo'] == 6
+
+        same_snippet = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                                     recrawl=RecrawlStore(path, freshness=0))
+        await same_snippet.run()
+        assert same_snippet.recrawl.stats() == {'skipped': 6, 'unchanged': 0, 'changed': 0}
+        assert server.requests['repo'] == 6
+
+        stale = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url,
+                              recrawl=RecrawlStore(path, freshness=0, compare_snippets=False))
+        again = await stale.run()
+        assert stale.recrawl.stats() == {'skipped': 0, 'unchanged': 6, 'changed': 0}
+        assert server.requests['repo'] == 12
+
+    by_url = {repo['url']: repo['extra'] for repo in repos}
+    assert all(repo['extra'] == by_url[repo['url']] for repo in again)
+    assert time.time() - stale.recrawl.get(repos[0]['url']).seen_at < 60
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict
+from yarl import URL
+
+from crawler.retry import CircuitBreaker, RetryPolicy
+
+GITHUB = 'https://github.com/user/repo'
+
+
+def _response_error(status, headers=None):
+    request_info = aiohttp.RequestInfo(URL(GITHUB), 'GET', CIMultiDict(), URL(GITHUB))
+    return aiohttp.ClientResponseError(request_info, (), status=status, headers=CIMultiDict(headers or {}))
+
+
+@pytest.mark.parametrize('error, retryable', [
+    (_response_error(404), False),
+    (_response_error(401), False),
+    (_response_error(403), False),
+    (_response_error(403, {'Retry-After': '60'}), True),
+    (_response_error(403, {'X-RateLimit-Remaining': '0'}), True),
+    (_response_error(429), True),
+    (_response_error(502), True),
+    (asyncio.TimeoutError(), True),
+    (aiohttp.ClientConnectionError(), True),
+    (ValueError(), False),
+])
+def test_is_retryable(error, retryable):
+    assert RetryPolicy().is_retryable(error) is retryable
+
+
+def test_next_delay_grows_exponentially_with_jitter():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    error = aiohttp.ClientConnectionError()
+    assert 0.5 <= policy.next_delay(GITHUB, 0, error) <= 1
+    assert 2 <= policy.next_delay(GITHUB, 2, error) <= 4
+    assert 2.5 <= policy.next_delay(GITHUB, 10, error) <= 5
+
+
+def test_next_delay_honors_retry_after():
+    policy = RetryPolicy(max_delay=120)
+    assert policy.next_delay(GITHUB, 0, _response_error(429, {'Retry-After': '42'})) == 42
+
+
+def test_next_delay_honors_rate_limit_reset():
+    policy = RetryPolicy(max_delay=120)
+    reset = str(int(time.time()) + 30)
+    delay = policy.next_delay(GITHUB, 0, _response_error(403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}))
+    assert 28 < delay <= 30
+
+
+def test_throttling_trips_breaker_for_host():
+    policy = RetryPolicy()
+    policy.next_delay(GITHUB, 0, _response_error(429, {'Retry-After': '10'}))
+    assert policy.breaker.is_open('https://github.com/other/repo')
+    assert not policy.breaker.is_open('https://api.github.com/graphql')
+
+
+def test_breaker_can_be_disabled():
+    policy = RetryPolicy(use_breaker=False)
+    assert policy.breaker is None
+    assert policy.next_delay(GITHUB, 0, _response_error(429, {'Retry-After': '10'})) == 10
+
+
+def test_server_errors_do_not_trip_breaker():
+    policy = RetryPolicy()
+    policy.next_delay(GITHUB, 0, _response_error(503))
+    assert not policy.breaker.is_open(GITHUB)
+
+
+@pytest.mark.asyncio
+async def test_breaker_wait():
+    breaker = CircuitBreaker()
+    breaker.trip(GITHUB, 0.05)
+    started = time.monotonic()
+    await breaker.wait(GITHUB)
+    assert time.monotonic() - started >= 0.04
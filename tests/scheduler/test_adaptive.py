@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from yarl import URL
+
+from benchmarks.standin import StandInConfig, StandInServer
+from crawler.crawler import GitHubCrawler
+from crawler.metrics import Metrics
+from crawler.retry import RetryPolicy
+from crawler.scheduler import AdaptiveLimit, AdaptiveScheduler, Scheduler
+
+URL_ = 'https://github.com/user/repo'
+
+
+def response_error(status):
+    request_info = aiohttp.RequestInfo(URL(URL_), 'GET', {}, URL(URL_))
+    return aiohttp.ClientResponseError(request_info, (), status=status, headers={})
+
+
+def test_limit_grows_additively():
+    limit = AdaptiveLimit(initial=2, min_limit=1, max_limit=10, min_samples=1000)
+    for _ in range(2 + 3):
+        limit.on_success(time.monotonic(), 0.01)
+    assert 3.5 < limit.limit < 4.2
+
+    for _ in range(1000):
+        limit.on_success(time.monotonic(), 0.01)
+    assert limit.limit == 10
+
+
+def test_limit_halves_once_per_burst_of_throttling():
+    limit = AdaptiveLimit(initial=8, min_limit=1, max_limit=10)
+    started = time.monotonic()
+    for _ in range(5):
+        limit.on_error(started, response_error(429))
+    assert limit.limit == 4
+    assert limit.decreases == 1
+
+    limit.on_error(time.monotonic(), asyncio.TimeoutError())
+    assert limit.limit == 2
+    limit.on_error(time.monotonic(), response_error(404))
+    assert limit.limit == 2
+
+
+def test_limit_cuts_on_rising_p95():
+    limit = AdaptiveLimit(initial=8, min_limit=1, max_limit=10, window=10, min_samples=10)
+    for _ in range(10):
+        limit.on_success(time.monotonic(), 0.01)
+    assert limit.baseline == pytest.approx(0.01)
+    grown = limit.limit
+    limit.on_success(time.monotonic(), 0.1)
+    assert limit.decreases == 1
+    assert limit.limit == pytest.approx(grown / 2)
+
+
+def test_limit_ignores_jitter_below_the_floor():
+    limit = AdaptiveLimit(initial=8, min_limit=1, max_limit=10, window=10, min_samples=10, latency_floor=0.05)
+    for _ in range(10):
+        limit.on_success(time.monotonic(), 0.005)
+    for _ in range(20):
+        limit.on_success(time.monotonic(), 0.04)
+    assert limit.decreases == 0
+    assert limit.limit > 8
+
+
+@pytest.mark.asyncio
+async def test_slot_follows_the_current_limit():
+    scheduler = AdaptiveScheduler(concurrency=10, initial_limit=2)
+    in_flight, peak = 0, 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with scheduler.slot(URL_):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*[request() for _ in range(6)])
+    assert peak == 2
+    limit = scheduler.limits['github.com']
+    assert limit.limit > 2 and limit.in_flight == 0
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        async with scheduler.slot(URL_):
+            raise response_error(429)
+    assert limit.decreases == 1
+
+
+async def crawl(server, scheduler):
+    crawler = GitHubCrawler(['python'], None, 'repositories', base_url=server.base_url, scheduler=scheduler,
+                            retry_policy=RetryPolicy(max_attempts=100, base_delay=0.001, max_delay=0.01))
+    return await crawler.run()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_backs_off_a_throttling_standin():
+    config = StandInConfig(pages=2, repos_per_page=30, latency=0.02, capacity=3)
+    async with StandInServer(config) as fixed_server:
+        assert len(await crawl(fixed_server, Scheduler(concurrency=16))) == 60
+
+    metrics = Metrics()
+    scheduler = AdaptiveScheduler(concurrency=16, metrics=metrics)
+    async with StandInServer(config) as adaptive_server:
+        assert len(await crawl(adaptive_server, scheduler)) == 60
+
+    host = adaptive_server.base_url.split('//')[1]
+    limit = scheduler.limits[host]
+    assert limit.decreases > 0
+    assert limit.limit < 8
+    assert adaptive_server.statuses[429] < fixed_server.statuses[429] / 2
+    assert metrics.snapshot()['gauges'][f'concurrency_limit.{host}'] == int(limit.limit)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_grows_on_a_healthy_standin():
+    # The latency rule is covered above; a floor this high keeps wall-clock jitter out of this test.
+    scheduler = AdaptiveScheduler(concurrency=16, initial_limit=2, latency_floor=60)
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=30, latency=0.005)) as server:
+        assert len(await crawl(server, scheduler)) == 60
+
+    limit = scheduler.limits[server.base_url.split('//')[1]]
+    assert limit.decreases == 0
+    assert limit.limit > 4
+    assert server.peak_active > 2
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from crawler.scheduler import Scheduler
+
+
+async def _track(scheduler, url, in_flight, peaks):
+    async with scheduler.slot(url):
+        in_flight[url] = in_flight.get(url, 0) + 1
+        peaks['total'] = max(peaks['total'], sum(in_flight.values()))
+        peaks[url] = max(peaks.get(url, 0), in_flight[url])
+        await asyncio.sleep(0.01)
+        in_flight[url] -= 1
+
+
+@pytest.mark.asyncio
+async def test_slot_respects_global_limit():
+    scheduler = Scheduler(concurrency=3)
+    in_flight, peaks = {}, {'total': 0}
+    urls = [f'https://host{i}.com/repo' for i in range(10)]
+    await asyncio.gather(*[_track(scheduler, url, in_flight, peaks) for url in urls])
+    assert peaks['total'] == 3
+
+
+@pytest.mark.asyncio
+async def test_slot_respects_per_host_limit():
+    scheduler = Scheduler(concurrency=10, per_host_limit=2)
+    in_flight, peaks = {}, {'total': 0}
+    url = 'https://github.com/user/repo'
+    await asyncio.gather(*[_track(scheduler, url, in_flight, peaks) for _ in range(6)])
+    assert peaks[url] == 2
+
+
+def test_scheduler_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        Scheduler(concurrency=0)
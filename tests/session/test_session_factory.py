@@ -0,0 +1,45 @@
+import brotli
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch, AsyncMock
+
+from crawler.crawler import GitHubCrawler
+from crawler.session import SessionFactory
+
+
+@pytest.mark.asyncio
+async def test_create_configures_connector_and_timeouts():
+    factory = SessionFactory(limit=20, limit_per_host=4, keepalive_timeout=15, ttl_dns_cache=60,
+                             connect_timeout=2, read_timeout=8)
+    async with factory.create() as session:
+        assert session.connector.limit == 20
+        assert session.connector.limit_per_host == 4
+        assert session.connector.use_dns_cache
+        assert session.timeout.connect == 2
+        assert session.timeout.sock_read == 8
+        assert session.timeout.total is None
+
+
+@pytest.mark.asyncio
+async def test_session_decodes_brotli():
+    async def handler(request):
+        return web.Response(body=brotli.compress(b'<html>br</html>'), headers={'Content-Encoding': 'br'})
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    async with TestServer(app) as server:
+        async with SessionFactory().create() as session:
+            async with session.get(server.make_url('/'), headers={'Accept-Encoding': 'gzip, deflate, br'}) as response:
+                assert await response.text() == '<html>br</html>'
+
+
+@pytest.mark.asyncio
+@patch.object(GitHubCrawler, '_fetch', new_callable=AsyncMock, return_value=None)
+async def test_shared_session_is_reused_and_left_open(mock_fetch):
+    async with SessionFactory().create() as session:
+        for _ in range(2):
+            crawler = GitHubCrawler(['python'], None, 'repositories', session=session)
+            assert await crawler.run() == []
+            assert crawler.session is session
+        assert not session.closed
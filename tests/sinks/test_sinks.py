@@ -0,0 +1,75 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from crawler.sinks import ColumnarSink, OutputSink, get_sink, read_columns
+
+REPOS = [
+    {'url': 'https://github.com/a/x', 'extra': {'owner': 'a', 'language_stats': {'Python': 75.5, 'C': 24.5}}},
+    {'url': 'https://github.com/b/y', 'extra': {'owner': 'b', 'language_stats': {}}},
+    {'url': 'https://github.com/a/z', 'extra': {'owner': 'a', 'language_stats': {'C': 100.0}}},
+]
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_ndjson_sink_gzip(tmp_path):
+    path = str(tmp_path / 'out.ndjson.gz')
+    sink = get_sink('ndjson', path, batch_size=2)
+    assert await sink.consume(aiter(REPOS)) == 3
+    sink.close()
+
+    with gzip.open(path, 'rt') as file:
+        assert [json.loads(line) for line in file] == REPOS
+
+
+def test_csv_sink(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    with get_sink('csv', path) as sink:
+        for repo in REPOS:
+            sink.write(repo)
+
+    with open(path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['owner'] for row in rows] == ['a', 'b', 'a']
+    assert json.loads(rows[0]['language_stats']) == {'Python': 75.5, 'C': 24.5}
+
+
+@pytest.mark.parametrize('engine,name', [('numpy', 'out'), ('arrow', 'out.parquet')])
+def test_columnar_sink_round_trip(tmp_path, engine, name):
+    pytest.importorskip('numpy')
+    if engine == 'arrow':
+        pytest.importorskip('pyarrow')
+    path = str(tmp_path / name)
+    with ColumnarSink(path, engine=engine, batch_size=2) as sink:
+        for repo in REPOS:
+            sink.write(repo)
+    assert sink.languages == {'Python': 0, 'C': 1}
+
+    columns = read_columns(path)
+    assert list(columns.urls) == [repo['url'] for repo in REPOS]
+    assert list(columns.owners) == ['a', 'b', 'a']
+    assert list(columns.offsets) == [0, 2, 2, 3]
+    assert columns.percentages.dtype.name == 'float32'
+    names = [columns.languages[i] for i in columns.language_ids]
+    assert names == ['Python', 'C', 'C']
+    assert list(columns.percentages) == [75.5, 24.5, 100.0]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        get_sink('xml')
+
+
+def test_sink_without_write_batch_cannot_be_instantiated():
+    class Incomplete(OutputSink):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -1,6 +1,10 @@
+import io
+import json
+
 import pytest
 from unittest.mock import patch, AsyncMock
 import main
+from benchmarks.standin import StandInConfig, StandInServer
 
 
 @pytest.mark.asyncio
@@ -15,3 +19,124 @@ async def test_main(mock_run, mock_get_random_proxy, monkeypatch):
 
     mock_get_random_proxy.assert_called_once_with('proxylist.txt')
     mock_run.assert_called_once()
+
+
+def test_search_filter_model_is_importable_from_main():
+    from crawler.models import SearchFilterModel
+    from main import SearchFilterModel as reexported
+
+    assert reexported is SearchFilterModel
+    with pytest.raises(AttributeError):
+        main.missing
+
+
+async def _repos(*repos):
+    for repo in repos:
+        yield repo
+
+
+@pytest.mark.asyncio
+async def test_write_ndjson():
+    out = io.StringIO()
+    count = await main.write_ndjson(_repos({'url': 'a'}, {'url': 'b'}), out)
+
+    assert count == 2
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [{'url': 'a'}, {'url': 'b'}]
+
+
+@pytest.mark.asyncio
+@patch('main.get_random_proxy', return_value=None)
+@patch('main.GitHubCrawler.stream', return_value=_repos({'url': 'a'}))
+async def test_main_ndjson(mock_stream, mock_get_random_proxy, monkeypatch, capsys):
+    monkeypatch.setattr('builtins.input', lambda _: 'test,repo' if _.startswith('Enter keywords') else 'repositories')
+    result = await main.main(ndjson=True)
+
+    assert result == 1
+    assert json.loads(capsys.readouterr().out) == {'url': 'a'}
+    mock_stream.assert_called_once()
+
+
+def test_load_queries(tmp_path):
+    json_file = tmp_path / 'queries.json'
+    json_file.write_text(json.dumps([{'keywords': ['python'], 'search_type': 'repositories'}]))
+    csv_file = tmp_path / 'queries.csv'
+    csv_file.write_text('keywords,search_type,proxy\n"python, asyncio",Repositories,\ngo,issues,http://proxy:8080\n')
+
+    assert [query.keywords for query in main.load_queries(str(json_file))] == [['python']]
+    queries = main.load_queries(str(csv_file))
+    assert [query.keywords for query in queries] == [['python', 'asyncio'], ['go']]
+    assert [query.search_type for query in queries] == ['repositories', 'issues']
+    assert [query.proxy for query in queries] == [None, 'http://proxy:8080']
+
+
+def test_parse_args_needs_a_query():
+    with pytest.raises(SystemExit):
+        main.parse_args([])
+
+
+@pytest.mark.asyncio
+async def test_run_cli_single_query(tmp_path):
+    output = tmp_path / 'out.ndjson'
+    async with StandInServer(StandInConfig(pages=3, repos_per_page=2)) as server:
+        args = main.parse_args(['python', '--base-url', server.base_url, '--format', 'ndjson',
+                                '--output', str(output), '--max-pages', '2', '--cache-dir', str(tmp_path / 'cache')])
+        count = await main.run_cli(args)
+
+    assert count == 4
+    assert server.requests['search'] == 2
+    assert all('extra' in json.loads(line) for line in output.read_text().splitlines())
+
+
+@pytest.mark.asyncio
+async def test_run_cli_queries_file(tmp_path):
+    queries = tmp_path / 'queries.json'
+    queries.write_text(json.dumps([{'keywords': ['python'], 'search_type': 'repositories'},
+                                   {'keywords': ['go'], 'search_type': 'repositories'}]))
+    output = tmp_path / 'out.json'
+    async with StandInServer(StandInConfig(pages=1, repos_per_page=3)) as server:
+        args = main.parse_args(['--queries-file', str(queries), '--base-url', server.base_url,
+                                '--concurrency', '4', '--output', str(output)])
+        count = await main.run_cli(args)
+
+    results = json.loads(output.read_text())
+    assert count == len(results) == 6
+    assert sorted(repo['query'] for repo in results) == [0, 0, 0, 1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_run_cli_budget(tmp_path):
+    queries = tmp_path / 'queries.json'
+    queries.write_text(json.dumps([{'keywords': ['python'], 'search_type': 'repositories'},
+                                   {'keywords': ['go'], 'search_type': 'repositories'}]))
+    output = tmp_path / 'out.ndjson'
+    async with StandInServer(StandInConfig(pages=3, repos_per_page=3)) as server:
+        args = main.parse_args(['--queries-file', str(queries), '--base-url', server.base_url, '--max-repos', '5',
+                                '--format', 'ndjson', '--output', str(output)])
+        count = await main.run_cli(args)
+
+    assert count == len(output.read_text().splitlines()) == 5
+
+
+@pytest.mark.asyncio
+async def test_run_cli_adaptive(tmp_path):
+    output = tmp_path / 'out.ndjson'
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=5, capacity=2)) as server:
+        args = main.parse_args(['python', '--base-url', server.base_url, '--adaptive', '--concurrency', '8',
+                                '--format', 'ndjson', '--output', str(output)])
+        count = await main.run_cli(args)
+
+    assert count == 10
+    assert all('extra' in json.loads(line) for line in output.read_text().splitlines())
+
+
+@pytest.mark.asyncio
+async def test_run_cli_graphql_details(tmp_path):
+    output = tmp_path / 'out.ndjson'
+    async with StandInServer(StandInConfig(pages=2, repos_per_page=5)) as server:
+        args = main.parse_args(['python', '--base-url', server.base_url, '--details', 'graphql',
+                                '--api-url', f'{server.base_url}/graphql', '--format', 'ndjson', '--output', str(output)])
+        count = await main.run_cli(args)
+
+    assert count == 10
+    assert server.requests['repo'] == 0
+    assert all('extra' in json.loads(line) for line in output.read_text().splitlines())
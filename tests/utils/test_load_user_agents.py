@@ -0,0 +1,21 @@
+from crawler import utils
+from crawler.utils import get_random_headers, load_user_agents
+
+
+def test_load_user_agents_from_cache_file(tmp_path):
+    path = tmp_path / 'user_agents.txt'
+    path.write_text('agent-1\n\nagent-2\n')
+    assert load_user_agents(str(path)) == ['agent-1', 'agent-2']
+
+
+def test_load_user_agents_builds_missing_cache_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'USER_AGENT_DRAWS', 50)
+    path = tmp_path / 'user_agents.txt'
+    user_agents = load_user_agents(str(path))
+    assert user_agents
+    assert path.read_text().split() == ' '.join(user_agents).split()
+
+
+def test_random_user_agent_comes_from_pool(monkeypatch):
+    monkeypatch.setattr(utils, '_user_agents', ['agent-1'])
+    assert get_random_headers()['User-Agent'] == 'agent-1'
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from crawler.work_queue import RedisWorkQueue, SqliteWorkQueue, WorkQueue, open_queue
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def make_queue(request, tmp_path):
+    """Returns a factory of queues that share one store: a SQLite file, or a fakeredis stand-in server."""
+    if request.param == 'sqlite':
+        path = str(tmp_path / 'queue.db')
+        return lambda **kwargs: SqliteWorkQueue(path, **kwargs)
+
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    return lambda **kwargs: RedisWorkQueue(client=fakeredis.FakeRedis(server=server), **kwargs)
+
+
+def test_jobs_are_deduplicated_and_leased_once(make_queue):
+    queue = make_queue()
+    assert queue.put('a', {'url': 'a'})
+    assert not queue.put('a', {'url': 'a'})
+    queue.put('b', {'url': 'b'})
+
+    first = queue.lease('w1', count=1)
+    second = queue.lease('w2', count=5)
+    assert [job.payload['url'] for job in first] == ['a']
+    assert [job.payload['url'] for job in second] == ['b']
+    assert queue.lease('w3') == []
+    assert queue.counts() == {'pending': 0, 'leased': 2, 'done': 0, 'failed': 0}
+
+
+def test_expired_lease_is_redone_by_another_worker(make_queue):
+    queue = make_queue(visibility_timeout=0.05)
+    queue.put('a', {'url': 'a'})
+    crashed = queue.lease('w1')[0]
+
+    time.sleep(0.1)
+    job = queue.lease('w2')[0]
+    assert job.id == crashed.id and job.attempts == 2
+    assert not queue.complete(crashed, 'w1', {'url': 'a', 'extra': {}})
+    assert queue.complete(job, 'w2', {'url': 'a', 'extra': {}})
+    assert list(queue.results()) == [{'url': 'a', 'extra': {}}]
+
+
+def test_job_fails_after_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    queue.put('a', {'url': 'a'})
+    queue.seal()
+    for _ in range(2):
+        job = queue.lease('w1')[0]
+        assert not queue.is_finished()
+        queue.release(job, 'w1')
+
+    assert queue.lease('w1') == []
+    assert queue.counts()['failed'] == 1
+    assert queue.is_finished()
+
+
+def test_expired_lease_fails_after_max_attempts(make_queue):
+    queue = make_queue(visibility_timeout=0.05, max_attempts=1)
+    queue.put('a', {'url': 'a'})
+    queue.seal()
+    queue.lease('w1')
+
+    time.sleep(0.1)
+    assert queue.lease('w2') == []
+    assert queue.counts()['failed'] == 1
+    assert queue.is_finished()
+
+
+def test_queue_is_shared_between_connections(make_queue):
+    with make_queue() as producer, make_queue() as consumer:
+        producer.put('a', {'url': 'a'})
+        assert not consumer.is_finished()
+        producer.seal()
+        job = consumer.lease('w1')[0]
+        consumer.complete(job, 'w1', {'url': 'a', 'extra': {}})
+        assert producer.is_finished()
+
+
+def test_open_queue(tmp_path):
+    with open_queue(str(tmp_path / 'queue.db'), max_attempts=5) as queue:
+        assert isinstance(queue, SqliteWorkQueue) and queue.max_attempts == 5
+    pytest.importorskip('redis')
+    queue = open_queue('redis://localhost:6379/0', prefix='test')
+    assert isinstance(queue, RedisWorkQueue) and queue.prefix == 'test'
+    queue.close()
+
+    class Incomplete(WorkQueue):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()